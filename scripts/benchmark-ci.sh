@@ -0,0 +1,83 @@
+#!/bin/bash
+
+# ============================================================================
+# Retrieval benchmark regression check (CI)
+#
+# Replays benchmarks/golden_queries.json from the committed recording, so no
+# Pinecone API key is needed, and fails on recall/MRR regressions against
+# benchmarks/baseline.json.
+#
+#   ./scripts/benchmark-ci.sh           # replay + compare with the baseline
+#   ./scripts/benchmark-ci.sh record    # rebuild recording.json and baseline.json
+#
+# Recording ingests the fixture corpus (synthetic, fixed seed) into the local
+# stand-in server; every index, cache and log goes to a temp directory.
+# ============================================================================
+
+set -euo pipefail
+
+# Colors
+GREEN='\033[0;32m'
+BLUE='\033[0;34m'
+NC='\033[0m'
+
+# Fixture
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+BENCH_DIR="$SCRIPT_DIR/benchmarks"
+GOLDEN="$BENCH_DIR/golden_queries.json"
+RECORDING="$BENCH_DIR/recording.json"
+BASELINE="$BENCH_DIR/baseline.json"
+CORPUS_DECKS=6
+CORPUS_SEED=2025
+STAND_IN_PORT="${STAND_IN_PORT:-5091}"
+# Replays add a simulated upstream latency so p95 measures the search path on top of
+# a stable floor (sub-millisecond replays vary several-fold between runs); shared CI
+# runners are noisy, so latency only fails on a gross slowdown
+LATENCY_TOLERANCE="${LATENCY_TOLERANCE:-1.0}"
+RUN_ARGS=(--fusion average,rrf --top-k 20 --rerank on,off --clients 4 --rounds 3 --latency-ms 20)
+
+cd "$SCRIPT_DIR"
+
+WORK_DIR="$(mktemp -d)"
+SERVER_PID=""
+cleanup() {
+    if [[ -n "$SERVER_PID" ]]; then
+        kill "$SERVER_PID" 2>/dev/null || true
+    fi
+    rm -rf "$WORK_DIR"
+}
+trap cleanup EXIT
+
+export DECKBOT_QUIET=1
+export DECKBOT_KEYWORD_INDEX="$WORK_DIR/keyword_index.json"
+export DECKBOT_INDEX_ALIASES="$WORK_DIR/index_aliases.json"
+export DECKBOT_QUERY_LOG="$WORK_DIR/query_log.jsonl"
+export DECKBOT_RERANK_CACHE_DB="$WORK_DIR/rerank_cache.db"
+export DECKBOT_ARTIFACT_STORE="$WORK_DIR/artifacts"
+
+if [[ "${1:-}" == "record" ]]; then
+    echo -e "${BLUE}[INFO]${NC} 🧪 Generating fixture corpus ($CORPUS_DECKS decks, seed $CORPUS_SEED)"
+    python deckbot_synthetic_corpus.py "$WORK_DIR/metadata" "$CORPUS_DECKS" "$CORPUS_SEED"
+
+    echo -e "${BLUE}[INFO]${NC} 🖥️  Starting local stand-in on port $STAND_IN_PORT"
+    python deckbot_local_pinecone.py --port "$STAND_IN_PORT" --auto-create &
+    SERVER_PID=$!
+    export DECKBOT_PINECONE_URL="http://127.0.0.1:$STAND_IN_PORT"
+    for _ in $(seq 50); do
+        python -c "import socket; socket.create_connection(('127.0.0.1', $STAND_IN_PORT), 1)" 2>/dev/null && break
+        sleep 0.2
+    done
+
+    echo -e "${BLUE}[INFO]${NC} 📤 Ingesting fixture corpus"
+    python deckbot.py setup
+    python deckbot.py ingest-all "$WORK_DIR/metadata"
+
+    python deckbot_benchmark.py record "$GOLDEN" "$RECORDING" --fusion average,rrf --top-k 20
+    python deckbot_benchmark.py run "$GOLDEN" --recording "$RECORDING" "${RUN_ARGS[@]}" \
+        --save-baseline "$BASELINE"
+    echo -e "${GREEN}[SUCCESS]${NC} ✅ Fixture rebuilt: commit $RECORDING and $BASELINE"
+    exit 0
+fi
+
+python deckbot_benchmark.py run "$GOLDEN" --recording "$RECORDING" "${RUN_ARGS[@]}" \
+    --baseline "$BASELINE" --latency-tolerance "$LATENCY_TOLERANCE"
@@ -52,8 +52,17 @@ if [[ -f "$LOG_DIR/optimization.log" ]]; then
     echo -e "${GREEN}Images optimized:${NC} $opt_count"
 fi
 
+# Show pipeline metrics (written by Python scripts via DECKBOT_METRICS_FILE)
+if [[ -f "$LOG_DIR/metrics.prom" ]]; then
+    echo ""
+    echo -e "${BLUE}Pipeline metrics:${NC}"
+    grep -E '^deckbot_(records_total|records_per_second|retries_total|bytes_sent_total|batch_seconds_(sum|count))' \
+        "$LOG_DIR/metrics.prom" | sed 's/^/  /'
+fi
+
 echo ""
 echo "Logs:"
 echo "  Processing: tail -f logs/processing.log"
 echo "  Optimization: tail -f logs/optimization.log"
 echo "  Errors: cat logs/errors.log"
+echo "  Metrics: DECKBOT_METRICS_FILE=logs/metrics.prom python scripts/<script>.py"
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+DeckBot Command Line
+One entry point for indexing, search and the maintenance tools
+
+- Real subcommands and flags (argparse): top_k, rerank_top_n, namespace,
+  JSON filters, keywords, fusion, concurrency
+- Nothing heavy is imported until a command needs it: --help and the
+  local-only tools never load the search stack or the Pinecone SDK, and the
+  manager creates its client on first use
+- Tools with their own CLI (reconcile, generations, warmup, ...) run as
+  subcommands with their arguments passed through unchanged
+- `startup` measures help/local-command start times against STARTUP_BUDGET_MS
+
+Usage:
+    python deckbot.py search "유튜버 협업 마케팅" [--top-k 20] [--rerank-top-n 5] [--namespace global]
+                      [--filter '{"industry": {"$eq": "보험"}}'] [--keywords "1020 타겟,MZ"]
+    python deckbot.py ingest output/ilgram_DB_insurance_0529_metadata.json [--dedup] [--replace]
+    python deckbot.py search-many benchmarks/golden_queries.json [--concurrency 8]
+    python deckbot.py reconcile check output --deep
+    python deckbot.py --help
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Configuration
+STARTUP_BUDGET_MS = 150  # --help and local-only commands, wall clock incl. interpreter start
+STARTUP_RUNS = 5
+DEFAULT_OUTPUT_DIR = "/Users/kjyoo/DeckBot/output"
+
+# Subcommand → module whose main() reads sys.argv (imported only when run)
+TOOLS = {
+    "serve": ("deckbot_query_service", "HTTP query service"),
+    "warmup": ("deckbot_warmup", "Probe indexes and prefetch popular queries"),
+    "watch": ("deckbot_watch", "Watch a folder and ingest new or changed decks"),
+    "reconcile": ("deckbot_reconcile", "Diff indexes against local metadata; apply repair plans"),
+    "generations": ("deckbot_generations", "Blue/green index generations"),
+    "transform": ("transform_to_pinecone_format", "Metadata JSON → Pinecone batch files"),
+    "validate": ("validate_transformation", "Check a transformation's output"),
+    "vocabulary": ("deckbot_vocabulary", "Incremental deckbot-metadata.json builder"),
+    "keywords": ("deckbot_keywords", "Keyword canonicalization index"),
+    "migrate-keywords": ("deckbot_migrate_keywords", "Keyword strings → list metadata"),
+    "snapshot": ("deckbot_snapshot", "Memory-mapped corpus snapshot"),
+    "vector-snapshot": ("deckbot_vector_snapshot", "Export/import raw vectors without re-embedding"),
+    "artifacts": ("deckbot_artifacts", "Content-addressed batch/chunk store"),
+    "dedup": ("deckbot_dedup", "Near-duplicate and boilerplate slide scan"),
+    "policy": ("deckbot_ingest_policy", "Ingestion policy report"),
+    "rerank-cache": ("deckbot_rerank_cache", "Rerank score cache"),
+    "trace": ("deckbot_tracing", "Search trace summaries"),
+    "metrics": ("deckbot_metrics", "Metrics registry tools"),
+    "benchmark": ("deckbot_benchmark", "Retrieval benchmark"),
+    "ingest-benchmark": ("deckbot_ingest_benchmark", "Ingest throughput benchmark"),
+    "local-pinecone": ("deckbot_local_pinecone", "Local Pinecone stand-in server"),
+    "synthetic-corpus": ("deckbot_synthetic_corpus", "Generate a synthetic corpus"),
+}
+
+# Commands timed by `startup` (must not touch the network)
+STARTUP_COMMANDS = [["--help"], ["search", "--help"], ["keywords", "lookup", "startup"]]
+
+
+def _filters(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    clauses = []
+    if args.filter:
+        try:
+            clauses.append(json.loads(args.filter))
+        except json.JSONDecodeError as e:
+            raise SystemExit(f"❌ Error: --filter is not valid JSON: {e}")
+    if args.company:
+        clauses.append({"company": {"$eq": args.company}})
+    if args.industry:
+        clauses.append({"industry": {"$eq": args.industry}})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def _keywords(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    return [keyword.strip() for keyword in value.split(",") if keyword.strip()]
+
+
+def _manager(args: argparse.Namespace) -> Any:
+    # Imported here: help and tool commands never load the search stack
+    from deckbot_unified_index import DeckBotIndexManager
+
+    manager = DeckBotIndexManager(generation=getattr(args, "generation", None))
+    if getattr(args, "dedup", False):
+        from deckbot_dedup import SlideDeduplicator
+
+        manager.deduplicator = SlideDeduplicator()
+    return manager
+
+
+def cmd_setup(args: argparse.Namespace) -> int:
+    _manager(args).setup_indexes()
+    return 0
+
+
+def cmd_ingest(args: argparse.Namespace) -> int:
+    from pathlib import Path
+
+    manager = _manager(args)
+    if manager.deduplicator is not None:
+        from deckbot_dedup import STORE_FILENAME
+
+        manager.deduplicator.use_store(Path(args.path).parent / STORE_FILENAME)
+    manager.ingest_pdf_metadata(args.path, namespace=args.namespace, replace=args.replace)
+    if manager.deduplicator is not None:
+        manager.deduplicator.save_store()
+        manager.deduplicator.print_summary()
+    return 0
+
+
+def cmd_ingest_all(args: argparse.Namespace) -> int:
+    _, failed = _manager(args).ingest_bulk(args.output_dir, replace=args.replace)
+    return 1 if failed else 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    totals = _manager(args).sweep_stale_slides(args.output_dir, dry_run=args.dry_run)
+    print(f"\n✅ {totals['stale']} stale records in {totals['decks_with_stale']} of {totals['decks']} decks"
+          + ("" if args.dry_run else f", {totals['deleted']} deleted"))
+    return 0
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    query = " ".join(args.query)
+    manager = _manager(args)
+    kwargs = dict(namespace=args.namespace, filters=_filters(args), top_k=args.top_k,
+                  rerank_top_n=args.rerank_top_n, fusion=args.fusion, rerank=not args.no_rerank,
+                  keywords=_keywords(args.keywords))
+    if args.canonical_keywords:
+        # Variants of each keyword match through the canonical keyword index
+        kwargs["filters"] = manager.keyword_index.keyword_filter(_keywords(args.canonical_keywords))
+        if args.filter or args.company or args.industry:
+            kwargs["filters"] = {"$and": [_filters(args), kwargs["filters"]]}
+
+    if not args.stream:
+        manager.cascading_search(query, **kwargs)
+        return 0
+
+    from deckbot_results import STAGE_RERANKED
+
+    for result in manager.cascading_search_stream(query, **kwargs):
+        label = "✅ Final (reranked)" if result.stage == STAGE_RERANKED else (
+            "✅ Final (fused)" if result.final else "⏳ Provisional (fused)")
+        print(f"\n{label} after {result.elapsed_ms:.0f}ms, {result.candidates} candidates")
+        for hit in result.hits:
+            preview = " ".join(hit.content.split())[:60]
+            print(f"   {hit.rank}. {hit.score:.4f}  {hit.id}  {preview}")
+    return 0
+
+
+def cmd_search_many(args: argparse.Namespace) -> int:
+    from pathlib import Path
+
+    from deckbot_unified_index import run_search_many
+
+    failed = run_search_many(
+        _manager(args), Path(args.file), namespace=args.namespace, filters=_filters(args),
+        top_k=args.top_k, rerank_top_n=args.rerank_top_n, fusion=args.fusion, rerank=not args.no_rerank,
+        keywords=_keywords(args.keywords), concurrency=args.concurrency,
+        rerank_concurrency=args.rerank_concurrency
+    )
+    return 1 if failed else 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    _manager(args).get_index_stats()
+    return 0
+
+
+def cmd_startup(args: argparse.Namespace) -> int:
+    """Time fresh interpreter runs of local-only commands against the budget"""
+    import os
+    import subprocess
+    from statistics import median
+
+    script = os.path.abspath(__file__)
+    print(f"⏱️  Startup budget: {args.budget_ms:.0f}ms (median of {args.runs} runs)")
+    over = 0
+    for command in STARTUP_COMMANDS:
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, script, *command], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=False)
+            timings.append((time.perf_counter() - started) * 1000)
+        elapsed = median(timings)
+        ok = elapsed <= args.budget_ms
+        over += not ok
+        print(f"   {'✅' if ok else '❌'} deckbot.py {' '.join(command):<28} {elapsed:6.0f}ms")
+    return 1 if over else 0
+
+
+def _add_search_flags(parser: argparse.ArgumentParser):
+    parser.add_argument("--namespace", default="global", help="Namespace (default: global)")
+    parser.add_argument("--filter", help='Metadata filter as JSON, e.g. \'{"industry": {"$eq": "보험"}}\'')
+    parser.add_argument("--company", help="Only this company's decks")
+    parser.add_argument("--industry", help="Only this industry's decks")
+    parser.add_argument("--keywords", help="Comma-separated; records tagged with any of them")
+    parser.add_argument("--top-k", type=int, default=20, help="Results from each index (default: 20)")
+    parser.add_argument("--rerank-top-n", type=int, default=5, help="Final results (default: 5)")
+    parser.add_argument("--fusion", choices=("average", "rrf"), default="average")
+    parser.add_argument("--no-rerank", action="store_true", help="Return the fused ranking")
+    parser.add_argument("--generation", help="Search this index generation instead of the active one")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="deckbot.py",
+        description="DeckBot indexing, search and maintenance",
+        epilog="Tool commands pass their remaining arguments through, "
+               "e.g. `deckbot.py reconcile check output --deep`. "
+               "Per-stage latency: DECKBOT_TRACE_FILE=logs/search-trace.json deckbot.py search ..., "
+               "then `deckbot.py trace summary logs/search-trace.json`.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>")
+
+    setup_parser = subparsers.add_parser("setup", help="Create the dense and sparse indexes")
+    setup_parser.set_defaults(handler=cmd_setup)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Ingest one *_metadata.json")
+    ingest_parser.add_argument("path")
+    ingest_parser.add_argument("--namespace", help="Default: doc:{pdf_id}")
+    ingest_parser.add_argument("--dedup", action="store_true", help="Drop near-duplicate and boilerplate slides")
+    ingest_parser.add_argument("--replace", action="store_true", help="Delete slides the deck no longer has")
+    ingest_parser.add_argument("--generation", help="Ingest into this index generation")
+    ingest_parser.set_defaults(handler=cmd_ingest)
+
+    ingest_all_parser = subparsers.add_parser("ingest-all", help="Ingest every *_metadata.json in a directory")
+    ingest_all_parser.add_argument("output_dir", nargs="?", default=DEFAULT_OUTPUT_DIR)
+    ingest_all_parser.add_argument("--dedup", action="store_true")
+    ingest_all_parser.add_argument("--replace", action="store_true")
+    ingest_all_parser.add_argument("--generation")
+    ingest_all_parser.set_defaults(handler=cmd_ingest_all)
+
+    sweep_parser = subparsers.add_parser("sweep", help="Delete stale slides of every deck in a directory")
+    sweep_parser.add_argument("output_dir", nargs="?", default=DEFAULT_OUTPUT_DIR)
+    sweep_parser.add_argument("--dry-run", action="store_true")
+    sweep_parser.add_argument("--dedup", action="store_true", help="Corpus was ingested with --dedup")
+    sweep_parser.set_defaults(handler=cmd_sweep)
+
+    search_parser = subparsers.add_parser("search", help="Cascading search (dense + sparse + rerank)")
+    search_parser.add_argument("query", nargs="+")
+    _add_search_flags(search_parser)
+    search_parser.add_argument("--canonical-keywords",
+                               help="Comma-separated; variants match through the keyword index")
+    search_parser.add_argument("--stream", action="store_true", help="Show fused results first, then reranked")
+    search_parser.set_defaults(handler=cmd_search)
+
+    many_parser = subparsers.add_parser("search-many", help="Run a query file (one per line, or golden JSON)")
+    many_parser.add_argument("file")
+    _add_search_flags(many_parser)
+    many_parser.add_argument("--concurrency", type=int, default=8, help="Queries retrieving at once")
+    many_parser.add_argument("--rerank-concurrency", type=int, default=4, help="Rerank calls in flight")
+    many_parser.set_defaults(handler=cmd_search_many)
+
+    stats_parser = subparsers.add_parser("stats", help="Index statistics")
+    stats_parser.add_argument("--generation")
+    stats_parser.set_defaults(handler=cmd_stats)
+
+    startup_parser = subparsers.add_parser("startup", help="Measure start times of local-only commands")
+    startup_parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    startup_parser.add_argument("--runs", type=int, default=STARTUP_RUNS)
+    startup_parser.set_defaults(handler=cmd_startup)
+
+    # Listed for --help only; main() hands these to the tool's own main()
+    for name, (_, description) in TOOLS.items():
+        subparsers.add_parser(name, help=description, add_help=False)
+
+    return parser
+
+
+def _legacy_argv(argv: List[str]) -> List[str]:
+    """Old deckbot_unified_index.py spellings → current subcommands"""
+    if not argv:
+        return argv
+    command, rest = argv[0], argv[1:]
+    if command in ("search-company", "search-industry", "search-keywords") and len(rest) > 1:
+        flag = {"search-company": "--company", "search-industry": "--industry",
+                "search-keywords": "--canonical-keywords"}[command]
+        return ["search", *rest[1:], flag, rest[0]]
+    if command == "search-stream":
+        return ["search", *rest, "--stream"]
+    if command == "replace":
+        return ["ingest", *rest, "--replace"]
+    if command == "replace-all":
+        return ["ingest-all", *rest, "--replace"]
+    return argv
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = _legacy_argv(list(sys.argv[1:] if argv is None else argv))
+    if argv and argv[0] in TOOLS:
+        import importlib
+
+        # Dispatched before argparse so the tool sees its own flags (--help included)
+        sys.argv = [f"deckbot.py {argv[0]}", *argv[1:]]
+        return importlib.import_module(TOOLS[argv[0]][0]).main() or 0
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 1
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+DeckBot Artifact Store
+Content-addressed, compressed record blobs referenced by small manifests
+
+- Records are serialized once as NDJSON (one compact JSON object per line),
+  compressed with zstd (zstandard package) or gzip when it is not installed,
+  and stored as objects/<hh>/<hash>.ndjson.zst (or .ndjson.gz)
+- The hash (BLAKE2b-128 of the uncompressed NDJSON) names the object, so
+  identical content is written once: re-running a transform costs a hash
+- Manifests list chunks as (blob, start, stop) record ranges; batching and
+  re-chunking (split_and_upsert.py) only write a new manifest
+- load_chunks() reads a manifest back as (name, records) pairs, decoding
+  each blob once; load_batches() does the same for a batch directory with
+  or without a manifest; `export` writes plain batch JSON for tools that need files
+- gc removes objects no manifest under the given directories references
+  (any *.json written by write_manifest counts, whatever its name)
+
+Configuration:
+    DECKBOT_ARTIFACT_STORE=output/artifacts   store root (default: <output_dir>/artifacts)
+
+Usage:
+    python deckbot_artifacts.py stats [store_dir]
+    python deckbot_artifacts.py cat <manifest.json> <chunk_name>
+    python deckbot_artifacts.py rechunk <manifest.json> <size> <out_manifest.json>
+    python deckbot_artifacts.py export <manifest.json> <out_dir>
+    python deckbot_artifacts.py gc <manifest_dir> [...] [--store DIR] [--dry-run]
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import zstandard
+except ImportError:  # gzip fallback
+    zstandard = None
+
+# Configuration
+STORE_ENV = "DECKBOT_ARTIFACT_STORE"
+STORE_DIRNAME = "artifacts"
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent.parent / "output"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+ZSTD_LEVEL = 10
+GZIP_LEVEL = 6
+GC_GRACE_SECONDS = 3600  # Unreferenced objects younger than this may belong to a manifest being written
+MANIFEST_SNIFF_BYTES = 256  # write_manifest puts "store" in the first lines; other JSON is skipped unparsed
+CODECS = ("zst", "gz")
+
+Chunk = Dict[str, Any]  # {"name", "record_count", "parts": [{"blob", "start", "stop"}]}
+
+
+def serialize(records: Iterable[Dict[str, Any]]) -> bytes:
+    return "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                   for record in records).encode("utf-8")
+
+
+def blob_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ArtifactStore:
+    """objects/<hh>/<hash>.ndjson.<codec> under root; writes are atomic and idempotent"""
+
+    def __init__(self, root: Path, codec: Optional[str] = None):
+        self.root = Path(root)
+        self.codec = codec or ("zst" if zstandard is not None else "gz")
+        if self.codec not in CODECS:
+            raise ValueError(f"Unknown codec: {self.codec}")
+        if self.codec == "zst" and zstandard is None:
+            raise ValueError("zstd needs the zstandard package (pip install zstandard)")
+        self.written = 0  # Blobs written by this instance
+        self.reused = 0  # Puts whose content was already stored
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    @classmethod
+    def from_env(cls, output_dir: Optional[Path] = None) -> "ArtifactStore":
+        root = os.environ.get(STORE_ENV)
+        if not root:
+            if output_dir is None:
+                raise ValueError(f"Set {STORE_ENV} or pass an output directory")
+            root = Path(output_dir) / STORE_DIRNAME
+        return cls(Path(root))
+
+    def path(self, blob: str, codec: Optional[str] = None) -> Path:
+        return self.root / "objects" / blob[:2] / f"{blob}.ndjson.{codec or self.codec}"
+
+    def find(self, blob: str) -> Optional[Path]:
+        for codec in (self.codec,) + tuple(c for c in CODECS if c != self.codec):
+            path = self.path(blob, codec)
+            if path.exists():
+                return path
+        return None
+
+    def put(self, records: List[Dict[str, Any]]) -> str:
+        """Store records (unless already stored) and return their hash"""
+        data = serialize(records)
+        blob = blob_hash(data)
+        self.raw_bytes += len(data)
+        existing = self.find(blob)
+        if existing is not None:
+            self.reused += 1
+            self.stored_bytes += existing.stat().st_size
+            return blob
+
+        if self.codec == "zst":
+            compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        else:
+            compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        path = self.path(blob)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        self.written += 1
+        self.stored_bytes += len(compressed)
+        return blob
+
+    def get(self, blob: str) -> List[Dict[str, Any]]:
+        path = self.find(blob)
+        if path is None:
+            raise KeyError(f"Blob not in {self.root}: {blob}")
+        with open(path, "rb") as f:
+            compressed = f.read()
+        if path.name.endswith(".zst"):
+            if zstandard is None:
+                raise ValueError(f"{path.name} is zstd-compressed; install the zstandard package")
+            data = zstandard.ZstdDecompressor().decompress(compressed)
+        else:
+            data = gzip.decompress(compressed)
+        return [json.loads(line) for line in data.decode("utf-8").splitlines() if line]
+
+    def objects(self) -> Iterator[Path]:
+        yield from (self.root / "objects").glob("*/*.ndjson.*")
+
+    def stats(self) -> Dict[str, Any]:
+        sizes = [path.stat().st_size for path in self.objects()]
+        return {"root": str(self.root), "codec": self.codec, "objects": len(sizes), "bytes": sum(sizes)}
+
+
+# ============================================================================
+# Manifests
+# ============================================================================
+
+def chunk_ranges(blob: str, record_count: int, size: int, prefix: str = "batch") -> List[Chunk]:
+    """Chunks of up to size records over one blob, named <prefix>_001, <prefix>_002, ..."""
+    return [
+        {"name": f"{prefix}_{number:03d}", "record_count": min(size, record_count - start),
+         "parts": [{"blob": blob, "start": start, "stop": min(start + size, record_count)}]}
+        for number, start in enumerate(range(0, record_count, size), 1)
+    ]
+
+
+def rechunk(chunks: List[Chunk], size: int) -> List[Chunk]:
+    """Split each chunk into pieces of up to size records (<name>_chunk_NN); no record is copied"""
+    result = []
+    for chunk in chunks:
+        pieces: List[List[Dict[str, Any]]] = [[]]
+        filled = 0
+        for part in chunk["parts"]:
+            start = part["start"]
+            while start < part["stop"]:
+                if filled == size:
+                    pieces.append([])
+                    filled = 0
+                stop = min(part["stop"], start + size - filled)
+                pieces[-1].append({"blob": part["blob"], "start": start, "stop": stop})
+                filled += stop - start
+                start = stop
+        for number, parts in enumerate(pieces, 1):
+            if parts:
+                result.append({"name": f"{chunk['name']}_chunk_{number:02d}",
+                               "record_count": sum(p["stop"] - p["start"] for p in parts), "parts": parts})
+    return result
+
+
+def write_manifest(path: Path, store: ArtifactStore, chunks: List[Chunk], **fields: Any) -> Path:
+    manifest = {"version": MANIFEST_VERSION, "store": str(store.root.resolve()), **fields, "chunks": chunks}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_manifest(path: Path) -> Tuple[Dict[str, Any], ArtifactStore]:
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION or "store" not in manifest:
+        raise ValueError(f"Not an artifact manifest: {path}")
+    return manifest, ArtifactStore(Path(manifest["store"]))
+
+
+def load_chunks(path: Path, names: Optional[Set[str]] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """(chunk name, records) for each chunk of a manifest, optionally only the named ones"""
+    manifest, store = read_manifest(path)
+    decoded: Dict[str, List[Dict[str, Any]]] = {}
+    for chunk in manifest["chunks"]:
+        if names is not None and chunk["name"] not in names:
+            continue
+        records: List[Dict[str, Any]] = []
+        for part in chunk["parts"]:
+            if part["blob"] not in decoded:
+                decoded[part["blob"]] = store.get(part["blob"])
+            records.extend(decoded[part["blob"]][part["start"]:part["stop"]])
+        yield chunk["name"], records
+
+
+def load_batches(batch_dir: Path, pattern: str = "batch_*.json") -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """(name, records) per batch: from manifest.json after a --store transform, else the batch files"""
+    batch_dir = Path(batch_dir)
+    manifest_file = batch_dir / MANIFEST_FILENAME
+    if manifest_file.exists():
+        yield from load_chunks(manifest_file)
+        return
+    for path in sorted(batch_dir.glob(pattern)):
+        with open(path, "r", encoding="utf-8") as f:
+            yield path.name, json.load(f)
+
+
+def _is_manifest(path: Path) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return b'"store"' in f.read(MANIFEST_SNIFF_BYTES)
+    except OSError:
+        return False
+
+
+def referenced_blobs(roots: Iterable[Path]) -> Set[str]:
+    """Blobs referenced by any artifact manifest (a *.json file of any name) under roots"""
+    blobs: Set[str] = set()
+    for root in roots:
+        for path in Path(root).rglob("*.json"):
+            if not _is_manifest(path):
+                continue  # Batch files and other JSON
+            try:
+                manifest, _ = read_manifest(path)
+            except (OSError, ValueError):
+                continue
+            blobs.update(part["blob"] for chunk in manifest["chunks"] for part in chunk.get("parts", ()))
+    return blobs
+
+
+def gc(store: ArtifactStore, roots: Iterable[Path], dry_run: bool = False) -> List[Path]:
+    """Delete (or, with dry_run, list) objects no manifest under roots references"""
+    keep = referenced_blobs(roots)
+    cutoff = time.time() - GC_GRACE_SECONDS
+    removed = []
+    for path in store.objects():
+        if path.name.split(".", 1)[0] in keep or path.stat().st_mtime > cutoff:
+            continue
+        if not dry_run:
+            path.unlink()
+        removed.append(path)
+    return removed
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ("stats", "cat", "rechunk", "export", "gc"):
+        print("""
+DeckBot Artifact Store
+
+Usage:
+  python deckbot_artifacts.py stats [store_dir]
+  python deckbot_artifacts.py cat <manifest.json> <chunk_name>
+  python deckbot_artifacts.py rechunk <manifest.json> <size> <out_manifest.json>
+  python deckbot_artifacts.py export <manifest.json> <out_dir>
+  python deckbot_artifacts.py gc <manifest_dir> [...] [--store DIR] [--dry-run]
+
+Write batches to the store with: python transform_to_pinecone_format.py <metadata.json> --store
+        """)
+        return 1
+
+    command, args = sys.argv[1], sys.argv[2:]
+    try:
+        if command == "stats":
+            store = ArtifactStore(Path(args[0])) if args else ArtifactStore.from_env(DEFAULT_OUTPUT_DIR)
+            stats = store.stats()
+            print(f"🗄️  {stats['root']}: {stats['objects']} objects, {stats['bytes'] / 1024:.0f} KB "
+                  f"(new blobs use {stats['codec']})")
+            return 0
+
+        if command == "cat" and len(args) == 2:
+            for _, records in load_chunks(Path(args[0]), {args[1]}):
+                print(json.dumps(records, ensure_ascii=False, indent=2))
+                return 0
+            print(f"❌ Error: No chunk named {args[1]}")
+            return 1
+
+        if command == "rechunk" and len(args) == 3:
+            manifest, store = read_manifest(Path(args[0]))
+            chunks = rechunk(manifest.pop("chunks"), int(args[1]))
+            extra = {k: v for k, v in manifest.items() if k not in ("version", "store")}
+            write_manifest(Path(args[2]), store, chunks, **extra)
+            print(f"✅ {len(chunks)} chunks of ≤{args[1]} records → {args[2]}")
+            return 0
+
+        if command == "export" and len(args) == 2:
+            out_dir = Path(args[1])
+            out_dir.mkdir(parents=True, exist_ok=True)
+            count = 0
+            for name, records in load_chunks(Path(args[0])):
+                with open(out_dir / f"{name}.json", "w", encoding="utf-8") as f:
+                    json.dump(records, f, ensure_ascii=False, indent=2)
+                count += 1
+            print(f"✅ Exported {count} chunk files to {out_dir}")
+            return 0
+
+        if command == "gc" and args:
+            dry_run = "--dry-run" in args
+            args = [arg for arg in args if arg != "--dry-run"]
+            store_dir = None
+            if "--store" in args:
+                position = args.index("--store")
+                store_dir = args[position + 1]
+                del args[position:position + 2]
+            store = ArtifactStore(Path(store_dir)) if store_dir else ArtifactStore.from_env(DEFAULT_OUTPUT_DIR)
+            removed = gc(store, [Path(arg) for arg in args], dry_run)
+            size = sum(path.stat().st_size for path in removed) if dry_run else None
+            verb = "Would delete" if dry_run else "Deleted"
+            print(f"🧹 {verb} {len(removed)} unreferenced objects" + (f" ({size / 1024:.0f} KB)" if dry_run else ""))
+            return 0
+    except (KeyError, OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    print(f"❌ Error: Wrong arguments for {command}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+DeckBot Retrieval Benchmark
+Replays golden Korean queries through DeckBotIndexManager.cascading_search
+and reports speed and quality per configuration
+
+- Latency percentiles (p50/p95/p99) and QPS under N concurrent clients
+- recall@k and MRR against expected deck/slide IDs
+- Configuration matrix: fusion method, top_k, rerank on/off, backend
+  (replay stub, local stand-in server, or remote Pinecone)
+- Offline replay from a recorded-response stub, so CI needs no API key;
+  record with the same --fusion/--top-k lists as the runs, since each
+  combination can rerank a different candidate set (candidates without a
+  recorded score are left out of the ranking and counted as "unscored")
+- Baseline comparison that fails on quality or latency regressions
+- CI fixture: benchmarks/golden_queries.json over a fixed synthetic corpus,
+  with recording.json and baseline.json committed next to it; benchmark-ci.sh
+  replays it (and rebuilds it with "record" on the local stand-in).
+  benchmarks/golden_queries_production.json is for live runs
+
+Golden file format:
+{
+    "queries": [
+        {
+            "query": "유튜버 협업 마케팅 전략",
+            "expected_ids": ["ilgram_2025_slide_012"],   # slide-level (optional)
+            "expected_pdf_ids": ["ilgram_2025"],         # deck-level (optional)
+            "namespace": "global",                      # optional
+            "filters": {"industry": {"$eq": "보험"}}     # optional
+        }
+    ]
+}
+
+Usage:
+    python deckbot_benchmark.py record <golden.json> <recording.json> [--fusion average,rrf] [--top-k 20,100]
+    python deckbot_benchmark.py run <golden.json> --recording <recording.json> [options]
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from deckbot_metrics import percentile
+
+# Configuration
+RECORD_TOP_K = 100  # Recorded search depth; replays slice this to the requested top_k
+RERANK_RECORD_CHUNK = 100  # Max documents per rerank call while recording
+DEFAULT_CLIENTS = 8
+LATENCY_TOLERANCE = 0.5  # Allowed p95 slowdown vs. baseline (50%)
+QUALITY_TOLERANCE = 0.01  # Allowed recall/MRR drop vs. baseline
+RECORDING_VERSION = 1
+
+
+class _Response(dict):
+    """dict with attribute access, mirroring SDK response objects"""
+
+    __getattr__ = dict.get
+
+
+def _search_key(index_name: str, namespace: str, query: Dict[str, Any]) -> str:
+    return json.dumps(
+        [index_name, namespace, query["inputs"]["text"], query.get("filter")],
+        ensure_ascii=False, sort_keys=True
+    )
+
+
+def _rerank_key(model: str, query: str) -> str:
+    return json.dumps([model, query], ensure_ascii=False)
+
+
+# ============================================================================
+# Recording (live Pinecone) and replay (offline stub) clients
+# ============================================================================
+
+class RecordingClient:
+    """Wraps a live Pinecone client and records search and rerank responses"""
+
+    def __init__(self, pc: Any):
+        self._pc = pc
+        self.searches: Dict[str, List[Dict[str, Any]]] = {}
+        self.rerank_scores: Dict[str, Dict[str, float]] = {}
+        self.inference = _RecordingInference(self)
+
+    def Index(self, name: str) -> "_RecordingIndex":
+        return _RecordingIndex(self, name)
+
+    def save(self, path: Path):
+        data = {
+            "version": RECORDING_VERSION,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "searches": self.searches,
+            "rerank": self.rerank_scores,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+class _RecordingIndex:
+    def __init__(self, client: RecordingClient, name: str):
+        self._client = client
+        self._index = client._pc.Index(name)
+        self.name = name
+
+    def search(self, namespace: str, query: Dict[str, Any]):
+        deep_query = dict(query, top_k=max(query["top_k"], RECORD_TOP_K))
+        response = self._index.search(namespace=namespace, query=deep_query)
+        hits = [
+            {"_id": hit["_id"], "_score": hit["_score"], "fields": dict(hit["fields"])}
+            for hit in response["result"]["hits"]
+        ]
+        self._client.searches[_search_key(self.name, namespace, query)] = hits
+        return _Response(result={"hits": hits[:query["top_k"]]})
+
+
+class _RecordingInference:
+    def __init__(self, client: RecordingClient):
+        self._client = client
+
+    def rerank(self, model: str, query: str, documents: List[Dict[str, Any]],
+               top_n: int, **kwargs: Any):
+        # Score every candidate (in chunks) so replays can rerank any subset
+        scores = self._client.rerank_scores.setdefault(_rerank_key(model, query), {})
+        for start in range(0, len(documents), RERANK_RECORD_CHUNK):
+            chunk = documents[start:start + RERANK_RECORD_CHUNK]
+            response = self._client._pc.inference.rerank(
+                model=model, query=query, documents=chunk, top_n=len(chunk), **kwargs
+            )
+            # Keyed through the index: the manager may not ask for documents back
+            for item in response.data:
+                scores[chunk[item["index"]]["_id"]] = item["score"]
+
+        return _rank_documents(documents, scores, top_n)
+
+
+class ReplayClient:
+    """
+    Offline stand-in that serves recorded responses
+
+    latency_ms adds a sleep per upstream call to emulate network round-trips
+    when measuring concurrency.
+    """
+
+    def __init__(self, recording_path: Path, latency_ms: float = 0.0):
+        with open(recording_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {data.get('version')}")
+        self.searches = data["searches"]
+        self.rerank_scores = data["rerank"]
+        self.latency = latency_ms / 1000.0
+        self.unscored = 0  # Rerank candidates without a recorded score (left unranked)
+        self._lock = threading.Lock()
+        self.inference = _ReplayInference(self)
+
+    def Index(self, name: str) -> "_ReplayIndex":
+        return _ReplayIndex(self, name)
+
+    def has_index(self, name: str) -> bool:
+        return True
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class _ReplayIndex:
+    def __init__(self, client: ReplayClient, name: str):
+        self._client = client
+        self.name = name
+
+    def search(self, namespace: str, query: Dict[str, Any]):
+        key = _search_key(self.name, namespace, query)
+        if key not in self._client.searches:
+            raise KeyError(f"No recorded search for {key}; re-run 'record'")
+        self._client._wait()
+        return _Response(result={"hits": self._client.searches[key][:query["top_k"]]})
+
+
+class _ReplayInference:
+    def __init__(self, client: ReplayClient):
+        self._client = client
+
+    def rerank(self, model: str, query: str, documents: List[Dict[str, Any]],
+               top_n: int, **kwargs: Any):
+        key = _rerank_key(model, query)
+        if key not in self._client.rerank_scores:
+            raise KeyError(f"No recorded rerank for {key}; re-run 'record'")
+        scores = self._client.rerank_scores[key]
+        missing = sum(1 for doc in documents if doc["_id"] not in scores)
+        if missing:
+            with self._client._lock:
+                self._client.unscored += missing
+        self._client._wait()
+        return _rank_documents(documents, scores, top_n)
+
+
+def _rank_documents(documents: List[Dict[str, Any]], scores: Dict[str, float], top_n: int):
+    """Rank the documents that have a score (unscored ones are dropped)"""
+    ranked = sorted(
+        ((idx, scores[doc["_id"]], doc) for idx, doc in enumerate(documents) if doc["_id"] in scores),
+        key=lambda item: item[1], reverse=True
+    )
+    return _Response(data=[
+        _Response(index=idx, score=score, document=doc) for idx, score, doc in ranked[:top_n]
+    ])
+
+
+# ============================================================================
+# Scoring
+# ============================================================================
+
+def load_golden(path: Path) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    queries = data["queries"] if isinstance(data, dict) else data
+    for item in queries:
+        if not item.get("expected_ids") and not item.get("expected_pdf_ids"):
+            raise ValueError(f"Golden query has no expectations: {item['query']}")
+    return queries
+
+
+def judge(golden: Dict[str, Any], ranked: List[Tuple[str, str]]) -> Tuple[float, float]:
+    """
+    Return (recall, reciprocal rank) for ranked (id, pdf_id) results
+
+    Slide expectations match on _id; deck expectations match any slide of
+    that deck.
+    """
+    expected_ids = set(golden.get("expected_ids", []))
+    expected_pdfs = set(golden.get("expected_pdf_ids", []))
+
+    found_ids = {doc_id for doc_id, _ in ranked if doc_id in expected_ids}
+    found_pdfs = {pdf_id for _, pdf_id in ranked if pdf_id in expected_pdfs}
+    recall = (len(found_ids) + len(found_pdfs)) / (len(expected_ids) + len(expected_pdfs))
+
+    reciprocal_rank = 0.0
+    for rank, (doc_id, pdf_id) in enumerate(ranked, 1):
+        if doc_id in expected_ids or pdf_id in expected_pdfs:
+            reciprocal_rank = 1.0 / rank
+            break
+
+    return recall, reciprocal_rank
+
+
+def ranked_ids(results: Any) -> List[Tuple[str, str]]:
+    return [
+        (item["document"]["_id"], item["document"].get("pdf_id", ""))
+        for item in results.data
+    ]
+
+
+# ============================================================================
+# Benchmark runs
+# ============================================================================
+
+def config_name(config: Dict[str, Any]) -> str:
+    rerank = "rerank" if config["rerank"] else "norerank"
+    return f"{config['backend']}/{config['fusion']}/k{config['top_k']}/{rerank}"
+
+
+def run_query(manager: Any, golden: Dict[str, Any], config: Dict[str, Any]):
+    from deckbot_unified_index import GLOBAL_NAMESPACE
+
+    return manager.cascading_search(
+        golden["query"],
+        namespace=golden.get("namespace", GLOBAL_NAMESPACE),
+        filters=golden.get("filters"),
+        top_k=config["top_k"],
+        rerank_top_n=config["rerank_top_n"],
+        fusion=config["fusion"],
+        rerank=config["rerank"],
+        verbose=False
+    )
+
+
+def benchmark_config(
+    manager: Any,
+    golden_queries: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    clients: int = DEFAULT_CLIENTS,
+    rounds: int = 3
+) -> Dict[str, Any]:
+    """Serial pass for latency and quality, then a concurrent pass for QPS"""
+    latencies = []
+    recalls = []
+    reciprocal_ranks = []
+    unscored = getattr(manager.pc, "unscored", 0)
+
+    for golden in golden_queries:
+        start = time.perf_counter()
+        results = run_query(manager, golden, config)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        recall, reciprocal_rank = judge(golden, ranked_ids(results))
+        recalls.append(recall)
+        reciprocal_ranks.append(reciprocal_rank)
+    unscored = getattr(manager.pc, "unscored", 0) - unscored
+
+    workload = [golden for _ in range(rounds) for golden in golden_queries]
+    errors = []
+    lock = threading.Lock()
+
+    def worker(golden: Dict[str, Any]):
+        try:
+            run_query(manager, golden, config)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(worker, workload))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "config": config_name(config),
+        "queries": len(golden_queries),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "qps": len(workload) / elapsed if elapsed > 0 else 0.0,
+        "clients": clients,
+        "recall_at_k": sum(recalls) / len(recalls),
+        "mrr": sum(reciprocal_ranks) / len(reciprocal_ranks),
+        "errors": len(errors),
+        "unscored": unscored,
+    }
+
+
+def build_manager(backend: str, recording: Optional[Path], latency_ms: float):
+    from deckbot_unified_index import DeckBotIndexManager
+    from deckbot_tracing import Tracer
+
+    # Tracing off: the benchmark measures the search path, not the exporter.
+    # Coalescing and the rerank cache off: concurrent clients replay the same
+    # golden queries, and sharing their pipelines or scores would overstate backend QPS
+    if backend == "replay":
+        if recording is None:
+            raise ValueError("--recording is required for the replay backend")
+        return DeckBotIndexManager(client=ReplayClient(recording, latency_ms), tracer=Tracer(),
+                                   coalesce=False, cache_reranks=False)
+    if backend == "local":
+        # Local stand-in server (deckbot_local_pinecone.py) via DECKBOT_PINECONE_URL
+        from deckbot_pinecone_client import local_base_url
+        if not local_base_url():
+            raise ValueError("DECKBOT_PINECONE_URL is required for the local backend")
+        return DeckBotIndexManager(tracer=Tracer(), coalesce=False, cache_reranks=False)
+    if backend == "remote":
+        return DeckBotIndexManager(tracer=Tracer(), coalesce=False, cache_reranks=False)
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def compare_to_baseline(
+    reports: List[Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    latency_tolerance: float = LATENCY_TOLERANCE
+) -> List[str]:
+    """Return human-readable regressions (empty list means pass)"""
+    regressions = []
+    for report in reports:
+        previous = baseline.get(report["config"])
+        if not previous:
+            continue
+        for metric in ("recall_at_k", "mrr"):
+            if report[metric] < previous[metric] - QUALITY_TOLERANCE:
+                regressions.append(
+                    f"{report['config']}: {metric} {previous[metric]:.3f} → {report[metric]:.3f}"
+                )
+        if report["p95_ms"] > previous["p95_ms"] * (1 + latency_tolerance):
+            regressions.append(
+                f"{report['config']}: p95 {previous['p95_ms']:.1f}ms → {report['p95_ms']:.1f}ms"
+            )
+        if report["errors"] > previous.get("errors", 0):
+            regressions.append(f"{report['config']}: {report['errors']} errors")
+        if report.get("unscored", 0) > previous.get("unscored", 0):
+            regressions.append(f"{report['config']}: {report['unscored']} unscored rerank candidates")
+    return regressions
+
+
+def print_reports(reports: List[Dict[str, Any]]):
+    print("\n📊 Retrieval Benchmark")
+    print("=" * 100)
+    print(f"   {'Config':<34} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'QPS':>8} {'recall@k':>9} {'MRR':>6} {'errors':>7}")
+    print("   " + "-" * 94)
+    for r in reports:
+        print(f"   {r['config']:<34} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['qps']:>8.1f} {r['recall_at_k']:>9.3f} {r['mrr']:>6.3f} {r['errors']:>7}")
+
+    unscored = [r for r in reports if r.get("unscored")]
+    if unscored:
+        print("\n⚠️  Rerank candidates without a recorded score (ranked out; re-record with this grid):")
+        for r in unscored:
+            print(f"   - {r['config']}: {r['unscored']}")
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _csv(values: str) -> List[str]:
+    return [v.strip() for v in values.split(",") if v.strip()]
+
+
+def cmd_record(args: argparse.Namespace) -> int:
+    from deckbot_unified_index import DeckBotIndexManager
+    from deckbot_tracing import Tracer
+
+    golden_queries = load_golden(args.golden)
+    # Coalescing and the rerank cache off: every rerank call must reach the recorder
+    manager = DeckBotIndexManager(tracer=Tracer(), coalesce=False, cache_reranks=False)
+    recorder = RecordingClient(manager.pc)
+    manager.pc = recorder
+
+    # Searches are recorded RECORD_TOP_K deep once; rerank scores are collected for the
+    # candidate set of every fusion/top_k combination, which dedup and chunk grouping shape
+    grid = list(itertools.product(_csv(args.fusion), [int(k) for k in _csv(args.top_k)]))
+    print(f"\n🎙️  Recording {len(golden_queries)} golden queries "
+          f"({', '.join(f'{fusion}/k{top_k}' for fusion, top_k in grid)})...")
+    for golden in golden_queries:
+        for fusion, top_k in grid:
+            config = {"fusion": fusion, "top_k": top_k, "rerank": True,
+                      "rerank_top_n": args.rerank_top_n, "backend": "remote"}
+            run_query(manager, golden, config)
+        print(f"   ✓ {golden['query']}")
+
+    recorder.save(args.recording)
+    print(f"\n✅ Recording saved: {args.recording}")
+    return 0
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    golden_queries = load_golden(args.golden)
+
+    matrix = itertools.product(
+        _csv(args.backend), _csv(args.fusion), [int(k) for k in _csv(args.top_k)], _csv(args.rerank)
+    )
+    managers: Dict[str, Any] = {}
+    reports = []
+
+    for backend, fusion, top_k, rerank in matrix:
+        if backend not in managers:
+            managers[backend] = build_manager(backend, args.recording, args.latency_ms)
+        config = {
+            "backend": backend,
+            "fusion": fusion,
+            "top_k": top_k,
+            "rerank": rerank == "on",
+            "rerank_top_n": args.rerank_top_n,
+        }
+        reports.append(benchmark_config(managers[backend], golden_queries, config,
+                                        clients=args.clients, rounds=args.rounds))
+
+    print_reports(reports)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Report saved: {args.json}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({r["config"]: r for r in reports}, f, ensure_ascii=False, indent=2)
+        print(f"💾 Baseline saved: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(reports, baseline, args.latency_tolerance)
+        if regressions:
+            print("\n❌ Regressions vs. baseline:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print("\n✅ No regressions vs. baseline")
+
+    return 1 if any(r["errors"] for r in reports) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="DeckBot retrieval benchmark and regression suite"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Record live responses for offline replay")
+    record.add_argument("golden", type=Path)
+    record.add_argument("recording", type=Path)
+    record.add_argument("--fusion", default="average,rrf", help="Comma list of fusion methods to record")
+    record.add_argument("--top-k", default=f"20,{RECORD_TOP_K}", help="Comma list of top_k values to record")
+    record.add_argument("--rerank-top-n", type=int, default=5)
+    record.set_defaults(func=cmd_record)
+
+    run = sub.add_parser("run", help="Benchmark a configuration matrix")
+    run.add_argument("golden", type=Path)
+    run.add_argument("--recording", type=Path, help="Recorded responses for the replay backend")
+    run.add_argument("--backend", default="replay", help="Comma list: replay,local,remote")
+    run.add_argument("--fusion", default="average,rrf", help="Comma list: average,rrf")
+    run.add_argument("--top-k", default="20", help="Comma list of top_k values")
+    run.add_argument("--rerank", default="on,off", help="Comma list: on,off")
+    run.add_argument("--rerank-top-n", type=int, default=5)
+    run.add_argument("--clients", type=int, default=DEFAULT_CLIENTS, help="Concurrent clients for QPS")
+    run.add_argument("--rounds", type=int, default=3, help="Passes over the query set for QPS")
+    run.add_argument("--latency-ms", type=float, default=0.0, help="Simulated upstream latency (replay)")
+    run.add_argument("--baseline", type=Path, help="Fail on regressions vs. this baseline")
+    run.add_argument("--save-baseline", type=Path, help="Write results as a new baseline")
+    run.add_argument("--latency-tolerance", type=float, default=LATENCY_TOLERANCE)
+    run.add_argument("--json", type=Path, help="Write the full report as JSON")
+    run.set_defaults(func=cmd_run)
+
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+DeckBot Slide Chunking
+Splits text-heavy slides into one summary record plus size-bounded content chunks
+
+- Slides whose OCR text fits in CHUNK_MAX_CHARS stay one record, as before
+- Longer slides: the slide ID keeps a summary record (summary, keywords,
+  layout) and the OCR text becomes "{slide_id}_chunk_NN" records
+  (type "slide_chunk"), split on line/sentence boundaries with a small overlap
+- Every slide record carries parent_id (its slide ID), so search can
+  collapse chunk hits back to slides with a max-score group-by
+  (collapse_chunks), and prefix listing by "{pdf_id}_slide_" still finds all
+
+Keeps each embedded text inside the 512-token input of multilingual-e5-large
+and pinecone-sparse-english-v0 instead of truncating long slides.
+"""
+
+import re
+from typing import Any, Callable, Dict, List
+
+# Configuration
+CHUNK_MAX_CHARS = 500  # ~512 tokens of Korean text for multilingual-e5-large
+CHUNK_OVERLAP_CHARS = 60
+CHUNK_TYPE = "slide_chunk"
+
+_UNIT_SPLIT = re.compile(r"\n+|(?<=[.!?。])\s+")
+
+
+def _text_units(text: str, max_chars: int) -> List[str]:
+    """Lines/sentences, with any unit longer than max_chars hard-split"""
+    units = []
+    for unit in _UNIT_SPLIT.split(text):
+        unit = unit.strip()
+        while len(unit) > max_chars:
+            units.append(unit[:max_chars])
+            unit = unit[max_chars:]
+        if unit:
+            units.append(unit)
+    return units
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_MAX_CHARS, overlap: int = CHUNK_OVERLAP_CHARS) -> List[str]:
+    """Pack units greedily into chunks of at most max_chars; a short trailing unit is repeated as overlap"""
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in _text_units(text, max_chars):
+        if current and size + 1 + len(unit) > max_chars:
+            chunks.append(" ".join(current))
+            tail = current[-1]
+            # Carry a short last unit into the next chunk for context
+            if len(tail) <= overlap and len(tail) + 1 + len(unit) <= max_chars:
+                current, size = [tail], len(tail)
+            else:
+                current, size = [], 0
+        size += len(unit) + (1 if current else 0)
+        current.append(unit)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def expand_slide_record(
+    record: Dict[str, Any],
+    slide: Dict[str, Any],
+    build_content: Callable[[Dict[str, Any]], str],
+    max_chars: int = CHUNK_MAX_CHARS
+) -> List[Dict[str, Any]]:
+    """One slide record → [record] or [summary record, chunk records...]"""
+    slide_id = record["_id"]
+    text = (slide.get("slide_content") or "").strip()
+    if not max_chars or len(text) <= max_chars:
+        return [dict(record, parent_id=slide_id)]
+
+    chunks = chunk_text(text, max_chars)
+    summary_content = build_content(dict(slide, slide_content="")).strip() or f"Content: {chunks[0]}"
+    expanded = [dict(record, content=summary_content, parent_id=slide_id, chunk_count=len(chunks))]
+    for number, chunk in enumerate(chunks, 1):
+        expanded.append(dict(
+            record,
+            _id=f"{slide_id}_chunk_{number:02d}",
+            type=CHUNK_TYPE,
+            content=f"Content: {chunk}",
+            parent_id=slide_id,
+            chunk_index=number,
+            chunk_count=len(chunks),
+        ))
+    return expanded
+
+
+def expand_slide_records(
+    records: List[Dict[str, Any]],
+    slides: List[Dict[str, Any]],
+    build_content: Callable[[Dict[str, Any]], str],
+    max_chars: int = CHUNK_MAX_CHARS
+) -> List[Dict[str, Any]]:
+    """Chunk every slide record (matched to its slide by slide_number); others pass through"""
+    by_number = {slide["slide_number"]: slide for slide in slides}
+    expanded: List[Dict[str, Any]] = []
+    for record in records:
+        slide = by_number.get(record.get("slide_number")) if record.get("type") == "slide" else None
+        if slide is None:
+            expanded.append(record)
+        else:
+            expanded.extend(expand_slide_record(record, slide, build_content, max_chars))
+    return expanded
+
+
+def collapse_chunks(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group candidates (sorted best-first) by parent slide, keeping the best-scoring
+    hit per slide under the slide ID; a winning chunk's own ID is kept as chunk_id
+    """
+    kept: Dict[str, Dict[str, Any]] = {}
+    for doc in docs:
+        parent_id = doc.get("parent_id") or doc["_id"]
+        survivor = kept.get(parent_id)
+        if survivor is not None:
+            survivor["matched_chunks"] = survivor.get("matched_chunks", 1) + 1
+            continue
+        if doc["_id"] != parent_id:
+            doc = dict(doc, _id=parent_id, chunk_id=doc["_id"])
+        kept[parent_id] = doc
+    return list(kept.values())
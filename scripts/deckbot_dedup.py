@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+DeckBot Near-Duplicate Slide Detection
+SimHash fingerprints over slide content to drop boilerplate at ingest
+and collapse near-duplicate candidates before rerank
+
+- 64-bit SimHash of character 4-gram shingles (no tokenizer needed for Korean)
+- Banded lookup: fingerprints within MAX_DISTANCE bits always share one of
+  the 8-bit bands, so near-duplicate search stays fast across the corpus
+- Ingest: slides repeating an earlier slide of the same deck are dropped,
+  and slides already seen in MIN_DECKS other decks (agency intros, "Thank
+  You" pages) are dropped as boilerplate; every drop is reported
+- Search: near-duplicate merged candidates collapse into the best-scoring
+  one (duplicate_ids lists the rest), shrinking the rerank payload
+
+Usage:
+    python deckbot_dedup.py scan <metadata_dir> [--max-distance 5] [--min-decks 2] [--report report.json]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import re
+import sys
+import unicodedata
+from contextlib import redirect_stdout
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Configuration
+SHINGLE_SIZE = 4  # Characters per shingle
+FINGERPRINT_BITS = 64
+BAND_BITS = 8  # 8 bands of 8 bits: distance ≤ 7 always shares a band
+MAX_DISTANCE = 5  # Hamming distance (bits) treated as near-duplicate
+MIN_DECKS = 2  # Other decks a slide must appear in to count as boilerplate
+MIN_SHINGLES = 8  # Shorter texts only match exactly (SimHash is noisy on tiny inputs)
+FINGERPRINT_CACHE_SIZE = 10000  # Candidate fingerprints memoized across searches
+STORE_FILENAME = "boilerplate_fingerprints.json"
+REPORT_FILENAME = "dedup_report.json"
+
+_LABEL_PATTERN = re.compile(r"^(content|summary|keywords|layout):\s*", re.IGNORECASE | re.MULTILINE)
+_CONTENT_SECTION = re.compile(r"^Content:\s*(.*?)(?=^(?:Summary|Keywords|Layout):|\Z)", re.MULTILINE | re.DOTALL)
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: str) -> str:
+    """Drop field labels, punctuation, case and width differences"""
+    text = _LABEL_PATTERN.sub("", unicodedata.normalize("NFKC", text))
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def fingerprint_text(content: str) -> str:
+    """
+    The part of a record's content to compare: the raw slide text when the
+    record has a "Content:" section (AI summaries and keywords are reworded
+    per deck even for identical slides), otherwise the whole content
+    """
+    match = _CONTENT_SECTION.search(content)
+    return match.group(1) if match and match.group(1).strip() else content
+
+
+def _shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    compact = normalize_text(text)
+    if len(compact) <= size:
+        return [compact] if compact else []
+    return [compact[i:i + size] for i in range(len(compact) - size + 1)]
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the text's character shingles"""
+    hashes = [
+        format(int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"), "064b")
+        for shingle in _shingles(text)
+    ]
+    # A bit is set when most shingle hashes set it; zip(*) transposes the
+    # bit strings so the per-bit vote runs in C rather than a Python loop
+    majority = len(hashes) / 2
+    fingerprint = 0
+    for column in zip(*hashes):
+        fingerprint = fingerprint << 1 | (column.count("1") > majority)
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint: int) -> Iterable[Tuple[int, int]]:
+    mask = (1 << BAND_BITS) - 1
+    for band in range(FINGERPRINT_BITS // BAND_BITS):
+        yield band, fingerprint >> (band * BAND_BITS) & mask
+
+
+def _matchable(text: str) -> bool:
+    return len(_shingles(text)) >= MIN_SHINGLES
+
+
+@lru_cache(maxsize=FINGERPRINT_CACHE_SIZE)
+def content_signature(content: str) -> Tuple[str, Optional[int]]:
+    """(normalized text, SimHash or None if too short to compare) for a record's content"""
+    text = fingerprint_text(content)
+    return normalize_text(text), simhash(text) if _matchable(text) else None
+
+
+class SimHashIndex:
+    """Fingerprint → payload map with banded near-neighbour lookup"""
+
+    def __init__(self):
+        self.entries: List[Tuple[int, Any]] = []
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+
+    def add(self, fingerprint: int, payload: Any) -> int:
+        position = len(self.entries)
+        self.entries.append((fingerprint, payload))
+        for band in _bands(fingerprint):
+            self._buckets.setdefault(band, []).append(position)
+        return position
+
+    def nearest(self, fingerprint: int, max_distance: int = MAX_DISTANCE) -> Optional[Tuple[Any, int]]:
+        """Closest stored payload within max_distance bits, if any"""
+        best = None
+        seen = set()
+        for band in _bands(fingerprint):
+            for position in self._buckets.get(band, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+                distance = hamming(fingerprint, self.entries[position][0])
+                if distance <= max_distance and (best is None or distance < best[1]):
+                    best = (self.entries[position][1], distance)
+        return best
+
+
+class SlideDeduplicator:
+    """
+    Drops near-duplicate and boilerplate slide records at ingest time
+
+    The boilerplate store (fingerprint → decks it appeared in) can be
+    persisted so the decision holds across runs; the report lists every
+    dropped record with its reason and the record it duplicates.
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE, min_decks: int = MIN_DECKS,
+                 store_path: Optional[Path] = None):
+        self.max_distance = max_distance
+        self.min_decks = min_decks
+        self.store_path = None
+        self.boilerplate = SimHashIndex()
+        self.report: List[Dict[str, Any]] = []
+        self.kept = 0
+        if store_path:
+            self.use_store(store_path)
+
+    def use_store(self, store_path: Path):
+        """Persist boilerplate fingerprints at store_path, loading any already there"""
+        self.store_path = Path(store_path)
+        if self.store_path.exists():
+            self._load_store()
+
+    def filter_records(self, pdf_id: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return records to keep; deck metadata records are never dropped"""
+        deck_index = SimHashIndex()
+        exact: Dict[str, str] = {}
+        kept: List[Dict[str, Any]] = []
+        fingerprints: List[Tuple[int, str]] = []
+
+        for record in records:
+            if record.get("type") != "slide":
+                kept.append(record)
+                continue
+
+            normalized, fingerprint = content_signature(record.get("content", ""))
+            drop = None
+
+            if normalized in exact:
+                drop = ("duplicate_in_deck", exact[normalized], 0)
+            elif fingerprint is not None:
+                match = deck_index.nearest(fingerprint, self.max_distance)
+                if match:
+                    drop = ("duplicate_in_deck", match[0], match[1])
+                else:
+                    match = self.boilerplate.nearest(fingerprint, self.max_distance)
+                    if match and len(match[0]["decks"] - {pdf_id}) >= self.min_decks:
+                        drop = ("boilerplate", match[0]["example_id"], match[1])
+
+            if drop:
+                reason, duplicate_of, distance = drop
+                self.report.append({
+                    "pdf_id": pdf_id,
+                    "_id": record["_id"],
+                    "slide_number": record.get("slide_number"),
+                    "reason": reason,
+                    "duplicate_of": duplicate_of,
+                    "distance": distance,
+                    "preview": " ".join(fingerprint_text(record.get("content", "")).split())[:80],
+                })
+                continue
+
+            exact.setdefault(normalized, record["_id"])
+            if fingerprint is not None:
+                # Stored with the record so search-time collapsing needn't rehash it
+                record["content_simhash"] = f"{fingerprint:016x}"
+                deck_index.add(fingerprint, record["_id"])
+                fingerprints.append((fingerprint, record["_id"]))
+            kept.append(record)
+
+        # Register after the deck is done so a deck never counts toward itself
+        for fingerprint, record_id in fingerprints:
+            self._register(fingerprint, pdf_id, record_id)
+        self.kept += sum(1 for record in kept if record.get("type") == "slide")
+        return kept
+
+    def _register(self, fingerprint: int, pdf_id: str, record_id: str):
+        match = self.boilerplate.nearest(fingerprint, self.max_distance)
+        if match:
+            match[0]["decks"].add(pdf_id)
+        else:
+            self.boilerplate.add(fingerprint, {"decks": {pdf_id}, "example_id": record_id})
+
+    def _load_store(self):
+        with open(self.store_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data.get("fingerprints", []):
+            self.boilerplate.add(int(entry["fingerprint"], 16),
+                                 {"decks": set(entry["decks"]), "example_id": entry["example_id"]})
+
+    def save_store(self):
+        """Persist the boilerplate store (atomic replace)"""
+        if self.store_path is None:
+            return
+        data = {
+            "updated_at": datetime.now().isoformat(),
+            "max_distance": self.max_distance,
+            "fingerprints": [
+                {"fingerprint": f"{fingerprint:016x}", "decks": sorted(payload["decks"]),
+                 "example_id": payload["example_id"]}
+                for fingerprint, payload in self.boilerplate.entries
+                if len(payload["decks"]) > 1  # Singletons are not boilerplate; keep the store small
+            ],
+        }
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(self.store_path)
+
+    def summary(self) -> Dict[str, Any]:
+        by_reason: Dict[str, int] = {}
+        for entry in self.report:
+            by_reason[entry["reason"]] = by_reason.get(entry["reason"], 0) + 1
+        return {"kept_slides": self.kept, "dropped_slides": len(self.report), "by_reason": by_reason}
+
+    def save_report(self, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"generated_at": datetime.now().isoformat(), "summary": self.summary(),
+                       "dropped": self.report}, f, ensure_ascii=False, indent=2)
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"\n🧹 Dedup: kept {summary['kept_slides']} slides, dropped {summary['dropped_slides']}")
+        for reason, count in sorted(summary["by_reason"].items()):
+            print(f"   - {reason}: {count}")
+
+
+def collapse_near_duplicates(docs: List[Dict[str, Any]], max_distance: int = MAX_DISTANCE) -> List[Dict[str, Any]]:
+    """
+    Collapse near-duplicate candidates (sorted best-first) into their best-scoring
+    member; collapsed ids are listed under 'duplicate_ids' on the survivor
+    """
+    index = SimHashIndex()
+    exact: Dict[str, Dict[str, Any]] = {}
+    kept: List[Dict[str, Any]] = []
+
+    for doc in docs:
+        content = doc.get("content", "")
+        stored = doc.get("content_simhash")
+        if stored:
+            normalized, fingerprint = normalize_text(fingerprint_text(content)), int(stored, 16)
+        else:
+            normalized, fingerprint = content_signature(content)
+        survivor = exact.get(normalized)
+        if survivor is None and fingerprint is not None:
+            match = index.nearest(fingerprint, max_distance)
+            survivor = match[0] if match else None
+
+        if survivor is not None:
+            survivor.setdefault("duplicate_ids", []).append(doc["_id"])
+            continue
+
+        exact[normalized] = doc
+        if fingerprint is not None:
+            index.add(fingerprint, doc)
+        kept.append(doc)
+    return kept
+
+
+def scan(metadata_dir: Path, deduplicator: SlideDeduplicator) -> Dict[str, Any]:
+    """Dry run over *_metadata.json files: what would ingest drop?"""
+    from deckbot_keywords import KeywordCanonicalizer
+    from transform_to_pinecone_format import transform_metadata_to_records
+
+    # One keyword index for the whole scan (loading it per file dominated the run)
+    keyword_index = KeywordCanonicalizer.from_env()
+    total = 0
+    for path in sorted(metadata_dir.glob("*_metadata.json")):
+        with redirect_stdout(io.StringIO()):
+            records, doc_info = transform_metadata_to_records(str(path), keyword_index=keyword_index)
+        total += len(records)
+        deduplicator.filter_records(doc_info["pdf_id"], records)
+    # Keywords resolved above stay in memory: a dry run persists nothing
+    return dict(deduplicator.summary(), total_records=total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeckBot near-duplicate slide detection")
+    sub = parser.add_subparsers(dest="command", required=True)
+    scan_parser = sub.add_parser("scan", help="Report slides ingest would drop (no upserts)")
+    scan_parser.add_argument("metadata_dir", type=Path)
+    scan_parser.add_argument("--max-distance", type=int, default=MAX_DISTANCE)
+    scan_parser.add_argument("--min-decks", type=int, default=MIN_DECKS)
+    scan_parser.add_argument("--report", type=Path, help="Write the drop report as JSON")
+    args = parser.parse_args()
+
+    if not args.metadata_dir.is_dir():
+        print(f"❌ Error: Directory not found: {args.metadata_dir}")
+        return 1
+
+    deduplicator = SlideDeduplicator(args.max_distance, args.min_decks)
+    result = scan(args.metadata_dir, deduplicator)
+    print(f"\n🔍 Scanned {result['total_records']} records in {args.metadata_dir}")
+    deduplicator.print_summary()
+    for entry in deduplicator.report[:10]:
+        print(f"   {entry['_id']} ({entry['reason']}, ≈ {entry['duplicate_of']}, d={entry['distance']}): "
+              f"{entry['preview'][:50]}")
+    if args.report:
+        deduplicator.save_report(args.report)
+        print(f"\n💾 Report saved: {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+In-Memory Fake Pinecone for DeckBot
+Local engine with the subset of the Pinecone SDK surface our scripts use,
+for throughput benchmarks, offline runs and the local stand-in server
+
+- Index(name).upsert_records / search / describe_index_stats
+- Index(name).upsert (raw vectors) / list / list_paginated / fetch / update / delete
+- has_index / create_index_for_model / describe_index / delete_index / inference.rerank
+- Deterministic fake embeddings: hashed character n-grams for dense
+  indexes, hashed whitespace tokens for sparse indexes
+- Metadata filters: $eq $ne $in $nin $gt $gte $lt $lte $exists $and $or
+- Enforces the 96-record integrated-embedding limit per upsert call, so
+  batching bugs show up locally instead of in production
+- store=False keeps only counts (no record retention) for large corpora
+"""
+
+import math
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional
+
+# Configuration
+MAX_RECORDS_PER_UPSERT = 96  # Pinecone integrated embedding limit
+MAX_VECTORS_PER_UPSERT = 1000  # Raw vector upserts
+MAX_LIST_LIMIT = 100  # IDs per list page
+MAX_FETCH_IDS = 1000
+DENSE_DIMENSION = 256  # Fake embedding width
+DEFAULT_DENSE_MODEL = "multilingual-e5-large"
+
+
+class AttrDict(dict):
+    """dict with attribute access, mirroring SDK response objects"""
+
+    __getattr__ = dict.get
+
+
+def wrap(value: Any) -> Any:
+    """Recursively convert dicts to AttrDict so SDK-style attribute access works"""
+    if isinstance(value, dict):
+        return AttrDict((k, wrap(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [wrap(v) for v in value]
+    return value
+
+
+# ============================================================================
+# Deterministic fake embeddings
+# ============================================================================
+
+def _bucket(feature: str, size: int) -> int:
+    # crc32 rather than hash(): stable across processes (PYTHONHASHSEED)
+    return zlib.crc32(feature.encode("utf-8")) % size
+
+
+def dense_embed(text: str, dimension: int = DENSE_DIMENSION) -> List[float]:
+    """Unit vector of hashed character bi/trigrams (works for Korean without a tokenizer)"""
+    vector = [0.0] * dimension
+    compact = re.sub(r"\s+", " ", text.lower()).strip()
+    for n in (2, 3):
+        for i in range(len(compact) - n + 1):
+            vector[_bucket(compact[i:i + n], dimension)] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector] if norm else vector
+
+
+def sparse_embed(text: str) -> Dict[int, float]:
+    """Hashed token weights with log-scaled term frequency"""
+    counts: Dict[int, int] = {}
+    for token in re.findall(r"\w+", text.lower()):
+        key = zlib.crc32(token.encode("utf-8"))
+        counts[key] = counts.get(key, 0) + 1
+    return {key: 1.0 + math.log(count) for key, count in counts.items()}
+
+
+def dense_score(a: List[float], b: List[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def sparse_score(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b[key] for key, weight in a.items() if key in b)
+
+
+# ============================================================================
+# Metadata filters
+# ============================================================================
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    values = value if isinstance(value, list) else [value]
+    if op == "$eq":
+        return operand in values
+    if op == "$ne":
+        return operand not in values
+    if op == "$in":
+        return any(v in operand for v in values)
+    if op == "$nin":
+        return not any(v in operand for v in values)
+    if op == "$exists":
+        return (value is not None) == bool(operand)
+    if value is None or isinstance(value, list):
+        return False
+    if op == "$gt":
+        return value > operand
+    if op == "$gte":
+        return value >= operand
+    if op == "$lt":
+        return value < operand
+    if op == "$lte":
+        return value <= operand
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+def matches_filter(record: Dict[str, Any], flt: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a Pinecone metadata filter against a stored record"""
+    if not flt:
+        return True
+    for key, condition in flt.items():
+        if key == "$and":
+            if not all(matches_filter(record, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(record, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            for op, operand in condition.items():
+                if not _compare(record.get(key), op, operand):
+                    return False
+        elif not _compare(record.get(key), "$eq", condition):
+            return False
+    return True
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+class FakeIndex:
+    """One index: {namespace: {record_id: record}} plus precomputed embeddings"""
+
+    def __init__(self, name: str, embed: Optional[Dict[str, Any]] = None, store: bool = True):
+        self.name = name
+        self.embed = embed or {"model": DEFAULT_DENSE_MODEL, "field_map": {"text": "content"}}
+        self.sparse = "sparse" in self.embed.get("model", "")
+        self.field = self.embed.get("field_map", {}).get("text", "content")
+        self.store = store
+        self.namespaces: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.vectors: Dict[str, Dict[str, Any]] = {}
+        self.counts: Dict[str, int] = {}
+        self.upsert_calls = 0
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str) -> Any:
+        return sparse_embed(text) if self.sparse else dense_embed(text)
+
+    def upsert_records(self, namespace: str, records: List[Dict[str, Any]]):
+        if len(records) > MAX_RECORDS_PER_UPSERT:
+            raise ValueError(
+                f"Batch of {len(records)} records exceeds the {MAX_RECORDS_PER_UPSERT}-record upsert limit"
+            )
+
+        prepared = []
+        for record in records:
+            record_id = record.get("_id") or record.get("id")
+            if not record_id:
+                raise ValueError("Record is missing '_id'")
+            if not record.get(self.field):
+                raise ValueError(f"Record {record_id} is missing embed field '{self.field}'")
+            if self.store:
+                prepared.append((record_id, dict(record), self._embed(str(record[self.field]))))
+
+        with self._lock:
+            self.upsert_calls += 1
+            if not self.store:
+                self.counts[namespace] = self.counts.get(namespace, 0) + len(records)
+                return
+            stored = self.namespaces.setdefault(namespace, {})
+            vectors = self.vectors.setdefault(namespace, {})
+            for record_id, record, vector in prepared:
+                stored[record_id] = record
+                vectors[record_id] = vector
+            self.counts[namespace] = len(stored)
+
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str = ""):
+        """Raw vectors ({id, values | sparse_values, metadata}); metadata becomes the stored record"""
+        if len(vectors) > MAX_VECTORS_PER_UPSERT:
+            raise ValueError(
+                f"Batch of {len(vectors)} vectors exceeds the {MAX_VECTORS_PER_UPSERT}-vector upsert limit"
+            )
+
+        prepared = []
+        for vector in vectors:
+            record_id = vector.get("id")
+            if not record_id:
+                raise ValueError("Vector is missing 'id'")
+            if self.sparse:
+                sparse = vector.get("sparse_values") or {}
+                if not sparse.get("indices"):
+                    raise ValueError(f"Vector {record_id} has no sparse_values for sparse index {self.name}")
+                embedding: Any = dict(zip((int(i) for i in sparse["indices"]), sparse["values"]))
+            else:
+                embedding = list(vector.get("values") or [])
+                if len(embedding) != DENSE_DIMENSION:
+                    raise ValueError(
+                        f"Vector {record_id} has dimension {len(embedding)}, index {self.name} expects {DENSE_DIMENSION}"
+                    )
+            prepared.append((record_id, {"_id": record_id, **(vector.get("metadata") or {})}, embedding))
+
+        with self._lock:
+            self.upsert_calls += 1
+            if not self.store:
+                self.counts[namespace] = self.counts.get(namespace, 0) + len(vectors)
+                return wrap({"upserted_count": len(vectors)})
+            stored = self.namespaces.setdefault(namespace, {})
+            stored_vectors = self.vectors.setdefault(namespace, {})
+            for record_id, record, embedding in prepared:
+                stored[record_id] = record
+                stored_vectors[record_id] = embedding
+            self.counts[namespace] = len(stored)
+        return wrap({"upserted_count": len(vectors)})
+
+    def search(self, namespace: str, query: Dict[str, Any], fields: Optional[List[str]] = None):
+        top_k = int(query.get("top_k", 10))
+        query_vector = self._embed(query["inputs"]["text"])
+        score = sparse_score if self.sparse else dense_score
+
+        with self._lock:
+            stored = dict(self.namespaces.get(namespace, {}))
+            vectors = self.vectors.get(namespace, {})
+            scored = [
+                (score(query_vector, vectors[record_id]), record_id)
+                for record_id, record in stored.items()
+                if matches_filter(record, query.get("filter"))
+            ]
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        hits = []
+        for value, record_id in scored[:top_k]:
+            record = stored[record_id]
+            hit_fields = {
+                k: v for k, v in record.items()
+                if k not in ("_id", "id") and (fields is None or k in fields)
+            }
+            hits.append({"_id": record_id, "_score": value, "fields": hit_fields})
+
+        return wrap({"result": {"hits": hits}, "usage": {"read_units": 1 + len(stored) // 1000}})
+
+    def list_paginated(self, prefix: Optional[str] = None, limit: Optional[int] = None,
+                       pagination_token: Optional[str] = None, namespace: str = ""):
+        """One page of record IDs in ID order; pagination.next is the last ID returned"""
+        limit = min(int(limit or MAX_LIST_LIMIT), MAX_LIST_LIMIT)
+        with self._lock:
+            ids = sorted(
+                record_id for record_id in self.namespaces.get(namespace, {})
+                if (not prefix or record_id.startswith(prefix))
+                and (not pagination_token or record_id > pagination_token)
+            )
+        page = ids[:limit]
+        pagination = {"next": page[-1]} if len(ids) > limit else None
+        return wrap({"vectors": [{"id": record_id} for record_id in page], "namespace": namespace,
+                     "pagination": pagination})
+
+    def list(self, prefix: Optional[str] = None, limit: Optional[int] = None, namespace: str = ""):
+        """Yield pages (lists) of record IDs, like the SDK's list()"""
+        token = None
+        while True:
+            response = self.list_paginated(prefix=prefix, limit=limit, pagination_token=token, namespace=namespace)
+            if response.vectors:
+                yield [vector.id for vector in response.vectors]
+            if not response.pagination:
+                return
+            token = response.pagination.next
+
+    def fetch(self, ids: List[str], namespace: str = ""):
+        if len(ids) > MAX_FETCH_IDS:
+            raise ValueError(f"Fetch of {len(ids)} IDs exceeds the {MAX_FETCH_IDS}-ID limit")
+        with self._lock:
+            stored = self.namespaces.get(namespace, {})
+            embeddings = self.vectors.get(namespace, {})
+            vectors = {}
+            for record_id in ids:
+                if record_id not in stored:
+                    continue
+                vector: Dict[str, Any] = {
+                    "id": record_id,
+                    "metadata": {k: v for k, v in stored[record_id].items() if k not in ("_id", "id")},
+                }
+                embedding = embeddings[record_id]
+                if self.sparse:
+                    indices = sorted(embedding)
+                    vector["sparse_values"] = {"indices": indices, "values": [embedding[i] for i in indices]}
+                else:
+                    vector["values"] = list(embedding)
+                vectors[record_id] = vector
+        return wrap({"vectors": vectors, "namespace": namespace})
+
+    def update(self, id: str, set_metadata: Optional[Dict[str, Any]] = None, namespace: str = "", **kwargs: Any):
+        """Merge set_metadata into a stored record (embeddings are left as they are)"""
+        with self._lock:
+            record = self.namespaces.get(namespace, {}).get(id)
+            if record is None:
+                raise KeyError(f"Record not found: {id}")
+            record.update(set_metadata or {})
+        return wrap({})
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False,
+               namespace: str = "", filter: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            stored = self.namespaces.get(namespace, {})
+            vectors = self.vectors.get(namespace, {})
+            if delete_all:
+                targets = list(stored)
+            elif filter:
+                targets = [record_id for record_id, record in stored.items() if matches_filter(record, filter)]
+            else:
+                targets = [record_id for record_id in ids or () if record_id in stored]
+            for record_id in targets:
+                del stored[record_id]
+                vectors.pop(record_id, None)
+            if namespace in self.counts:
+                self.counts[namespace] = len(stored)
+        return wrap({})
+
+    def describe_index_stats(self):
+        with self._lock:
+            namespaces = {
+                ns: {"vector_count": count, "record_count": count}
+                for ns, count in self.counts.items()
+            }
+        total = sum(ns["vector_count"] for ns in namespaces.values())
+        return wrap({"total_vector_count": total, "namespaces": namespaces})
+
+
+class FakeInference:
+    """inference.rerank stand-in scoring documents by fake dense similarity"""
+
+    def rerank(
+        self,
+        model: str,
+        query: str,
+        documents: List[Dict[str, Any]],
+        rank_fields: Optional[List[str]] = None,
+        top_n: Optional[int] = None,
+        return_documents: bool = True,
+        parameters: Optional[Dict[str, Any]] = None
+    ):
+        field = (rank_fields or ["text"])[0]
+        query_vector = dense_embed(query)
+        scored = []
+        for idx, doc in enumerate(documents):
+            text = doc.get(field, "") if isinstance(doc, dict) else str(doc)
+            # Map cosine [-1, 1] into a reranker-like [0, 1] relevance score
+            scored.append((idx, (dense_score(query_vector, dense_embed(str(text))) + 1) / 2, doc))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        data = []
+        for idx, value, doc in scored[:top_n or len(scored)]:
+            item = {"index": idx, "score": value}
+            if return_documents:
+                item["document"] = doc
+            data.append(item)
+        return wrap({"model": model, "data": data, "usage": {"rerank_units": 1}})
+
+
+class FakePinecone:
+    """Pinecone client stand-in holding any number of in-memory indexes"""
+
+    def __init__(self, store: bool = True, auto_create: bool = True):
+        self.store = store
+        self.auto_create = auto_create
+        self.indexes: Dict[str, FakeIndex] = {}
+        self.inference = FakeInference()
+        self._lock = threading.Lock()
+
+    def has_index(self, name: str) -> bool:
+        return name in self.indexes
+
+    def create_index_for_model(self, name: str, embed: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        with self._lock:
+            if name not in self.indexes:
+                self.indexes[name] = FakeIndex(name, embed, store=self.store)
+        return wrap({"name": name, "embed": embed})
+
+    def describe_index(self, name: str):
+        index = self.indexes.get(name)
+        if index is None:
+            raise KeyError(f"Index not found: {name}")
+        return wrap({"name": name, "vector_type": "sparse" if index.sparse else "dense",
+                     "dimension": None if index.sparse else DENSE_DIMENSION, "embed": index.embed})
+
+    def delete_index(self, name: str):
+        with self._lock:
+            if self.indexes.pop(name, None) is None:
+                raise KeyError(f"Index not found: {name}")
+
+    def Index(self, name: str) -> FakeIndex:
+        if name not in self.indexes:
+            if not self.auto_create:
+                raise KeyError(f"Index not found: {name}")
+            # Mirror the naming convention: "*-sparse-*" indexes use the sparse model
+            model = "pinecone-sparse-english-v0" if "sparse" in name else DEFAULT_DENSE_MODEL
+            self.create_index_for_model(name, {"model": model, "field_map": {"text": "content"}})
+        return self.indexes[name]
+
+    def describe_index_stats(self, name: str) -> Dict[str, Any]:
+        stats = self.Index(name).describe_index_stats()
+        return {
+            "totalRecordCount": stats.total_vector_count,
+            "namespaces": {ns: {"recordCount": info.vector_count} for ns, info in stats.namespaces.items()},
+        }
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+DeckBot Index Generations
+Blue/green rebuilds of the dense and sparse indexes behind a local alias file
+
+- A generation is a pair of physical indexes, e.g. deckbot-dense-korean-g2 and
+  deckbot-sparse-korean-g2, registered under the logical names search uses
+- build: creates the generation's indexes (embedding models selectable) and
+  ingests every deck into them concurrently while the active generation
+  keeps serving; deckbot_vector_snapshot.py import --generation fills one
+  from exported vectors instead, without re-embedding
+- validate: reconciliation (no missing/orphan/stale records) and, given a
+  golden query file, the retrieval benchmark against the active generation
+  (recall/MRR/p95 regressions fail validation)
+- promote: atomic write of the alias file; DeckBotIndexManager re-reads it
+  at query time, so running services switch within ALIAS_RELOAD_SECONDS
+- Every write is a locked read-modify-write (flock on <alias file>.lock):
+  a long build or validate only changes its own generation entry, so a
+  promote or rollback made meanwhile is never undone
+- rollback: swap back to the previous generation (kept until dropped)
+- "base" is the original, unsuffixed deckbot-dense-korean/deckbot-sparse-korean
+
+Configuration:
+    DECKBOT_INDEX_ALIASES=output/deckbot_index_aliases.json
+
+Usage:
+    python deckbot_generations.py build <generation> <metadata_dir> [--dense-model M] [--sparse-model M]
+                                  [--concurrency 8]
+    python deckbot_generations.py validate <generation> <metadata_dir> [--golden benchmarks/golden_queries.json]
+    python deckbot_generations.py promote <generation> [--force]
+    python deckbot_generations.py rollback
+    python deckbot_generations.py list
+    python deckbot_generations.py drop <generation>
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Configuration
+DEFAULT_ALIAS_PATH = Path(__file__).resolve().parent.parent / "output" / "deckbot_index_aliases.json"
+ALIAS_ENV = "DECKBOT_INDEX_ALIASES"
+ALIAS_RELOAD_SECONDS = 1.0  # How often query-time lookups check the alias file
+BASE_GENERATION = "base"
+DEFAULT_DENSE_MODEL = "multilingual-e5-large"
+DEFAULT_SPARSE_MODEL = "pinecone-sparse-english-v0"
+BUILD_CONCURRENCY = 8  # Decks ingested at once
+ALIAS_VERSION = 1
+
+# Pinecone index names: lowercase alphanumerics and hyphens, at most 45 characters
+_GENERATION_NAME = re.compile(r"[a-z0-9][a-z0-9-]{0,19}")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class IndexAliases:
+    """Logical index name → physical index of the active (or a given) generation"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.active: Optional[str] = None
+        self.previous: Optional[str] = None
+        self.generations: Dict[str, Dict[str, Any]] = {}
+        self._signature: Optional[List[int]] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    @classmethod
+    def from_env(cls) -> "IndexAliases":
+        return cls(Path(os.environ.get(ALIAS_ENV) or DEFAULT_ALIAS_PATH))
+
+    def reload(self):
+        """Read the alias file if it changed since the last read"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self.active, self.previous, self.generations, self._signature = None, None, {}, None
+            return
+        signature = [stat.st_size, stat.st_mtime_ns]
+        if signature == self._signature:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("version") == ALIAS_VERSION:
+            self.active = saved.get("active")
+            self.previous = saved.get("previous")
+            self.generations = saved.get("generations", {})
+        self._signature = signature
+
+    def current(self) -> str:
+        """Active generation, re-checking the file at most every ALIAS_RELOAD_SECONDS"""
+        now = time.monotonic()
+        if now - self._checked >= ALIAS_RELOAD_SECONDS:
+            with self._lock:
+                if now - self._checked >= ALIAS_RELOAD_SECONDS:
+                    self.reload()
+                    self._checked = now
+        return self.active or BASE_GENERATION
+
+    def physical(self, name: str, generation: Optional[str] = None) -> str:
+        """Physical index for a logical name in a generation (default: the active one)"""
+        generation = generation or self.current()
+        if generation == BASE_GENERATION:
+            return name
+        entry = self.generations.get(generation)
+        if entry is None:
+            raise KeyError(f"Unknown index generation: {generation}")
+        return entry["indexes"][name]
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared by every process writing this alias file"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(self.path.suffix + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, change: Callable[["IndexAliases"], Any]) -> Any:
+        """
+        Re-read the file, apply change(self) and write it back, all under the file lock
+
+        Writers never save a stale in-memory copy, so concurrent builds, promotes
+        and rollbacks only ever apply their own change. Returns change's result.
+        """
+        with self._file_lock(), self._lock:
+            self._signature = None
+            self.reload()
+            result = change(self)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": ALIAS_VERSION, "active": self.active, "previous": self.previous,
+                           "generations": self.generations}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)  # Atomic: readers see the old or the new file
+            self._signature = None
+        return result
+
+    def update_generation(self, generation: str, **fields: Any) -> Dict[str, Any]:
+        """Set fields of one generation's entry (and nothing else); returns the entry"""
+        def change(aliases: "IndexAliases") -> Dict[str, Any]:
+            entry = aliases.generations.get(generation)
+            if entry is None:
+                raise KeyError(f"Unknown index generation: {generation}")
+            entry.update(fields)
+            return entry
+
+        return self.update(change)
+
+    def switch(self, generation: str):
+        """Make generation active; the one it replaces becomes the rollback target"""
+        def change(aliases: "IndexAliases"):
+            current = aliases.active or BASE_GENERATION
+            if generation != current:
+                aliases.previous, aliases.active = current, generation
+
+        self.update(change)
+
+    def rollback(self) -> str:
+        """Serve the previous generation again; returns it"""
+        def change(aliases: "IndexAliases") -> str:
+            if not aliases.previous:
+                raise ValueError("No previous generation to roll back to")
+            target = aliases.previous
+            aliases.previous, aliases.active = aliases.active or BASE_GENERATION, target
+            return target
+
+        return self.update(change)
+
+
+def generation_indexes(generation: str) -> Dict[str, str]:
+    from deckbot_unified_index import DENSE_INDEX_NAME, SPARSE_INDEX_NAME
+
+    return {name: f"{name}-{generation}" for name in (DENSE_INDEX_NAME, SPARSE_INDEX_NAME)}
+
+
+def create_generation(
+    client: Any,
+    aliases: IndexAliases,
+    generation: str,
+    dense_model: str = DEFAULT_DENSE_MODEL,
+    sparse_model: str = DEFAULT_SPARSE_MODEL
+) -> Dict[str, str]:
+    """Create the generation's (empty) indexes and register it as building"""
+    from deckbot_unified_index import DENSE_INDEX_NAME
+
+    if not _GENERATION_NAME.fullmatch(generation) or generation == BASE_GENERATION:
+        raise ValueError(f"Invalid generation name: {generation!r} (lowercase letters, digits, hyphens)")
+    aliases.reload()
+    if generation in (aliases.active, aliases.previous):
+        raise ValueError(f"Generation {generation} is serving or the rollback target; build a new one")
+
+    indexes = generation_indexes(generation)
+    for name, physical in indexes.items():
+        model = dense_model if name == DENSE_INDEX_NAME else sparse_model
+        if not client.has_index(physical):
+            client.create_index_for_model(name=physical, embed={"model": model, "field_map": {"text": "content"}})
+            print(f"✅ Created {physical} ({model})")
+
+    def register(current: IndexAliases):
+        if generation in (current.active, current.previous):
+            raise ValueError(f"Generation {generation} is serving or the rollback target; build a new one")
+        current.generations[generation] = {
+            "indexes": indexes,
+            "embed": {"dense_model": dense_model, "sparse_model": sparse_model},
+            "status": "building",
+            "created_at": _now(),
+        }
+
+    aliases.update(register)
+    return indexes
+
+
+def build_generation(
+    client: Any,
+    aliases: IndexAliases,
+    generation: str,
+    metadata_dir: Path,
+    dense_model: str = DEFAULT_DENSE_MODEL,
+    sparse_model: str = DEFAULT_SPARSE_MODEL,
+    concurrency: int = BUILD_CONCURRENCY
+) -> Dict[str, Any]:
+    """Create the generation's indexes and ingest every deck into them"""
+    from deckbot_unified_index import DeckBotIndexManager
+
+    create_generation(client, aliases, generation, dense_model, sparse_model)
+    manager = DeckBotIndexManager(client=client, generation=generation, aliases=aliases,
+                                  coalesce=False, cache_reranks=False)
+    metadata_files = sorted(Path(metadata_dir).glob("*_metadata.json"))
+    print(f"📦 Building {generation}: {len(metadata_files)} decks, {concurrency} at a time")
+
+    started = time.perf_counter()
+    failed: List[str] = []
+
+    def ingest(path: Path):
+        try:
+            manager.ingest_pdf_metadata(str(path))
+        except Exception as e:
+            print(f"   ❌ {path.name}: {e}")
+            failed.append(path.name)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="generation-build") as pool:
+        list(pool.map(ingest, metadata_files))
+
+    return aliases.update_generation(
+        generation, status="failed" if failed else "built", built_at=_now(),
+        decks=len(metadata_files) - len(failed), failed=failed,
+        build_seconds=round(time.perf_counter() - started, 1)
+    )
+
+
+def validate_generation(
+    client: Any,
+    aliases: IndexAliases,
+    generation: str,
+    metadata_dir: Path,
+    golden: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Reconcile the generation against metadata_dir and benchmark it against the active one"""
+    from deckbot_benchmark import benchmark_config, compare_to_baseline, load_golden
+    from deckbot_reconcile import plan_size, reconcile
+    from deckbot_tracing import Tracer
+    from deckbot_unified_index import DeckBotIndexManager
+
+    def manager_for(name: str) -> DeckBotIndexManager:
+        # Tracing, coalescing and caches off, as in the benchmark itself
+        return DeckBotIndexManager(client=client, generation=name, aliases=aliases, tracer=Tracer(),
+                                   coalesce=False, cache_reranks=False)
+
+    if generation not in aliases.generations:
+        raise KeyError(f"Unknown index generation: {generation}")
+    candidate = manager_for(generation)
+    plan = reconcile(client, candidate, metadata_dir, deep=True)
+    upserts, deletes = plan_size(plan)
+    validation: Dict[str, Any] = {"validated_at": _now(), "repairs_needed": upserts + deletes, "regressions": []}
+
+    if golden is not None:
+        queries = load_golden(golden)
+        config = {"backend": "generation", "fusion": "average", "top_k": 20, "rerank_top_n": 5, "rerank": True}
+        baseline = benchmark_config(manager_for(aliases.current()), queries, config)
+        report = benchmark_config(candidate, queries, config)
+        validation.update(baseline=baseline, benchmark=report)
+        validation["regressions"] = compare_to_baseline([report], {baseline["config"]: baseline})
+
+    passed = validation["repairs_needed"] == 0 and not validation["regressions"]
+    return aliases.update_generation(generation, status="validated" if passed else "failed",
+                                     validation=validation)
+
+
+def print_generations(aliases: IndexAliases):
+    active = aliases.active or BASE_GENERATION
+    print(f"🗂️  Index generations ({aliases.path})")
+    for name in [BASE_GENERATION] + sorted(aliases.generations):
+        marker = "▶" if name == active else ("↩" if name == aliases.previous else " ")
+        entry = aliases.generations.get(name, {"status": "original", "indexes": {}})
+        models = entry.get("embed", {})
+        print(f"   {marker} {name:<20} {entry['status']:<10} {entry.get('decks', ''):>5}  "
+              f"{models.get('dense_model', '')} {models.get('sparse_model', '')}".rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Blue/green DeckBot index generations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Create and fill a new generation")
+    build_parser.add_argument("generation")
+    build_parser.add_argument("metadata_dir", type=Path)
+    build_parser.add_argument("--dense-model", default=DEFAULT_DENSE_MODEL)
+    build_parser.add_argument("--sparse-model", default=DEFAULT_SPARSE_MODEL)
+    build_parser.add_argument("--concurrency", type=int, default=BUILD_CONCURRENCY)
+
+    validate_parser = subparsers.add_parser("validate", help="Reconcile and benchmark a generation")
+    validate_parser.add_argument("generation")
+    validate_parser.add_argument("metadata_dir", type=Path)
+    validate_parser.add_argument("--golden", type=Path, help="Golden queries for the benchmark comparison")
+
+    promote_parser = subparsers.add_parser("promote", help="Serve a generation")
+    promote_parser.add_argument("generation")
+    promote_parser.add_argument("--force", action="store_true", help="Promote without a passing validation")
+
+    subparsers.add_parser("rollback", help="Serve the previous generation again")
+    subparsers.add_parser("list", help="Show generations")
+
+    drop_parser = subparsers.add_parser("drop", help="Delete a generation's indexes")
+    drop_parser.add_argument("generation")
+
+    args = parser.parse_args()
+    aliases = IndexAliases.from_env()
+
+    if args.command == "list":
+        print_generations(aliases)
+        return 0
+
+    if args.command == "promote":
+        entry = aliases.generations.get(args.generation)
+        if args.generation != BASE_GENERATION and entry is None:
+            print(f"❌ Error: Unknown generation: {args.generation}")
+            return 1
+        if entry is not None and entry["status"] != "validated" and not args.force:
+            print(f"❌ Error: {args.generation} is {entry['status']}, not validated (use --force to override)")
+            return 1
+        aliases.switch(args.generation)
+        print(f"✅ Serving {args.generation} (rollback target: {aliases.previous})")
+        return 0
+
+    if args.command == "rollback":
+        try:
+            aliases.rollback()
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        print(f"↩️  Serving {aliases.active} again (rollback target: {aliases.previous})")
+        return 0
+
+    from deckbot_pinecone_client import create_pinecone_client
+
+    client = create_pinecone_client()
+
+    if args.command == "drop":
+        def unregister(current: IndexAliases) -> Dict[str, Any]:
+            if args.generation in (current.active or BASE_GENERATION, current.previous, BASE_GENERATION):
+                raise ValueError(f"{args.generation} is serving, the rollback target, or the base generation")
+            if args.generation not in current.generations:
+                raise ValueError(f"Unknown generation: {args.generation}")
+            return current.generations.pop(args.generation)
+
+        try:
+            entry = aliases.update(unregister)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        for physical in entry["indexes"].values():
+            if client.has_index(physical):
+                client.delete_index(physical)
+                print(f"🗑️  Deleted {physical}")
+        return 0
+
+    if not args.metadata_dir.is_dir():
+        print(f"❌ Error: Directory not found: {args.metadata_dir}")
+        return 1
+
+    if args.command == "build":
+        entry = build_generation(client, aliases, args.generation, args.metadata_dir,
+                                 args.dense_model, args.sparse_model, args.concurrency)
+        print(f"\n{'✅' if entry['status'] == 'built' else '❌'} {args.generation}: {entry['decks']} decks "
+              f"in {entry['build_seconds']:.1f}s ({len(entry['failed'])} failed)")
+        print(f"   Next: python deckbot_generations.py validate {args.generation} {args.metadata_dir}")
+        return 0 if entry["status"] == "built" else 1
+
+    entry = validate_generation(client, aliases, args.generation, args.metadata_dir, args.golden)
+    validation = entry["validation"]
+    print(f"\n🔎 {args.generation}: {validation['repairs_needed']} records out of sync")
+    if "benchmark" in validation:
+        for label, report in (("active", validation["baseline"]), (args.generation, validation["benchmark"])):
+            print(f"   {label:<12} recall@k {report['recall_at_k']:.3f}  MRR {report['mrr']:.3f}  "
+                  f"p95 {report['p95_ms']:.0f}ms")
+    for regression in validation["regressions"]:
+        print(f"   ⚠️  {regression}")
+    if entry["status"] == "validated":
+        print(f"✅ Validated. Next: python deckbot_generations.py promote {args.generation}")
+        return 0
+    print("❌ Validation failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
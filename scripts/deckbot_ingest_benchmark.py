@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+DeckBot Ingestion Throughput Benchmark
+Drives transform → batch → upsert over synthetic corpora into a local
+fake Pinecone sink and reports per-stage cost at several corpus sizes
+
+Stages:
+    transform    transform_metadata_to_records over every *_metadata.json
+    batch        create_batches + save_batches (batch files on disk)
+    upsert       upsert_all_batches into FakePinecone (4 targets, no delays)
+    ingest_bulk  DeckBotIndexManager.ingest_bulk into FakePinecone
+
+Per stage: wall time, CPU time, records/sec and peak Python heap
+(tracemalloc; disable with --no-memory for lower overhead).
+
+Each corpus size gets a fresh keyword index, shared by all stages and saved
+in the workdir, so synthetic keywords never reach output/.
+
+Usage:
+    python deckbot_ingest_benchmark.py [--sizes 100,1000,4000] [--workdir DIR] [--json report.json]
+"""
+
+import argparse
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from deckbot_fake_pinecone import FakePinecone
+from deckbot_synthetic_corpus import DEFAULT_VOCABULARY, generate_corpus
+
+# Configuration
+DEFAULT_SIZES = "100,1000,4000"
+
+
+@contextmanager
+def measure(stage: str, results: List[Dict[str, Any]], track_memory: bool) -> Iterator[Dict[str, Any]]:
+    """Time a stage (wall + CPU) and capture its peak heap; output is silenced"""
+    result: Dict[str, Any] = {"stage": stage, "records": 0}
+    if track_memory:
+        tracemalloc.reset_peak()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    with redirect_stdout(io.StringIO()):
+        yield result
+
+    result["wall_s"] = time.perf_counter() - wall_start
+    result["cpu_s"] = time.process_time() - cpu_start
+    result["records_per_s"] = result["records"] / result["wall_s"] if result["wall_s"] else 0.0
+    result["peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if track_memory else 0.0
+    results.append(result)
+
+
+def run_size(num_decks: int, workdir: Path, track_memory: bool, seed: int) -> Dict[str, Any]:
+    # Imported here so --help works without the Pinecone SDK installed
+    from deckbot_keywords import KeywordCanonicalizer
+    from deckbot_unified_index import DeckBotIndexManager
+    from deckbot_tracing import Tracer
+    from transform_to_pinecone_format import (
+        MAX_BATCH_SIZE, create_batches, save_batches, transform_metadata_to_records
+    )
+    from upsert_to_pinecone_sdk import upsert_all_batches
+
+    corpus_dir = workdir / f"corpus_{num_decks}"
+    output_dir = workdir / f"output_{num_decks}"
+    if not corpus_dir.exists():
+        print(f"   🧪 Generating {num_decks} synthetic decks...")
+        generate_corpus(corpus_dir, num_decks, seed, DEFAULT_VOCABULARY)
+    metadata_files = sorted(corpus_dir.glob("*_metadata.json"))
+
+    results: List[Dict[str, Any]] = []
+    transformed = []
+    keyword_index = KeywordCanonicalizer(workdir / f"keyword_index_{num_decks}.json")
+
+    with measure("transform", results, track_memory) as stage:
+        for path in metadata_files:
+            records, doc_info = transform_metadata_to_records(str(path), keyword_index=keyword_index)
+            transformed.append((records, doc_info))
+            stage["records"] += len(records)
+
+    batch_dirs = []
+    with measure("batch", results, track_memory) as stage:
+        for records, doc_info in transformed:
+            batches = create_batches(records, batch_size=MAX_BATCH_SIZE)
+            save_batches(batches, doc_info["pdf_id"], output_dir)
+            batch_dirs.append((output_dir / "pinecone_batches" / doc_info["pdf_id"], doc_info["pdf_id"]))
+            stage["records"] += len(records)
+    del transformed
+
+    sink = FakePinecone(store=False)
+    with measure("upsert", results, track_memory) as stage:
+        for batch_dir, pdf_id in batch_dirs:
+            upsert_all_batches(batch_dir, pdf_id, pc=sink, batch_delay=0, target_delay=0)
+        stage["records"] = sum(
+            index.describe_index_stats().total_vector_count for index in sink.indexes.values()
+        )
+
+    bulk_sink = FakePinecone(store=False)
+    manager = DeckBotIndexManager(client=bulk_sink, tracer=Tracer(), keyword_index=keyword_index)
+    with measure("ingest_bulk", results, track_memory) as stage:
+        manager.ingest_bulk(str(corpus_dir))
+        stage["records"] = sum(
+            index.describe_index_stats().total_vector_count for index in bulk_sink.indexes.values()
+        )
+
+    keyword_index.save_if_changed()
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return {"decks": num_decks, "stages": results}
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n📦 Corpus: {report['decks']} decks")
+    print(f"   {'Stage':<12} {'Records':>10} {'Wall s':>9} {'CPU s':>9} {'Records/s':>11} {'Peak MB':>9}")
+    print("   " + "-" * 64)
+    for stage in report["stages"]:
+        print(f"   {stage['stage']:<12} {stage['records']:>10} {stage['wall_s']:>9.2f} "
+              f"{stage['cpu_s']:>9.2f} {stage['records_per_s']:>11.0f} {stage['peak_mb']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeckBot ingestion throughput benchmark")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma list of corpus sizes (decks)")
+    parser.add_argument("--workdir", type=Path, help="Keep generated corpora here for reuse")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak tracking")
+    parser.add_argument("--json", type=Path, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="deckbot_ingest_bench_"))
+    track_memory = not args.no_memory
+    if track_memory:
+        tracemalloc.start()
+
+    print(f"\n🏁 Ingestion benchmark: sizes={sizes} workdir={workdir}")
+    reports = []
+    for num_decks in sizes:
+        report = run_size(num_decks, workdir, track_memory, args.seed)
+        print_report(report)
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Report saved: {args.json}")
+
+    if args.workdir is None:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
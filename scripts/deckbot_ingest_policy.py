@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+DeckBot Ingestion Policy
+Decides which slides are embedded and stored, by layout type and content length
+
+- Exclude (or include-only) slides by layout: rules match slide_layout_type
+  and slide_layout, case-insensitive substring ("TBWA Intro" is excluded by
+  default, as datastructure.txt requires)
+- Drop slides whose text is too short, measured over slide_content and
+  slide_summary together (what gets embedded), so a title slide with a few
+  characters of OCR text but a real summary is kept
+- Per-layout kept/dropped counts for reporting
+
+Applied by transform_to_pinecone_format.py, DeckBotIndexManager.ingest_pdf_metadata
+and validate_transformation.py, so every path embeds the same slides.
+
+Configuration (JSON file via DECKBOT_INGEST_POLICY=<path>):
+    {"exclude_layouts": ["TBWA Intro", "Thank You"], "include_layouts": [], "min_content_chars": 10}
+
+Usage:
+    python deckbot_ingest_policy.py <metadata_dir> [policy.json]
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+# Configuration
+DEFAULT_EXCLUDE_LAYOUTS = ("TBWA Intro",)
+DEFAULT_MIN_CONTENT_CHARS = 10
+POLICY_ENV = "DECKBOT_INGEST_POLICY"
+LAYOUT_LABEL_CHARS = 30  # Free-text layout descriptions are truncated for counts
+
+KEPT = "kept"
+EXCLUDED_LAYOUT = "excluded_layout"
+NOT_INCLUDED = "not_included"
+TOO_SHORT = "too_short"
+
+
+class IngestionPolicy:
+    """Layout and length rules for which slides to ingest, with per-layout counts"""
+
+    def __init__(
+        self,
+        exclude_layouts: Iterable[str] = DEFAULT_EXCLUDE_LAYOUTS,
+        include_layouts: Iterable[str] = (),
+        min_content_chars: int = DEFAULT_MIN_CONTENT_CHARS
+    ):
+        self.exclude_layouts = [rule.casefold() for rule in exclude_layouts]
+        self.include_layouts = [rule.casefold() for rule in include_layouts]
+        self.min_content_chars = min_content_chars
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_file(cls, path: Path) -> "IngestionPolicy":
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(
+            exclude_layouts=config.get("exclude_layouts", DEFAULT_EXCLUDE_LAYOUTS),
+            include_layouts=config.get("include_layouts", ()),
+            min_content_chars=config.get("min_content_chars", DEFAULT_MIN_CONTENT_CHARS),
+        )
+
+    @classmethod
+    def from_env(cls) -> "IngestionPolicy":
+        """Policy file named by DECKBOT_INGEST_POLICY, else the defaults"""
+        path = os.environ.get(POLICY_ENV)
+        return cls.from_file(Path(path)) if path else cls()
+
+    @staticmethod
+    def layout_label(slide: Dict[str, Any]) -> str:
+        layout = slide.get("slide_layout_type") or slide.get("slide_layout") or "(none)"
+        label = layout.split(",")[0].strip()
+        return label[:LAYOUT_LABEL_CHARS]
+
+    def _matches(self, slide: Dict[str, Any], rules: List[str]) -> bool:
+        layout = f"{slide.get('slide_layout_type', '')} {slide.get('slide_layout', '')}".casefold()
+        return any(rule in layout for rule in rules)
+
+    def check(self, slide: Dict[str, Any]) -> str:
+        """KEPT, or the reason the slide is dropped"""
+        if self.exclude_layouts and self._matches(slide, self.exclude_layouts):
+            return EXCLUDED_LAYOUT
+        if self.include_layouts and not self._matches(slide, self.include_layouts):
+            return NOT_INCLUDED
+        length = sum(len((slide.get(field) or "").strip()) for field in ("slide_content", "slide_summary"))
+        if length < self.min_content_chars:
+            return TOO_SHORT
+        return KEPT
+
+    def filter_slides(self, slides: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Slides to ingest; every decision is tallied under the slide's layout"""
+        kept = []
+        for slide in slides:
+            outcome = self.check(slide)
+            layout_counts = self.counts.setdefault(self.layout_label(slide), {})
+            layout_counts[outcome] = layout_counts.get(outcome, 0) + 1
+            if outcome == KEPT:
+                kept.append(slide)
+        return kept
+
+    def totals(self) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for layout_counts in self.counts.values():
+            for outcome, count in layout_counts.items():
+                totals[outcome] = totals.get(outcome, 0) + count
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "exclude_layouts": self.exclude_layouts,
+            "include_layouts": self.include_layouts,
+            "min_content_chars": self.min_content_chars,
+            "totals": self.totals(),
+            "per_layout": self.counts,
+        }
+
+    def print_summary(self, top: int = 15):
+        totals = self.totals()
+        dropped = sum(count for outcome, count in totals.items() if outcome != KEPT)
+        print(f"\n🧾 Ingestion policy: kept {totals.get(KEPT, 0)} slides, dropped {dropped}")
+        for outcome in (EXCLUDED_LAYOUT, NOT_INCLUDED, TOO_SHORT):
+            if totals.get(outcome):
+                print(f"   - {outcome}: {totals[outcome]}")
+
+        rows = sorted(self.counts.items(), key=lambda item: -sum(item[1].values()))
+        print(f"   {'Layout':<32} {'Kept':>6} {'Dropped':>8}")
+        for layout, layout_counts in rows[:top]:
+            kept = layout_counts.get(KEPT, 0)
+            print(f"   {layout:<32} {kept:>6} {sum(layout_counts.values()) - kept:>8}")
+        if len(rows) > top:
+            print(f"   ... and {len(rows) - top} more layouts")
+
+
+def main():
+    """Dry run: what would the policy drop across a metadata directory?"""
+    if len(sys.argv) < 2:
+        print("""
+DeckBot Ingestion Policy
+
+Usage:
+  python deckbot_ingest_policy.py <metadata_dir> [policy.json]
+
+Defaults: exclude layouts matching 'TBWA Intro', min content 10 chars.
+Set DECKBOT_INGEST_POLICY=<policy.json> to apply a policy to every ingest path.
+        """)
+        return 1
+
+    metadata_dir = Path(sys.argv[1])
+    if not metadata_dir.is_dir():
+        print(f"❌ Error: Directory not found: {metadata_dir}")
+        return 1
+
+    policy = IngestionPolicy.from_file(Path(sys.argv[2])) if len(sys.argv) > 2 else IngestionPolicy.from_env()
+    files = sorted(metadata_dir.glob("*_metadata.json"))
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            policy.filter_slides(json.load(f).get("slide_data", []))
+
+    print(f"🔍 Checked {len(files)} decks in {metadata_dir}")
+    policy.print_summary()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
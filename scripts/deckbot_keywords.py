@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+DeckBot Keyword Canonicalization
+Clusters keyword variants ("1020 타겟", "1020 타겟 분석", "1020 타겟 비중") under
+one canonical keyword with a stable integer ID
+
+- Normalized form: NFKC, casefold, punctuation/brackets → space, whitespace
+  collapsed; the match key also drops spaces ("1020타겟")
+- Variants join the most frequent (then shortest) canonical whose character
+  bigram Dice similarity is >= threshold and whose digits are the same
+- Lookup table (match key → ID) persisted as JSON; IDs are never reused or
+  renumbered, so records ingested earlier keep resolving
+- New canonical IDs are a hash of the canonical match key (not a counter), so
+  processes growing the index concurrently (watch, ingest, generations build,
+  migration) never give one ID to two different keywords
+- save() is a locked read-modify-write (flock on <index>.lock): the file is
+  re-read and merged before writing, so no process drops another's keywords;
+  readers pick up newer saves within KEYWORD_RELOAD_SECONDS
+- Records carry keywords and keyword_ids as list metadata (IDs are decimal
+  strings: Pinecone list metadata must be strings); keyword_filter() matches
+  canonical IDs, with_keyword_filter() exact keywords
+
+Usage:
+    python deckbot_keywords.py build <metadata_dir | deckbot-metadata.json> [--threshold 0.8]
+    python deckbot_keywords.py lookup <keyword> [keyword ...]
+    python deckbot_keywords.py stats [top_n]
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Configuration
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent.parent / "output" / "deckbot_keyword_index.json"
+INDEX_ENV = "DECKBOT_KEYWORD_INDEX"
+DEFAULT_THRESHOLD = 0.8
+INDEX_VERSION = 2  # 1: canonical keywords as a list indexed by ID
+KEYWORD_RELOAD_SECONDS = 5.0  # How often readers check the file for other processes' saves
+ID_BYTES = 6  # Hashed IDs stay below 2**53, exact in JSON and float-parsing clients
+KEPT_SYMBOLS = set("+%&/.")  # Meaningful in keywords like "+α 전략", "1/N 이벤트"
+LEGACY_SEPARATOR = ", "  # Keywords used to be stored as one joined string
+
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Display-stable normal form: NFKC, casefold, punctuation to spaces"""
+    text = unicodedata.normalize("NFKC", keyword).casefold()
+    text = "".join(
+        " " if unicodedata.category(ch)[0] in "PS" and ch not in KEPT_SYMBOLS else ch
+        for ch in text
+    )
+    return " ".join(text.split())
+
+
+def match_key(keyword: str) -> str:
+    """Lookup key: normalized form without spaces ("1020 타겟" == "1020타겟")"""
+    return normalize_keyword(keyword).replace(" ", "")
+
+
+def keyword_list(value: Any) -> List[str]:
+    """Keywords as a list of unique non-empty strings (accepts the legacy joined string)"""
+    if value is None:
+        return []
+    items = value.split(LEGACY_SEPARATOR) if isinstance(value, str) else value
+    keywords: List[str] = []
+    for item in items:
+        keyword = str(item).strip()
+        if keyword and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+
+def with_keyword_filter(filters: Optional[Dict[str, Any]], keywords: Any) -> Optional[Dict[str, Any]]:
+    """Add "keywords $in [...]" to a metadata filter (records tagged with any of them)"""
+    keywords = keyword_list(keywords)
+    if not keywords:
+        return filters
+    clause = {"keywords": {"$in": keywords}}
+    return {"$and": [filters, clause]} if filters else clause
+
+
+def _bigrams(key: str) -> Set[str]:
+    return {key[i:i + 2] for i in range(len(key) - 1)} or {key}
+
+
+def _stable_id(key: str) -> int:
+    """Canonical ID derived from the match key: the same in every process"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=ID_BYTES).digest(), "big")
+
+
+def _read_index(path: Path) -> Tuple[Dict[int, str], Dict[str, int], Optional[float]]:
+    """(ID → canonical keyword, match key → ID, threshold) from a saved index"""
+    with open(path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    if saved.get("version") == 1:
+        canonical = dict(enumerate(saved["canonical"]))
+    elif saved.get("version") == INDEX_VERSION:
+        canonical = {int(canonical_id): keyword for canonical_id, keyword in saved["canonical"].items()}
+    else:
+        return {}, {}, saved.get("threshold")
+    return canonical, saved["aliases"], saved.get("threshold")
+
+
+class KeywordCanonicalizer:
+    """Keyword → canonical ID lookup table, grown online as new keywords appear"""
+
+    def __init__(self, path: Optional[Path] = None, threshold: float = DEFAULT_THRESHOLD):
+        self.path = Path(path) if path else None
+        self.threshold = threshold
+        self.canonical: Dict[int, str] = {}  # ID → canonical keyword
+        self.aliases: Dict[str, int] = {}    # match key → ID
+        self.changed = False
+        self._grams: Dict[int, Set[str]] = {}  # ID → bigrams of the canonical match key
+        self._digits: Dict[int, List[str]] = {}
+        self._rank: Dict[int, int] = {}      # ID → registration order (ties go to the oldest)
+        self._postings: Dict[str, List[int]] = {}  # bigram → canonical IDs
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None  # (mtime_ns, size) last merged
+        self._checked_at = 0.0
+
+    @classmethod
+    def load(cls, path: Path) -> "KeywordCanonicalizer":
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        canonicalizer = cls(path)
+        canonicalizer.threshold = canonicalizer._merge_file(path) or DEFAULT_THRESHOLD
+        canonicalizer._checked_at = time.monotonic()
+        return canonicalizer
+
+    @classmethod
+    def from_env(cls) -> "KeywordCanonicalizer":
+        """Index named by DECKBOT_KEYWORD_INDEX, else output/deckbot_keyword_index.json"""
+        return cls.load(Path(os.environ.get(INDEX_ENV) or DEFAULT_INDEX_PATH))
+
+    def _add_canonical(self, keyword: str, canonical_id: Optional[int] = None) -> int:
+        key = match_key(keyword)
+        if canonical_id is None:
+            canonical_id = _stable_id(key)
+            while canonical_id in self.canonical and match_key(self.canonical[canonical_id]) != key:
+                canonical_id += 1  # Hash collision
+        if canonical_id in self.canonical:
+            return canonical_id
+        grams = _bigrams(key)
+        self.canonical[canonical_id] = keyword
+        self._grams[canonical_id] = grams
+        self._digits[canonical_id] = _DIGITS.findall(key)
+        self._rank[canonical_id] = len(self._rank)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(canonical_id)
+        return canonical_id
+
+    @staticmethod
+    def _signature_of(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _merge_file(self, path: Path) -> Optional[float]:
+        """Fold a saved index into this one (the file wins for aliases both define)"""
+        signature = self._signature_of(path)
+        if signature is None:
+            return None
+        canonical, aliases, threshold = _read_index(path)
+        for canonical_id, keyword in canonical.items():
+            self._add_canonical(keyword, canonical_id)
+        for key, canonical_id in aliases.items():
+            if self.aliases.get(key) != canonical_id:
+                self.aliases[key] = canonical_id
+        self._signature = signature
+        return threshold
+
+    def refresh(self, force: bool = False) -> bool:
+        """Merge keywords other processes saved since the last check; True if any"""
+        if self.path is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._checked_at < KEYWORD_RELOAD_SECONDS:
+            return False
+        self._checked_at = now
+        signature = self._signature_of(self.path)
+        if signature is None or signature == self._signature:
+            return False
+        with self._lock:
+            self._merge_file(self.path)
+        return True
+
+    def _nearest(self, key: str) -> Tuple[Optional[int], float]:
+        """Most similar canonical by bigram Dice (ties → the oldest canonical)"""
+        grams = _bigrams(key)
+        digits = _DIGITS.findall(key)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        best_id, best_score = None, 0.0
+        for canonical_id, overlap in shared.items():
+            score = 2 * overlap / (len(grams) + len(self._grams[canonical_id]))
+            if score < self.threshold or self._digits[canonical_id] != digits:
+                continue
+            if score > best_score or (score == best_score and self._rank[canonical_id] < self._rank[best_id]):
+                best_id, best_score = canonical_id, score
+        return best_id, best_score
+
+    def lookup(self, keyword: str) -> Optional[int]:
+        """ID for a keyword without adding anything (exact alias, else nearest canonical)"""
+        key = match_key(keyword)
+        if not key:
+            return None
+        if key not in self.aliases:
+            self.refresh()
+        if key in self.aliases:
+            return self.aliases[key]
+        return self._nearest(key)[0]
+
+    def resolve(self, keyword: str) -> Optional[int]:
+        """ID for a keyword, registering it as an alias or a new canonical if unseen"""
+        key = match_key(keyword)
+        if not key:
+            return None
+        canonical_id = self.aliases.get(key)
+        if canonical_id is not None:
+            return canonical_id
+        self.refresh()  # Another process may have registered it already
+        with self._lock:
+            canonical_id = self.aliases.get(key)
+            if canonical_id is None:
+                canonical_id = self._nearest(key)[0]
+                if canonical_id is None:
+                    canonical_id = self._add_canonical(normalize_keyword(keyword))
+                self.aliases[key] = canonical_id
+                self.changed = True
+        return canonical_id
+
+    def keyword_ids(self, keywords: Iterable[str], register: bool = True) -> List[str]:
+        """
+        Unique canonical IDs for a slide's keywords, as strings for Pinecone metadata;
+        register=False only looks them up (read-only checks must not grow the index)
+        """
+        ids: List[str] = []
+        for keyword in keywords:
+            canonical_id = self.resolve(keyword) if register else self.lookup(keyword)
+            if canonical_id is not None and str(canonical_id) not in ids:
+                ids.append(str(canonical_id))
+        return ids
+
+    def keyword_filter(self, keywords: Iterable[str]) -> Dict[str, Any]:
+        """Metadata filter matching records tagged with any of the keywords' canonicals"""
+        ids = sorted({canonical_id for canonical_id in map(self.lookup, keywords) if canonical_id is not None})
+        if not ids:
+            raise ValueError(f"No known keywords in {list(keywords)}")
+        return {"keyword_ids": {"$in": [str(canonical_id) for canonical_id in ids]}}
+
+    def build(self, keyword_counts: Dict[str, int]):
+        """Register a vocabulary; frequent, then short, keywords become canonicals first"""
+        for keyword in sorted(keyword_counts, key=lambda k: (-keyword_counts[k], len(match_key(k)), k)):
+            self.resolve(keyword)
+
+    def clusters(self) -> Dict[int, List[str]]:
+        members: Dict[int, List[str]] = {}
+        for key, canonical_id in self.aliases.items():
+            members.setdefault(canonical_id, []).append(key)
+        return members
+
+    @contextmanager
+    def _file_lock(self, path: Path) -> Iterator[None]:
+        """Exclusive across processes (flock on a sidecar file; the index itself is replaced)"""
+        with open(path.with_suffix(path.suffix + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self, path: Optional[Path] = None):
+        """Merge the file's current contents (other processes' keywords), then write"""
+        path = Path(path or self.path or DEFAULT_INDEX_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        # Thread lock too: concurrent ingests resolve keywords and save the same file
+        with self._file_lock(path), self._lock:
+            self._merge_file(path)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "threshold": self.threshold,
+                    "canonical": {str(canonical_id): keyword for canonical_id, keyword in self.canonical.items()},
+                    "aliases": self.aliases,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._signature = self._signature_of(path)
+            self.changed = False
+
+    def save_if_changed(self):
+        if self.changed:
+            self.save()
+
+
+def _vocabulary_counts(source: Path) -> Dict[str, int]:
+    """Keyword frequencies from a metadata directory, or a deckbot-metadata.json export"""
+    if source.is_dir():
+        from deckbot_vocabulary import VocabularyIndex
+
+        vocabulary = VocabularyIndex.for_directory(source)
+        if any(vocabulary.sync(source).values()):
+            vocabulary.save()
+        return dict(vocabulary.keyword_counts)
+    with open(source, "r", encoding="utf-8") as f:
+        return {keyword: 1 for keyword in json.load(f)["keywords"]}
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("""
+DeckBot Keyword Canonicalization
+
+Usage:
+  python deckbot_keywords.py build <metadata_dir | deckbot-metadata.json> [--threshold 0.8]
+  python deckbot_keywords.py lookup <keyword> [keyword ...]
+  python deckbot_keywords.py stats [top_n]
+
+Index: $DECKBOT_KEYWORD_INDEX or output/deckbot_keyword_index.json
+        """)
+        return 1
+
+    command = sys.argv[1]
+    canonicalizer = KeywordCanonicalizer.from_env()
+
+    if command == "build" and len(sys.argv) > 2:
+        source = Path(sys.argv[2])
+        if not source.exists():
+            print(f"❌ Error: Not found: {source}")
+            return 1
+        if "--threshold" in sys.argv:
+            canonicalizer.threshold = float(sys.argv[sys.argv.index("--threshold") + 1])
+
+        start = time.perf_counter()
+        counts = _vocabulary_counts(source)
+        before = len(canonicalizer.canonical)
+        canonicalizer.build(counts)
+        canonicalizer.save()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"✅ Canonicalized {len(counts)} keywords in {elapsed:.0f}ms")
+        print(f"   Canonical keywords: {len(canonicalizer.canonical)} (+{len(canonicalizer.canonical) - before})")
+        print(f"   Aliases: {len(canonicalizer.aliases)}")
+        print(f"   Index: {canonicalizer.path}")
+
+    elif command == "lookup" and len(sys.argv) > 2:
+        for keyword in sys.argv[2:]:
+            canonical_id = canonicalizer.lookup(keyword)
+            if canonical_id is None:
+                print(f"   {keyword} → (unknown)")
+            else:
+                print(f"   {keyword} → #{canonical_id} {canonicalizer.canonical[canonical_id]}")
+
+    elif command == "stats":
+        top_n = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+        clusters = canonicalizer.clusters()
+        merged = {cid: keys for cid, keys in clusters.items() if len(keys) > 1}
+        print(f"📊 {len(canonicalizer.aliases)} keyword forms → {len(canonicalizer.canonical)} canonical keywords")
+        print(f"   Clusters with variants: {len(merged)}")
+        for canonical_id, keys in sorted(merged.items(), key=lambda item: -len(item[1]))[:top_n]:
+            print(f"   #{canonical_id} {canonicalizer.canonical[canonical_id]} ({len(keys)}): {', '.join(keys[:6])}")
+
+    else:
+        print(f"❌ Unknown command: {command}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Local Pinecone Stand-In Server for DeckBot
+HTTP server + client implementing the Pinecone subset our scripts use,
+for offline development and load tests without production quotas
+
+Supported calls (served by the in-memory FakePinecone engine):
+    has_index, create_index_for_model, describe_index, delete_index,
+    Index(name).upsert_records / upsert, Index(name).search (with filters),
+    Index(name).describe_index_stats, Index(name).list / list_paginated / fetch / update / delete,
+    inference.rerank
+
+- Deterministic fake embeddings (same text → same vector, every run)
+- Configurable latency (+ jitter) and error injection (HTTP 429/503)
+- Clients switch over with DECKBOT_PINECONE_URL=http://127.0.0.1:5081
+  (see deckbot_pinecone_client.create_pinecone_client)
+
+Usage:
+    python deckbot_local_pinecone.py [--port 5081] [--latency-ms 20] [--jitter-ms 5] [--error-rate 0.01]
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from deckbot_fake_pinecone import FakePinecone, wrap
+
+# Configuration
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5081
+REQUEST_TIMEOUT = 30  # Seconds
+API_PREFIX = "/v1/"
+
+
+class LocalPineconeError(Exception):
+    """Error response from the local stand-in (status mirrors Pinecone's)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+# ============================================================================
+# Server
+# ============================================================================
+
+class FaultInjector:
+    """Per-request latency and random failures, seeded for reproducible load tests"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self) -> Optional[int]:
+        """Sleep for the configured latency; return an HTTP status to fail with, if any"""
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+            status = self._rng.choice((429, 503))
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        return status if fail else None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """RPC-style JSON endpoints: POST /v1/<method>"""
+
+    engine: FakePinecone = None
+    faults: FaultInjector = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any):
+        pass  # Keep load tests quiet; errors are returned to the client
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        method = self.path[len(API_PREFIX):] if self.path.startswith(API_PREFIX) else ""
+
+        status = self.faults.apply()
+        if status:
+            return self._reply(status, {"error": "injected failure"})
+
+        handler = getattr(self, f"_rpc_{method}", None)
+        if handler is None:
+            return self._reply(404, {"error": f"Unknown method: {method}"})
+        try:
+            return self._reply(200, handler(body))
+        except KeyError as e:
+            return self._reply(404, {"error": str(e)})
+        except ValueError as e:
+            return self._reply(400, {"error": str(e)})
+
+    def _reply(self, status: int, payload: Any):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _index(self, body: Dict[str, Any]):
+        return self.engine.Index(body["index"])  # KeyError → 404 unless auto-create is on
+
+    def _rpc_has_index(self, body):
+        return {"exists": self.engine.has_index(body["name"])}
+
+    def _rpc_create_index_for_model(self, body):
+        return self.engine.create_index_for_model(body["name"], body.get("embed"))
+
+    def _rpc_describe_index(self, body):
+        return self.engine.describe_index(body["name"])
+
+    def _rpc_delete_index(self, body):
+        self.engine.delete_index(body["name"])
+        return {}
+
+    def _rpc_upsert_records(self, body):
+        self._index(body).upsert_records(body["namespace"], body["records"])
+        return {"upserted_count": len(body["records"])}
+
+    def _rpc_upsert(self, body):
+        return self._index(body).upsert(body["vectors"], namespace=body["namespace"])
+
+    def _rpc_search(self, body):
+        return self._index(body).search(body["namespace"], body["query"], body.get("fields"))
+
+    def _rpc_describe_index_stats(self, body):
+        return self._index(body).describe_index_stats()
+
+    def _rpc_list_paginated(self, body):
+        return self._index(body).list_paginated(
+            prefix=body.get("prefix"), limit=body.get("limit"),
+            pagination_token=body.get("pagination_token"), namespace=body["namespace"]
+        )
+
+    def _rpc_fetch(self, body):
+        return self._index(body).fetch(body["ids"], namespace=body["namespace"])
+
+    def _rpc_update(self, body):
+        return self._index(body).update(body["id"], set_metadata=body.get("set_metadata"),
+                                        namespace=body["namespace"])
+
+    def _rpc_delete(self, body):
+        return self._index(body).delete(ids=body.get("ids"), delete_all=body.get("delete_all", False),
+                                        namespace=body["namespace"], filter=body.get("filter"))
+
+    def _rpc_rerank(self, body):
+        return self.engine.inference.rerank(
+            model=body["model"], query=body["query"], documents=body["documents"],
+            rank_fields=body.get("rank_fields"), top_n=body.get("top_n"),
+            return_documents=body.get("return_documents", True), parameters=body.get("parameters")
+        )
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          faults: Optional[FaultInjector] = None, engine: Optional[FakePinecone] = None) -> ThreadingHTTPServer:
+    """Create (but do not start) a stand-in server; call serve_forever() to run it"""
+    handler = type("BoundStandInHandler", (StandInHandler,), {
+        "engine": engine or FakePinecone(auto_create=False),
+        "faults": faults or FaultInjector(),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# ============================================================================
+# Client
+# ============================================================================
+
+class LocalPinecone:
+    """Pinecone SDK look-alike that talks to the stand-in server over HTTP"""
+
+    def __init__(self, base_url: str, timeout: float = REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.inference = _LocalInference(self)
+
+    def _call(self, method: str, payload: Dict[str, Any]) -> Any:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.base_url}{API_PREFIX}{method}", data=data,
+            headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return wrap(json.loads(response.read()))
+        except urllib.error.HTTPError as e:
+            detail = json.loads(e.read() or b"{}").get("error", e.reason)
+            raise LocalPineconeError(e.code, detail) from None
+
+    def has_index(self, name: str) -> bool:
+        return self._call("has_index", {"name": name})["exists"]
+
+    def create_index_for_model(self, name: str, embed: Dict[str, Any], **kwargs: Any):
+        return self._call("create_index_for_model", {"name": name, "embed": embed})
+
+    def describe_index(self, name: str):
+        return self._call("describe_index", {"name": name})
+
+    def delete_index(self, name: str):
+        return self._call("delete_index", {"name": name})
+
+    def Index(self, name: str) -> "_LocalIndex":
+        return _LocalIndex(self, name)
+
+    def describe_index_stats(self, name: str) -> Dict[str, Any]:
+        stats = self.Index(name).describe_index_stats()
+        return {
+            "totalRecordCount": stats.total_vector_count,
+            "namespaces": {ns: {"recordCount": info.vector_count} for ns, info in stats.namespaces.items()},
+        }
+
+
+class _LocalIndex:
+    def __init__(self, client: LocalPinecone, name: str):
+        self._client = client
+        self.name = name
+
+    def upsert_records(self, namespace: str, records: List[Dict[str, Any]]):
+        return self._client._call("upsert_records", {"index": self.name, "namespace": namespace, "records": records})
+
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: str = ""):
+        return self._client._call("upsert", {"index": self.name, "namespace": namespace, "vectors": vectors})
+
+    def search(self, namespace: str, query: Dict[str, Any], fields: Optional[List[str]] = None):
+        return self._client._call("search", {"index": self.name, "namespace": namespace,
+                                             "query": query, "fields": fields})
+
+    def describe_index_stats(self):
+        return self._client._call("describe_index_stats", {"index": self.name})
+
+    def list_paginated(self, prefix: Optional[str] = None, limit: Optional[int] = None,
+                       pagination_token: Optional[str] = None, namespace: str = ""):
+        return self._client._call("list_paginated", {
+            "index": self.name, "namespace": namespace, "prefix": prefix,
+            "limit": limit, "pagination_token": pagination_token,
+        })
+
+    def list(self, prefix: Optional[str] = None, limit: Optional[int] = None, namespace: str = ""):
+        token = None
+        while True:
+            response = self.list_paginated(prefix=prefix, limit=limit, pagination_token=token, namespace=namespace)
+            if response.vectors:
+                yield [vector.id for vector in response.vectors]
+            if not response.pagination:
+                return
+            token = response.pagination.next
+
+    def fetch(self, ids: List[str], namespace: str = ""):
+        return self._client._call("fetch", {"index": self.name, "namespace": namespace, "ids": ids})
+
+    def update(self, id: str, set_metadata: Optional[Dict[str, Any]] = None, namespace: str = "", **kwargs: Any):
+        return self._client._call("update", {"index": self.name, "namespace": namespace,
+                                             "id": id, "set_metadata": set_metadata})
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False,
+               namespace: str = "", filter: Optional[Dict[str, Any]] = None):
+        return self._client._call("delete", {"index": self.name, "namespace": namespace, "ids": ids,
+                                             "delete_all": delete_all, "filter": filter})
+
+
+class _LocalInference:
+    def __init__(self, client: LocalPinecone):
+        self._client = client
+
+    def rerank(self, model: str, query: str, documents: List[Dict[str, Any]],
+               rank_fields: Optional[List[str]] = None, top_n: Optional[int] = None,
+               return_documents: bool = True, parameters: Optional[Dict[str, Any]] = None):
+        return self._client._call("rerank", {
+            "model": model, "query": query, "documents": documents, "rank_fields": rank_fields,
+            "top_n": top_n, "return_documents": return_documents, "parameters": parameters,
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Pinecone stand-in server for DeckBot")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="± random latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 429/503")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible jitter/errors")
+    parser.add_argument("--auto-create", action="store_true",
+                        help="Create indexes on first use instead of requiring 'setup'")
+    args = parser.parse_args()
+
+    faults = FaultInjector(args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    server = serve(args.host, args.port, faults, FakePinecone(auto_create=args.auto_create))
+
+    print(f"🧪 Local Pinecone stand-in listening on http://{args.host}:{args.port}")
+    print(f"   Latency: {args.latency_ms}ms ± {args.jitter_ms}ms, error rate: {args.error_rate:.1%}")
+    print(f"   Point clients at it: export DECKBOT_PINECONE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
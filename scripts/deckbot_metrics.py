@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+DeckBot Instrumentation
+Buffered structured logging and lightweight metrics shared by all scripts
+
+- Structured JSON Lines logs, buffered in memory and flushed in batches
+  (one file open per flush instead of one per message)
+- Counters, gauges and histograms for records/sec, batch latency,
+  retries and bytes sent
+- Quiet mode suppresses console output (DECKBOT_QUIET=1 or quiet=True)
+- Prometheus text / OpenMetrics export that check-progress.sh can read
+
+Environment:
+    DECKBOT_QUIET            - "1" to silence console output
+    DECKBOT_LOG_FILE         - default JSON Lines log file for all loggers
+    DECKBOT_METRICS_FILE     - write metrics here at exit (e.g. logs/metrics.prom)
+    DECKBOT_METRICS_FORMAT   - "prometheus" (default) or "openmetrics"
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Configuration
+LOG_BUFFER_SIZE = 256  # Buffered log lines before a flush
+HISTOGRAM_RESERVOIR = 10000  # Raw samples kept per histogram for percentiles
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+
+def is_quiet() -> bool:
+    """Whether console output is globally silenced"""
+    return os.environ.get("DECKBOT_QUIET", "").lower() in ("1", "true", "yes")
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """
+    Linear-interpolated percentile (q in 0-100) of a sequence of numbers
+    Returns 0.0 for an empty sequence
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    if len(ordered) == 1:
+        return float(ordered[0])
+
+    rank = (len(ordered) - 1) * (q / 100.0)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = rank - lower
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * fraction)
+
+
+# ============================================================================
+# Structured logging
+# ============================================================================
+
+class StructuredLogger:
+    """
+    Console + JSON Lines logger with buffered file writes
+
+    Console lines keep the familiar emoji messages; the file receives one
+    JSON object per event with any keyword fields attached.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        log_file: Optional[Path] = None,
+        quiet: Optional[bool] = None,
+        timestamped: bool = False,
+        buffer_size: int = LOG_BUFFER_SIZE
+    ):
+        self.name = name
+        env_file = os.environ.get("DECKBOT_LOG_FILE")
+        self.log_file = Path(log_file) if log_file else (Path(env_file) if env_file else None)
+        self._quiet = quiet
+        self.timestamped = timestamped
+        self.buffer_size = buffer_size
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def quiet(self) -> bool:
+        return self._quiet if self._quiet is not None else is_quiet()
+
+    def log(self, level: str, message: str, **fields: Any):
+        """Record an event; console output is skipped in quiet mode"""
+        level = level.upper()
+        if not self.quiet:
+            if self.timestamped:
+                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                print(f"[{timestamp}] [{level}] {message}")
+            else:
+                print(message)
+
+        if self.log_file is None:
+            return
+
+        entry = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "level": level,
+            "logger": self.name,
+            "msg": message.strip(),
+        }
+        entry.update(fields)
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+
+        with self._lock:
+            self._buffer.append(line)
+            should_flush = (
+                len(self._buffer) >= self.buffer_size
+                or LEVELS.get(level, 20) >= LEVELS["ERROR"]
+            )
+        if should_flush:
+            self.flush()
+
+    def debug(self, message: str, **fields: Any):
+        self.log("DEBUG", message, **fields)
+
+    def info(self, message: str, **fields: Any):
+        self.log("INFO", message, **fields)
+
+    def warning(self, message: str, **fields: Any):
+        self.log("WARNING", message, **fields)
+
+    def error(self, message: str, **fields: Any):
+        self.log("ERROR", message, **fields)
+
+    def flush(self):
+        """Write buffered lines to the log file in a single append"""
+        with self._lock:
+            if not self._buffer or self.log_file is None:
+                return
+            lines, self._buffer = self._buffer, []
+
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+_loggers: Dict[str, StructuredLogger] = {}
+
+
+def get_logger(name: str, **kwargs: Any) -> StructuredLogger:
+    """Get or create a named logger (kwargs apply on first creation only)"""
+    if name not in _loggers:
+        _loggers[name] = StructuredLogger(name, **kwargs)
+    return _loggers[name]
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing count, optionally split by labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str = ""):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: Any):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def samples(self, openmetrics: bool = False) -> List[str]:
+        suffix = "_total" if openmetrics and not self.name.endswith("_total") else ""
+        return [
+            f"{self.name}{suffix}{_format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Point-in-time value (e.g. records/sec at end of a run)"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def samples(self, openmetrics: bool = False) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Histogram:
+    """
+    Bucketed distribution with a bounded raw-sample reservoir
+
+    Buckets feed the Prometheus export; the reservoir backs percentile()
+    for console summaries.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str = "", buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0, "samples": []}
+                self._series[key] = series
+
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][idx] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+            samples = series["samples"]
+            if len(samples) < HISTOGRAM_RESERVOIR:
+                samples.append(value)
+            else:
+                samples[series["count"] % HISTOGRAM_RESERVOIR] = value
+
+    @contextmanager
+    def time(self, **labels: Any):
+        """Observe the wall-clock duration of a block, in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(_label_key(labels))
+        return series["count"] if series else 0
+
+    def percentile(self, q: float, **labels: Any) -> float:
+        series = self._series.get(_label_key(labels))
+        return percentile(series["samples"], q) if series else 0.0
+
+    def samples(self, openmetrics: bool = False) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series["counts"]):
+                lines.append(f"{self.name}_bucket{_format_labels(key, {'le': _format_value(bound)})} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, {'le': '+Inf'})} {series['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metrics with text exposition"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+
+    def _get_or_create(self, cls, name: str, help_text: str, **kwargs: Any):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, help_text, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "", buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def uptime(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def render(self, fmt: str = "prometheus") -> str:
+        """Render all metrics as Prometheus text (0.0.4) or OpenMetrics"""
+        openmetrics = fmt == "openmetrics"
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            if openmetrics and metric.kind == "counter" and name.endswith("_total"):
+                name = name[:-len("_total")]  # OpenMetrics family names omit the suffix
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples(openmetrics=openmetrics))
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path, fmt: str = "prometheus"):
+        """Atomically write the exposition file so readers never see a partial file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render(fmt))
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+# Standard pipeline metrics shared across scripts
+RECORDS_TOTAL = REGISTRY.counter("deckbot_records_total", "Records processed, by stage")
+BATCH_SECONDS = REGISTRY.histogram("deckbot_batch_seconds", "Batch upsert latency in seconds")
+RETRIES_TOTAL = REGISTRY.counter("deckbot_retries_total", "Retried upstream calls")
+BYTES_SENT_TOTAL = REGISTRY.counter("deckbot_bytes_sent_total", "Serialized payload bytes sent upstream")
+RECORDS_PER_SECOND = REGISTRY.gauge("deckbot_records_per_second", "Throughput over the run, by stage")
+
+
+def payload_bytes(records: Any) -> int:
+    """Approximate wire size of a JSON payload"""
+    return len(json.dumps(records, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def record_throughput(stage: str):
+    """Update the records/sec gauge for a stage from the run's uptime"""
+    elapsed = REGISTRY.uptime()
+    if elapsed > 0:
+        RECORDS_PER_SECOND.set(RECORDS_TOTAL.value(stage=stage) / elapsed, stage=stage)
+
+
+def flush_all():
+    """Flush every logger and write the metrics file if configured"""
+    for logger in list(_loggers.values()):
+        logger.flush()
+
+    metrics_file = os.environ.get("DECKBOT_METRICS_FILE")
+    if metrics_file:
+        REGISTRY.write(Path(metrics_file), os.environ.get("DECKBOT_METRICS_FORMAT", "prometheus"))
+
+
+atexit.register(flush_all)
+
+
+def main():
+    """Summarize a structured JSON Lines log on the console"""
+    if len(sys.argv) < 2:
+        print("""
+Usage:
+  python deckbot_metrics.py <log.jsonl> [level]
+
+Summarizes a structured log: events per logger and level, plus errors.
+        """)
+        return 1
+
+    counts: Dict[Tuple[str, str], int] = {}
+    errors = []
+    level_filter = sys.argv[2].upper() if len(sys.argv) > 2 else None
+
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            key = (entry.get("logger", ""), entry.get("level", ""))
+            counts[key] = counts.get(key, 0) + 1
+            if entry.get("level") == "ERROR":
+                errors.append(entry)
+
+    print("\n📊 Log Summary")
+    print("=" * 60)
+    for (logger, level), count in sorted(counts.items()):
+        if level_filter and level != level_filter:
+            continue
+        print(f"   {logger:<30} {level:<8} {count}")
+
+    if errors:
+        print(f"\n❌ Errors ({len(errors)}):")
+        for entry in errors[-10:]:
+            print(f"   [{entry['ts']}] {entry['logger']}: {entry['msg']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+DeckBot Keyword Metadata Migration
+Rewrites legacy ", "-joined keyword strings as list metadata
+
+- pinecone: walks every namespace of the dense and sparse indexes of the
+  active generation (or --generation; see deckbot_generations.py)
+  (list → fetch), and updates slide records whose keywords are still a
+  string; missing keyword_ids are filled in from the keyword index
+- files: rewrites saved batch JSON files (pinecone_batches/**/*.json) in
+  place so re-upserts carry list keywords too; for store-backed batches
+  (artifact manifests) migrated chunks are stored as new blobs and the
+  manifest repointed (old blobs are left for deckbot_artifacts.py gc)
+- Metadata-only updates: records are not re-embedded
+- --dry-run counts what would change without writing anything
+
+Usage:
+    python deckbot_migrate_keywords.py pinecone [--namespace global] [--generation g2] [--dry-run]
+    python deckbot_migrate_keywords.py files <batch_dir> [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from deckbot_artifacts import load_chunks, read_manifest, write_manifest
+from deckbot_keywords import KeywordCanonicalizer, keyword_list
+from deckbot_unified_index import DENSE_INDEX_NAME, SPARSE_INDEX_NAME, DeckBotIndexManager
+
+# Configuration
+LIST_PAGE_SIZE = 100
+UPDATE_CONCURRENCY = 8  # Metadata update calls in flight at once
+
+
+def migrated_metadata(metadata: Dict[str, Any], keyword_index: KeywordCanonicalizer) -> Optional[Dict[str, Any]]:
+    """Metadata fields to set on a record, or None if it is already migrated"""
+    if "keywords" not in metadata:
+        return None  # Deck records have no keywords
+    changes: Dict[str, Any] = {}
+    keywords = keyword_list(metadata["keywords"])
+    if not isinstance(metadata["keywords"], list):
+        changes["keywords"] = keywords
+    if "keyword_ids" not in metadata:
+        changes["keyword_ids"] = keyword_index.keyword_ids(keywords)
+    return changes or None
+
+
+def migrate_namespace(index: Any, namespace: str, keyword_index: KeywordCanonicalizer,
+                      dry_run: bool, pool: ThreadPoolExecutor) -> Dict[str, int]:
+    counts = {"scanned": 0, "migrated": 0}
+    for ids in index.list(namespace=namespace, limit=LIST_PAGE_SIZE):
+        fetched = index.fetch(ids=ids, namespace=namespace)
+        updates = []
+        for record_id, vector in fetched.vectors.items():
+            changes = migrated_metadata(dict(vector.metadata or {}), keyword_index)
+            if changes:
+                updates.append((record_id, changes))
+        counts["scanned"] += len(ids)
+        counts["migrated"] += len(updates)
+        if updates and not dry_run:
+            futures = [
+                pool.submit(index.update, id=record_id, set_metadata=changes, namespace=namespace)
+                for record_id, changes in updates
+            ]
+            for future in futures:
+                future.result()
+    return counts
+
+
+def migrate_pinecone(manager: DeckBotIndexManager, namespaces: Optional[List[str]] = None,
+                     dry_run: bool = False, keyword_index: Optional[KeywordCanonicalizer] = None) -> Dict[str, int]:
+    keyword_index = keyword_index or manager.keyword_index
+    totals = {"scanned": 0, "migrated": 0}
+    with ThreadPoolExecutor(max_workers=UPDATE_CONCURRENCY, thread_name_prefix="migrate") as pool:
+        for logical_name in (DENSE_INDEX_NAME, SPARSE_INDEX_NAME):
+            # Physical index of the manager's generation, not the base name
+            index_name = manager.index_name(logical_name)
+            index = manager._index(logical_name)
+            targets = namespaces or sorted(index.describe_index_stats().namespaces or {})
+            for namespace in targets:
+                counts = migrate_namespace(index, namespace, keyword_index, dry_run, pool)
+                print(f"   {index_name} / {namespace}: {counts['migrated']} of {counts['scanned']} records")
+                for key in totals:
+                    totals[key] += counts[key]
+    if not dry_run:
+        keyword_index.save_if_changed()
+    return totals
+
+
+def _migrate_manifest(path: Path, keyword_index: KeywordCanonicalizer, totals: Dict[str, int],
+                      dry_run: bool = False):
+    manifest, store = read_manifest(path)
+    changed = False
+    for chunk, (_, records) in zip(manifest["chunks"], load_chunks(path)):
+        migrated = 0
+        for record in records:
+            changes = migrated_metadata(record, keyword_index)
+            if changes:
+                record.update(changes)
+                migrated += 1
+        totals["scanned"] += len(records)
+        totals["migrated"] += migrated
+        if migrated:
+            changed = True
+            if not dry_run:
+                chunk["parts"] = [{"blob": store.put(records), "start": 0, "stop": len(records)}]
+
+    if changed:
+        totals["files"] += 1
+        if not dry_run:
+            fields = {k: v for k, v in manifest.items() if k not in ("version", "store", "chunks")}
+            write_manifest(path, store, manifest["chunks"], **fields)
+
+
+def migrate_files(batch_dir: Path, dry_run: bool = False,
+                  keyword_index: Optional[KeywordCanonicalizer] = None) -> Dict[str, int]:
+    keyword_index = keyword_index or KeywordCanonicalizer.from_env()
+    totals = {"files": 0, "scanned": 0, "migrated": 0}
+    for path in sorted(batch_dir.rglob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        if isinstance(records, dict) and "chunks" in records and "store" in records:
+            _migrate_manifest(path, keyword_index, totals, dry_run)
+            continue
+        if not isinstance(records, list):
+            continue  # Summaries and other non-batch JSON
+
+        migrated = 0
+        for record in records:
+            changes = migrated_metadata(record, keyword_index) if isinstance(record, dict) else None
+            if changes:
+                record.update(changes)
+                migrated += 1
+        totals["scanned"] += len(records)
+        totals["migrated"] += migrated
+
+        if migrated:
+            totals["files"] += 1
+            if not dry_run:
+                tmp_path = path.with_suffix(path.suffix + ".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(records, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, path)
+    if not dry_run:
+        keyword_index.save_if_changed()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate keyword metadata from joined strings to lists")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pinecone_parser = subparsers.add_parser("pinecone", help="Update records in the dense and sparse indexes")
+    pinecone_parser.add_argument("--namespace", action="append", help="Only these namespaces (repeatable)")
+    pinecone_parser.add_argument("--generation", help="Migrate this index generation instead of the active one")
+    pinecone_parser.add_argument("--dry-run", action="store_true")
+
+    files_parser = subparsers.add_parser("files", help="Rewrite saved batch JSON files")
+    files_parser.add_argument("batch_dir", type=Path)
+    files_parser.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    label = " (dry run)" if args.dry_run else ""
+
+    if args.command == "pinecone":
+        manager = DeckBotIndexManager(cache_reranks=False, generation=args.generation)
+        print(f"🔄 Migrating keyword metadata in Pinecone{label}...")
+        totals = migrate_pinecone(manager, args.namespace, args.dry_run)
+        print(f"\n✅ {totals['migrated']} of {totals['scanned']} records "
+              f"{'need' if args.dry_run else 'updated with'} list keywords "
+              f"({time.perf_counter() - start:.1f}s)")
+    else:
+        if not args.batch_dir.is_dir():
+            print(f"❌ Error: Directory not found: {args.batch_dir}")
+            return 1
+        print(f"🔄 Migrating keyword metadata in {args.batch_dir}{label}...")
+        totals = migrate_files(args.batch_dir, args.dry_run)
+        print(f"\n✅ {totals['migrated']} of {totals['scanned']} records in {totals['files']} files "
+              f"{'need' if args.dry_run else 'updated with'} list keywords")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
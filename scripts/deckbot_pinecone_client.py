@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Pinecone Client Factory for DeckBot
+Single place that decides which Pinecone backend the scripts talk to
+
+- DECKBOT_PINECONE_URL set → LocalPinecone pointed at the local stand-in
+  server (deckbot_local_pinecone.py); no API key or SDK needed
+- otherwise → the real Pinecone SDK client with PINECONE_API_KEY
+"""
+
+import os
+from typing import Any, Optional
+
+# Configuration
+BASE_URL_ENV = "DECKBOT_PINECONE_URL"
+
+
+def local_base_url() -> Optional[str]:
+    """Base URL of the local stand-in, if configured"""
+    return os.environ.get(BASE_URL_ENV) or None
+
+
+def has_credentials() -> bool:
+    """Whether a client can be created (API key, or a local stand-in URL)"""
+    return bool(local_base_url() or os.environ.get("PINECONE_API_KEY"))
+
+
+def create_pinecone_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> Any:
+    """Return a Pinecone SDK client, or a LocalPinecone when a base URL is set"""
+    base_url = base_url or local_base_url()
+    if base_url:
+        from deckbot_local_pinecone import LocalPinecone
+        return LocalPinecone(base_url)
+
+    from pinecone import Pinecone
+    return Pinecone(api_key=api_key or os.environ.get("PINECONE_API_KEY"))
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+DeckBot Query Service
+Long-running asyncio HTTP service exposing cascading_search as JSON
+
+- One warm DeckBotIndexManager per process (client + index handles reused)
+- Bounded concurrency per upstream (dense, sparse, rerank) so bursts queue
+  locally instead of tripping Pinecone rate limits
+- Identical in-flight queries are coalesced into one upstream call
+  (deckbot_singleflight; normalized query text, filters and k-values)
+- Every response carries per-stage timings from the search tracer
+
+Endpoints:
+    POST /search            {"query", "namespace"?, "filters"?, "keywords"?, "top_k"?,
+                             "rerank_top_n"?, "fusion"?, "rerank"?}
+    POST /search/company    {"query", "company", "top_n"?}
+    POST /search/industry   {"query", "industry", "top_n"?}
+    POST /search/keywords   {"query", "keywords": [...], "top_n"?}  (variants resolve
+                            through the keyword index; unknown keywords → 400)
+    POST /search/stream     same body as /search; NDJSON (chunked), one line per
+                            stage: provisional fused hits, then final reranked hits
+    GET  /healthz           liveness + in-flight counts + cache fill
+    GET  /metrics           Prometheus text (deckbot_metrics registry)
+
+Usage:
+    python deckbot_query_service.py [--port 8080] [--workers 32] [--dense-concurrency 16]
+                                    [--warmup logs/queries.jsonl] [--warmup-interval 600]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from deckbot_metrics import REGISTRY, get_logger
+from deckbot_results import STAGE_FUSED, STAGE_RERANKED, SearchResult
+from deckbot_singleflight import AsyncSingleFlight, make_query_key
+from deckbot_tracing import Tracer
+from deckbot_warmup import DEFAULT_TOP_N, print_report, run_scheduled, warm_up
+
+# Configuration
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 32  # Threads running blocking SDK calls
+DEFAULT_DENSE_CONCURRENCY = 16
+DEFAULT_SPARSE_CONCURRENCY = 16
+DEFAULT_RERANK_CONCURRENCY = 8
+MAX_BODY_BYTES = 1024 * 1024
+MAX_TOP_K = 1000  # Largest top_k / rerank_top_n / top_n a request may ask for
+KEEP_ALIVE_TIMEOUT = 30  # Seconds an idle connection is kept open
+SEARCH_ROUTES = ("/search", "/search/company", "/search/industry", "/search/keywords")
+STREAM_ROUTE = "/search/stream"
+
+REQUESTS_TOTAL = REGISTRY.counter("deckbot_query_requests_total", "Query service requests, by route and status")
+REQUEST_SECONDS = REGISTRY.histogram("deckbot_query_seconds", "Query service latency in seconds, by route")
+
+log = get_logger("deckbot_query_service")
+
+
+class HTTPError(Exception):
+    """Client-visible error with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class QueryService:
+    """Runs searches on a warm manager in a thread pool and coalesces duplicates"""
+
+    def __init__(
+        self,
+        manager: Optional[Any] = None,
+        workers: int = DEFAULT_WORKERS,
+        dense_concurrency: int = DEFAULT_DENSE_CONCURRENCY,
+        sparse_concurrency: int = DEFAULT_SPARSE_CONCURRENCY,
+        rerank_concurrency: int = DEFAULT_RERANK_CONCURRENCY
+    ):
+        # Imported here so --help works without the Pinecone SDK installed
+        from deckbot_unified_index import DENSE_INDEX_NAME, SPARSE_INDEX_NAME, DeckBotIndexManager
+
+        if manager is None:
+            tracer = Tracer(os.environ.get("DECKBOT_TRACE_FILE"),
+                            os.environ.get("DECKBOT_TRACE_FORMAT", "chrome"), keep_in_memory=True)
+            manager = DeckBotIndexManager(tracer=tracer)
+
+        self.manager = manager
+        # The manager creates its client and index handles lazily; build them now
+        # so the first request does not pay the cold start
+        self.manager.pc
+        for name in (DENSE_INDEX_NAME, SPARSE_INDEX_NAME):
+            self.manager._index(name)
+        self.manager.upstream_limits = {
+            "dense": threading.BoundedSemaphore(dense_concurrency),
+            "sparse": threading.BoundedSemaphore(sparse_concurrency),
+            "rerank": threading.BoundedSemaphore(rerank_concurrency),
+        }
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deckbot-query")
+        self.flight = AsyncSingleFlight("query_service")
+        self.started = time.time()
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    async def search(self, route: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run (or join) the search described by params and return the JSON payload"""
+        kwargs = self._search_kwargs(route, params)
+        params = {name: value for name, value in kwargs.items() if name not in ("query", "filters")}
+        key = make_query_key(kwargs["query"], kwargs.get("filters"), route=route, **params)
+
+        loop = asyncio.get_running_loop()
+        payload, joined = await self.flight.do(
+            key, lambda: loop.run_in_executor(self.executor, self._run_search, route, kwargs)
+        )
+        return dict(payload, coalesced=joined)
+
+    def _search_kwargs(self, route: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        query = params.get("query")
+        if not isinstance(query, str) or not query.strip():
+            raise HTTPError(400, "'query' must be a non-empty string")
+
+        if route == "/search":
+            from deckbot_unified_index import FUSION_METHODS
+
+            allowed = ("namespace", "filters", "keywords", "top_k", "rerank_top_n", "fusion", "rerank")
+            kwargs = {name: params[name] for name in allowed if name in params}
+            for name in ("top_k", "rerank_top_n"):
+                if name in kwargs:
+                    kwargs[name] = self._count(kwargs, name)
+            if "fusion" in kwargs and kwargs["fusion"] not in FUSION_METHODS:
+                raise HTTPError(400, f"'fusion' must be one of {', '.join(FUSION_METHODS)}")
+            if "rerank" in kwargs and not isinstance(kwargs["rerank"], bool):
+                raise HTTPError(400, "'rerank' must be true or false")
+            if "namespace" in kwargs and (not isinstance(kwargs["namespace"], str) or not kwargs["namespace"]):
+                raise HTTPError(400, "'namespace' must be a non-empty string")
+            if "filters" in kwargs and not isinstance(kwargs["filters"], dict):
+                raise HTTPError(400, "'filters' must be a JSON object")
+            if "keywords" in kwargs and (not isinstance(kwargs["keywords"], list)
+                                         or not all(isinstance(k, str) for k in kwargs["keywords"])):
+                raise HTTPError(400, "'keywords' must be a list of strings")
+            kwargs["query"] = query.strip()
+            return kwargs
+
+        field = route.rsplit("/", 1)[1]
+        if field == "keywords":
+            keywords = params.get("keywords")
+            if not isinstance(keywords, list) or not keywords or not all(isinstance(k, str) for k in keywords):
+                raise HTTPError(400, "'keywords' must be a non-empty list of strings")
+            return {"query": query.strip(), "keywords": keywords, "top_n": self._count(params, "top_n", 5)}
+        if not isinstance(params.get(field), str) or not params[field]:
+            raise HTTPError(400, f"'{field}' must be a non-empty string")
+        return {"query": query.strip(), field: params[field], "top_n": self._count(params, "top_n", 5)}
+
+    @staticmethod
+    def _count(params: Dict[str, Any], name: str, default: Optional[int] = None) -> int:
+        """A result count from the request, checked before anything reaches Pinecone"""
+        value = params.get(name, default)
+        # bool is an int subclass; true/false are not counts
+        if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= MAX_TOP_K:
+            raise HTTPError(400, f"'{name}' must be an integer from 1 to {MAX_TOP_K}")
+        return value
+
+    def _run_search(self, route: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking search on a worker thread; returns results plus stage timings"""
+        manager = self.manager
+        started = time.perf_counter()
+        if route == "/search":
+            results = manager.cascading_search(verbose=False, **kwargs)
+        elif route == "/search/company":
+            results = manager.search_by_company(verbose=False, **kwargs)
+        elif route == "/search/keywords":
+            results = manager.search_by_keywords(verbose=False, **kwargs)
+        else:
+            results = manager.search_by_industry(verbose=False, **kwargs)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        # The tracer keeps the last trace per thread, so this is our query's
+        timings = {span.name: round(span.duration_ms, 2) for span in manager.tracer.last_trace()}
+        stage = STAGE_RERANKED if kwargs.get("rerank", True) else STAGE_FUSED
+        result = SearchResult.from_response(kwargs["query"], stage, results, final=True)
+        return {
+            "query": kwargs["query"],
+            "stage": stage,
+            "results": [hit.to_dict() for hit in result.hits],
+            "timings_ms": timings,
+            "total_ms": round(total_ms, 2),
+        }
+
+    async def stream_search(self, params: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield cascading_search_stream stages (fused, then reranked) as JSON payloads"""
+        kwargs = self._search_kwargs("/search", params)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def produce():
+            # The whole generator runs on one worker thread (tracer spans are per-thread)
+            try:
+                for result in self.manager.cascading_search_stream(**kwargs):
+                    loop.call_soon_threadsafe(queue.put_nowait, result.to_dict())
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        loop.run_in_executor(self.executor, produce)
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started, 1),
+            "in_flight": self.flight.in_flight(),
+            "coalesced": self.flight.coalesced,
+            "rerank_cache": self.manager.rerank_cache.stats() if self.manager.rerank_cache else None,
+            "result_cache": self.manager.result_cache.stats() if self.manager.result_cache else None,
+        }
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1 (keep-alive, JSON bodies)
+    # ------------------------------------------------------------------
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if path == STREAM_ROUTE:
+                    await self._stream(writer, method, body, keep_alive)
+                else:
+                    status, content_type, payload = await self._dispatch(method, path, body)
+                    self._write_response(writer, status, content_type, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        except HTTPError as e:
+            self._write_response(writer, e.status, "application/json",
+                                 json.dumps({"error": str(e)}).encode("utf-8"), False)
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+        if not line:
+            return None
+        try:
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0) or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, str, bytes]:
+        started = time.perf_counter()
+        try:
+            if method == "GET" and path == "/healthz":
+                status, payload = 200, self.health()
+            elif method == "GET" and path == "/metrics":
+                REQUESTS_TOTAL.inc(route=path, status=200)
+                return 200, "text/plain; version=0.0.4", REGISTRY.render().encode("utf-8")
+            elif path in SEARCH_ROUTES:
+                status, payload = 200, await self.search(path, self._parse_params(method, body))
+            else:
+                raise HTTPError(404, f"Unknown route: {method} {path}")
+        except Exception as e:
+            status, payload = self._error(e, path)
+
+        REQUESTS_TOTAL.inc(route=path, status=status)
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route=path)
+        return status, "application/json", json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+    async def _stream(self, writer: asyncio.StreamWriter, method: str, body: bytes, keep_alive: bool):
+        """NDJSON over chunked transfer: each stage is flushed as soon as it is ready"""
+        started = time.perf_counter()
+        stages = None
+        try:
+            stages = self.stream_search(self._parse_params(method, body))
+            # Wait for the first stage so request/retrieval errors still get a proper status
+            first = await stages.__anext__()
+        except Exception as e:
+            if stages is not None:
+                await stages.aclose()
+            status, payload = self._error(e, STREAM_ROUTE)
+            REQUESTS_TOTAL.inc(route=STREAM_ROUTE, status=status)
+            self._write_response(writer, status, "application/json",
+                                 json.dumps(payload, ensure_ascii=False).encode("utf-8"), keep_alive)
+            return
+
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/x-ndjson\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1"))
+
+        async def send(item: Dict[str, Any]):
+            line = (json.dumps(item, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+            writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+            await writer.drain()
+
+        await send(first)
+        try:
+            async for item in stages:
+                await send(item)
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            await send({"error": self._error(e, STREAM_ROUTE)[1]["error"], "final": True})
+        writer.write(b"0\r\n\r\n")
+        REQUESTS_TOTAL.inc(route=STREAM_ROUTE, status=200)
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route=STREAM_ROUTE)
+
+    @staticmethod
+    def _parse_params(method: str, body: bytes) -> Dict[str, Any]:
+        if method != "POST":
+            raise HTTPError(405, "Use POST")
+        try:
+            params = json.loads(body or b"{}")
+        except json.JSONDecodeError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(params, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return params
+
+    @staticmethod
+    def _error(error: Exception, path: str) -> Tuple[int, Dict[str, Any]]:
+        """Map an exception to (status, JSON payload)"""
+        if isinstance(error, HTTPError):
+            return error.status, {"error": str(error)}
+        if isinstance(error, (TypeError, ValueError)):
+            return 400, {"error": str(error)}
+        log.error(f"Search failed: {error}", path=path, error_type=type(error).__name__)
+        return 502, {"error": f"Upstream error: {error}"}
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, content_type: str,
+                        payload: bytes, keep_alive: bool):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  413: "Payload Too Large", 502: "Bad Gateway"}.get(status, "Error")
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + payload)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+async def run_server(service: QueryService, host: str, port: int):
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"🚀 DeckBot query service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DeckBot asynchronous query service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Threads for blocking SDK calls")
+    parser.add_argument("--dense-concurrency", type=int, default=DEFAULT_DENSE_CONCURRENCY)
+    parser.add_argument("--sparse-concurrency", type=int, default=DEFAULT_SPARSE_CONCURRENCY)
+    parser.add_argument("--rerank-concurrency", type=int, default=DEFAULT_RERANK_CONCURRENCY)
+    parser.add_argument("--warmup", type=Path, metavar="QUERY_LOG",
+                        help="Probe indexes and prefetch popular queries from this log before serving")
+    parser.add_argument("--warmup-top", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--warmup-interval", type=float, help="Re-run the warm-up every N seconds")
+    args = parser.parse_args()
+
+    print("🔥 Warming up Pinecone client...")
+    service = QueryService(
+        workers=args.workers,
+        dense_concurrency=args.dense_concurrency,
+        sparse_concurrency=args.sparse_concurrency,
+        rerank_concurrency=args.rerank_concurrency,
+    )
+    print(f"   Upstream limits: dense={args.dense_concurrency} sparse={args.sparse_concurrency} "
+          f"rerank={args.rerank_concurrency}, workers={args.workers}")
+
+    stop_warmup = threading.Event()
+    if args.warmup:
+        print_report(warm_up(service.manager, args.warmup, top_n=args.warmup_top))
+        if args.warmup_interval:
+            threading.Thread(
+                target=run_scheduled, args=(service.manager, args.warmup, args.warmup_interval, stop_warmup),
+                kwargs={"top_n": args.warmup_top}, name="deckbot-warmup", daemon=True
+            ).start()
+
+    try:
+        asyncio.run(run_server(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        stop_warmup.set()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
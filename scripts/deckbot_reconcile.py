@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+DeckBot Index Reconciliation
+Diffs the dense and sparse indexes against the records local metadata should produce
+
+- Expected set: every *_metadata.json built exactly as ingest builds it
+  (ingestion policy, optional dedup, chunking) for doc:{pdf_id} and global
+- Remote set: record IDs per index/namespace from paginated list calls,
+  namespaces listed concurrently
+- Set differences per target: missing (expected, not in the index), orphans
+  (in the index, not expected), and with --deep stale records (fetched
+  metadata differs from what ingest would write now)
+- Also reports records present in dense but not sparse (and vice versa)
+- Writes a repair plan (upserts with their records inline, deletes by ID)
+  that `apply` executes directly: batched upserts, concurrent batched deletes
+
+Usage:
+    python deckbot_reconcile.py check <metadata_dir> [--deep] [--dedup] [--plan repair_plan.json]
+                                      [--prune-namespaces] [--generation g2]
+    python deckbot_reconcile.py apply <repair_plan.json> [--dry-run]
+
+check exits with 2 when the indexes have drifted (usable from cron/CI).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from deckbot_dedup import STORE_FILENAME, SlideDeduplicator
+from deckbot_pinecone_client import create_pinecone_client
+from deckbot_unified_index import (
+    DENSE_INDEX_NAME, GLOBAL_NAMESPACE, MAX_BATCH_SIZE, SPARSE_INDEX_NAME, DeckBotIndexManager
+)
+
+# Configuration
+LIST_PAGE_SIZE = 100
+FETCH_BATCH_SIZE = 100  # IDs per fetch (keeps request URLs short)
+DELETE_BATCH_SIZE = 1000  # Pinecone delete-by-ID limit
+CONCURRENCY = 8  # list/fetch/delete calls in flight at once
+INDEX_NAMES = (DENSE_INDEX_NAME, SPARSE_INDEX_NAME)
+PLAN_VERSION = 1
+
+Target = Tuple[str, str]  # (index name, namespace)
+
+
+def expected_records(manager: DeckBotIndexManager, metadata_dir: Path) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """namespace → {record ID: record} for every deck in metadata_dir"""
+    expected: Dict[str, Dict[str, Dict[str, Any]]] = {GLOBAL_NAMESPACE: {}}
+    for path in sorted(Path(metadata_dir).glob("*_metadata.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Lookup only: a dry run must not assign keyword IDs that are never saved
+        doc_id, records, _ = manager.build_records(data, register_keywords=False)
+        by_id = {record["_id"]: record for record in records}
+        expected[f"doc:{doc_id}"] = by_id
+        expected[GLOBAL_NAMESPACE].update(by_id)
+    return expected
+
+
+def list_ids(index: Any, namespace: str) -> Set[str]:
+    ids: Set[str] = set()
+    for page in index.list(namespace=namespace, limit=LIST_PAGE_SIZE):
+        ids.update(page)
+    return ids
+
+
+def remote_ids(client: Any, index_names: List[str], namespaces: List[str],
+               pool: ThreadPoolExecutor) -> Dict[Target, Set[str]]:
+    """IDs per (index, namespace) for the given namespaces plus any others the indexes report"""
+    targets: List[Target] = []
+    for index_name in index_names:
+        reported = client.Index(index_name).describe_index_stats().namespaces or {}
+        targets.extend((index_name, namespace) for namespace in sorted(set(namespaces) | set(reported)))
+    futures = {target: pool.submit(list_ids, client.Index(target[0]), target[1]) for target in targets}
+    return {target: future.result() for target, future in futures.items()}
+
+
+def _differs(expected: Dict[str, Any], stored: Dict[str, Any]) -> bool:
+    for field, value in expected.items():
+        if field in ("_id", "id"):
+            continue
+        if isinstance(value, (list, tuple)):
+            if list(stored.get(field) or []) != list(value):
+                return True
+        elif stored.get(field) != value and not (value == "" and stored.get(field) is None):
+            return True
+    return False
+
+
+def stale_ids(index: Any, namespace: str, ids: List[str], expected: Dict[str, Dict[str, Any]],
+              pool: ThreadPoolExecutor) -> List[str]:
+    """IDs whose stored fields differ from the expected record (concurrent batched fetches)"""
+    def check(batch: List[str]) -> List[str]:
+        fetched = index.fetch(ids=batch, namespace=namespace).vectors
+        return [record_id for record_id, vector in fetched.items()
+                if _differs(expected[record_id], dict(vector.metadata or {}))]
+
+    batches = [ids[i:i + FETCH_BATCH_SIZE] for i in range(0, len(ids), FETCH_BATCH_SIZE)]
+    stale: List[str] = []
+    for found in pool.map(check, batches):
+        stale.extend(found)
+    return sorted(stale)
+
+
+def reconcile(client: Any, manager: DeckBotIndexManager, metadata_dir: Path, deep: bool = False,
+              prune_namespaces: bool = False, concurrency: int = CONCURRENCY) -> Dict[str, Any]:
+    """Diff local metadata against both indexes; returns the report and repair plan"""
+    expected = expected_records(manager, metadata_dir)
+    # Physical indexes of the manager's generation (see deckbot_generations)
+    dense_name, sparse_name = (manager.index_name(name) for name in INDEX_NAMES)
+    targets_report: List[Dict[str, Any]] = []
+    upserts: List[Dict[str, Any]] = []
+    deletes: List[Dict[str, Any]] = []
+    orphan_namespaces: List[Dict[str, Any]] = []
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="reconcile") as pool:
+        remote = remote_ids(client, [dense_name, sparse_name], list(expected), pool)
+
+        for (index_name, namespace), present in remote.items():
+            wanted = expected.get(namespace)
+            if wanted is None:
+                if not present:
+                    continue
+                # A namespace no local deck maps to (deck removed, or a partial metadata_dir)
+                orphan_namespaces.append({"index": index_name, "namespace": namespace, "records": len(present)})
+                if prune_namespaces:
+                    deletes.append({"index": index_name, "namespace": namespace, "delete_all": True,
+                                    "ids": sorted(present)})
+                continue
+
+            missing = sorted(wanted.keys() - present)
+            orphans = sorted(present - wanted.keys())
+            stale = stale_ids(client.Index(index_name), namespace, sorted(present & wanted.keys()),
+                              wanted, pool) if deep else []
+            targets_report.append({"index": index_name, "namespace": namespace, "expected": len(wanted),
+                                   "remote": len(present), "missing": len(missing), "orphans": len(orphans),
+                                   "stale": len(stale)})
+            if missing or stale:
+                upserts.append({"index": index_name, "namespace": namespace,
+                                "records": [wanted[record_id] for record_id in missing + stale]})
+            if orphans:
+                deletes.append({"index": index_name, "namespace": namespace, "ids": orphans})
+
+    # Records in one index but not the other (same namespace)
+    asymmetric = []
+    for namespace in sorted({namespace for _, namespace in remote}):
+        dense = remote.get((dense_name, namespace), set())
+        sparse = remote.get((sparse_name, namespace), set())
+        if dense != sparse:
+            asymmetric.append({"namespace": namespace, "dense_only": len(dense - sparse),
+                               "sparse_only": len(sparse - dense)})
+
+    return {
+        "version": PLAN_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "metadata_dir": str(metadata_dir),
+        "deep": deep,
+        "targets": targets_report,
+        "asymmetric": asymmetric,
+        "orphan_namespaces": orphan_namespaces,
+        "upserts": upserts,
+        "deletes": deletes,
+    }
+
+
+def plan_size(plan: Dict[str, Any]) -> Tuple[int, int]:
+    """(records to upsert, records to delete)"""
+    return (sum(len(entry["records"]) for entry in plan["upserts"]),
+            sum(len(entry["ids"]) for entry in plan["deletes"]))
+
+
+def apply_plan(client: Any, plan: Dict[str, Any], dry_run: bool = False,
+               concurrency: int = CONCURRENCY) -> Dict[str, int]:
+    """Execute a repair plan: batched upserts, then concurrent batched deletes"""
+    totals = {"upserted": 0, "deleted": 0}
+    for entry in plan["upserts"]:
+        index = client.Index(entry["index"])
+        records = entry["records"]
+        for start in range(0, len(records), MAX_BATCH_SIZE):
+            batch = records[start:start + MAX_BATCH_SIZE]
+            if not dry_run:
+                index.upsert_records(records=batch, namespace=entry["namespace"])
+            totals["upserted"] += len(batch)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="reconcile-delete") as pool:
+        futures = []
+        for entry in plan["deletes"]:
+            index = client.Index(entry["index"])
+            if entry.get("delete_all"):
+                if not dry_run:
+                    futures.append(pool.submit(index.delete, delete_all=True, namespace=entry["namespace"]))
+                totals["deleted"] += len(entry["ids"])
+                continue
+            ids = entry["ids"]
+            for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                batch = ids[start:start + DELETE_BATCH_SIZE]
+                if not dry_run:
+                    futures.append(pool.submit(index.delete, ids=batch, namespace=entry["namespace"]))
+                totals["deleted"] += len(batch)
+        for future in futures:
+            future.result()
+    return totals
+
+
+def print_report(plan: Dict[str, Any]):
+    drifted = [target for target in plan["targets"] if target["missing"] or target["orphans"] or target["stale"]]
+    print(f"\n📊 {len(plan['targets'])} index/namespace targets checked, {len(drifted)} drifted")
+    for target in drifted:
+        print(f"   {target['index']} / {target['namespace']}: {target['remote']}/{target['expected']} present, "
+              f"{target['missing']} missing, {target['orphans']} orphans"
+              + (f", {target['stale']} stale" if plan["deep"] else ""))
+    for item in plan["asymmetric"]:
+        print(f"   ⚠️  {item['namespace']}: {item['dense_only']} dense-only, {item['sparse_only']} sparse-only")
+    for item in plan["orphan_namespaces"]:
+        print(f"   🗑️  {item['index']} / {item['namespace']}: {item['records']} records, no local deck")
+    upserts, deletes = plan_size(plan)
+    print(f"\n🛠️  Repair plan: {upserts} upserts, {deletes} deletes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile the DeckBot indexes with local metadata")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check_parser = subparsers.add_parser("check", help="Diff indexes against *_metadata.json files")
+    check_parser.add_argument("metadata_dir", type=Path)
+    check_parser.add_argument("--deep", action="store_true", help="Fetch shared records and compare fields")
+    check_parser.add_argument("--dedup", action="store_true", help="Corpus was ingested with --dedup")
+    check_parser.add_argument("--plan", type=Path, help="Write the repair plan here")
+    check_parser.add_argument("--prune-namespaces", action="store_true",
+                              help="Plan deleting namespaces no local deck maps to")
+    check_parser.add_argument("--generation", help="Check this index generation instead of the active one")
+    check_parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+
+    apply_parser = subparsers.add_parser("apply", help="Execute a repair plan")
+    apply_parser.add_argument("plan", type=Path)
+    apply_parser.add_argument("--dry-run", action="store_true")
+    apply_parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    client = create_pinecone_client()
+
+    if args.command == "check":
+        if not args.metadata_dir.is_dir():
+            print(f"❌ Error: Directory not found: {args.metadata_dir}")
+            return 1
+        manager = DeckBotIndexManager(client=client, cache_reranks=False, generation=args.generation)
+        if args.dedup:
+            manager.deduplicator = SlideDeduplicator()
+            manager.deduplicator.use_store(args.metadata_dir / STORE_FILENAME)
+
+        print(f"🔎 Reconciling {args.metadata_dir} with {manager.index_name(DENSE_INDEX_NAME)} "
+              f"and {manager.index_name(SPARSE_INDEX_NAME)}...")
+        plan = reconcile(client, manager, args.metadata_dir, args.deep, args.prune_namespaces, args.concurrency)
+        print_report(plan)
+        print(f"   ({time.perf_counter() - start:.1f}s)")
+        if args.plan:
+            tmp_path = args.plan.with_suffix(args.plan.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(plan, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, args.plan)
+            print(f"💾 Plan: {args.plan} (run: python deckbot_reconcile.py apply {args.plan})")
+        return 2 if any(plan_size(plan)) or plan["orphan_namespaces"] else 0
+
+    if not args.plan.exists():
+        print(f"❌ Error: Plan not found: {args.plan}")
+        return 1
+    with open(args.plan, "r", encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan.get("version") != PLAN_VERSION:
+        print(f"❌ Error: Unsupported plan version: {plan.get('version')}")
+        return 1
+
+    label = " (dry run)" if args.dry_run else ""
+    print(f"🛠️  Applying {args.plan}{label}...")
+    totals = apply_plan(client, plan, args.dry_run, args.concurrency)
+    print(f"✅ {totals['upserted']} records upserted, {totals['deleted']} deleted "
+          f"({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
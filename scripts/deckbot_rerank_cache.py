@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+DeckBot Rerank Score Cache
+Remembers reranker scores per (normalized query, model, content hash)
+
+- A cross-encoder scores each (query, document) pair on its own, so cached
+  scores can be merged with fresh ones without changing the ranking
+- Only cache misses are sent to pc.inference.rerank
+- Bounded in-memory LRU; optional SQLite file so scores survive restarts
+  and are shared between processes on one host
+- Hits/misses in deckbot_rerank_cache_lookups_total, size in
+  deckbot_rerank_cache_entries
+
+Configuration:
+    DECKBOT_RERANK_CACHE_SIZE=50000       in-memory entries (0 disables the cache)
+    DECKBOT_RERANK_CACHE_DB=cache.sqlite  optional persistent backend
+
+Usage:
+    python deckbot_rerank_cache.py stats <cache.sqlite>
+    python deckbot_rerank_cache.py clear <cache.sqlite>
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from deckbot_metrics import REGISTRY
+from deckbot_singleflight import normalize_query
+
+# Configuration
+DEFAULT_MAX_ENTRIES = 50000  # ~100 bytes per entry
+SIZE_ENV = "DECKBOT_RERANK_CACHE_SIZE"
+DB_ENV = "DECKBOT_RERANK_CACHE_DB"
+SQLITE_BATCH = 500  # Keys per SELECT ... IN (...)
+
+LOOKUPS_TOTAL = REGISTRY.counter(
+    "deckbot_rerank_cache_lookups_total", "Rerank score cache lookups, by result (hit/miss)"
+)
+ENTRIES = REGISTRY.gauge("deckbot_rerank_cache_entries", "Rerank scores held in memory")
+
+
+def content_hash(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def cache_key(query: str, model: str, content: str) -> str:
+    return f"{model}\x1f{content_hash(content)}\x1f{normalize_query(query)}"
+
+
+class RerankCache:
+    """Thread-safe LRU of rerank scores with an optional SQLite backing store"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, db_path: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.db_path = Path(db_path) if db_path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rerank_scores (key TEXT PRIMARY KEY, score REAL NOT NULL, updated_at REAL)"
+            )
+
+    @classmethod
+    def from_env(cls) -> Optional["RerankCache"]:
+        """Cache sized by DECKBOT_RERANK_CACHE_SIZE (None when 0), persisted to DECKBOT_RERANK_CACHE_DB"""
+        max_entries = int(os.environ.get(SIZE_ENV, DEFAULT_MAX_ENTRIES))
+        if max_entries <= 0:
+            return None
+        return cls(max_entries, os.environ.get(DB_ENV) or None)
+
+    def _remember(self, key: str, score: float):
+        # Caller holds the lock
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, float]:
+        found: Dict[str, float] = {}
+        for start in range(0, len(keys), SQLITE_BATCH):
+            batch = keys[start:start + SQLITE_BATCH]
+            rows = self._db.execute(
+                f"SELECT key, score FROM rerank_scores WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def get_many(self, query: str, model: str, contents: Sequence[str]) -> Dict[int, float]:
+        """Cached scores by position in contents"""
+        keys = [cache_key(query, model, content) for content in contents]
+        scores: Dict[int, float] = {}
+        with self._lock:
+            missing: List[int] = []
+            for position, key in enumerate(keys):
+                score = self._entries.get(key)
+                if score is None:
+                    missing.append(position)
+                else:
+                    self._entries.move_to_end(key)
+                    scores[position] = score
+
+            if missing and self._db is not None:
+                stored = self._load([keys[position] for position in missing])
+                for position in missing:
+                    score = stored.get(keys[position])
+                    if score is not None:
+                        scores[position] = score
+                        self._remember(keys[position], score)
+
+            hits = len(scores)
+            self.hits += hits
+            self.misses += len(keys) - hits
+            ENTRIES.set(len(self._entries))
+
+        LOOKUPS_TOTAL.inc(hits, result="hit")
+        LOOKUPS_TOTAL.inc(len(keys) - hits, result="miss")
+        return scores
+
+    def put_many(self, query: str, model: str, scored: Iterable[Tuple[str, float]]):
+        """Store (content, score) pairs for a query"""
+        rows = [(cache_key(query, model, content), float(score)) for content, score in scored]
+        with self._lock:
+            for key, score in rows:
+                self._remember(key, score)
+            ENTRIES.set(len(self._entries))
+            if self._db is not None and rows:
+                now = time.time()
+                with self._db:
+                    self._db.execute("BEGIN")
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO rerank_scores (key, score, updated_at) VALUES (?, ?, ?)",
+                        [(key, score, now) for key, score in rows]
+                    )
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            ENTRIES.set(0)
+            if self._db is not None:
+                self._db.execute("DELETE FROM rerank_scores")
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("stats", "clear"):
+        print("""
+DeckBot Rerank Score Cache
+
+Usage:
+  python deckbot_rerank_cache.py stats <cache.sqlite>
+  python deckbot_rerank_cache.py clear <cache.sqlite>
+
+Enable persistence for search with DECKBOT_RERANK_CACHE_DB=<cache.sqlite>
+        """)
+        return 1
+
+    db_path = Path(sys.argv[2])
+    if not db_path.exists():
+        print(f"❌ Error: Cache not found: {db_path}")
+        return 1
+
+    cache = RerankCache(db_path=db_path)
+    if sys.argv[1] == "clear":
+        cache.clear()
+        print(f"🧹 Cleared {db_path}")
+    else:
+        count, oldest, newest = cache._db.execute(
+            "SELECT COUNT(*), MIN(updated_at), MAX(updated_at) FROM rerank_scores"
+        ).fetchone()
+        print(f"📦 {db_path}: {count} cached scores ({db_path.stat().st_size / 1024:.0f} KB)")
+        if count:
+            print(f"   Oldest: {time.ctime(oldest)}")
+            print(f"   Newest: {time.ctime(newest)}")
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+DeckBot Search Result Types
+Structured results for cascading search instead of raw SDK response objects
+
+- SearchHit: one ranked record (id, score, content, company, slide, ...)
+- SearchResult: one stage's ranked hits for a query; stage is "fused"
+  (provisional, dense + sparse merge) or "reranked" (final)
+- to_dict() gives a JSON-ready payload for the query service and UI
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Configuration
+STAGE_FUSED = "fused"
+STAGE_RERANKED = "reranked"
+
+
+@dataclass
+class SearchHit:
+    """One ranked record from a search stage"""
+
+    rank: int
+    id: str
+    score: float
+    content: str = ""
+    pdf_id: Optional[str] = None
+    company: Optional[str] = None
+    industry: Optional[str] = None
+    slide_number: Optional[int] = None
+    type: Optional[str] = None
+    keywords: Any = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_document(cls, rank: int, score: float, doc: Dict[str, Any]) -> "SearchHit":
+        known = ("_id", "_score", "content", "pdf_id", "company", "industry", "slide_number", "type", "keywords")
+        return cls(
+            rank=rank,
+            id=doc['_id'],
+            score=float(score),
+            content=doc.get('content', ''),
+            pdf_id=doc.get('pdf_id'),
+            company=doc.get('company'),
+            industry=doc.get('industry'),
+            slide_number=doc.get('slide_number'),
+            type=doc.get('type'),
+            keywords=doc.get('keywords'),
+            fields={k: v for k, v in doc.items() if k not in known},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v is not None and v != {}}
+
+
+@dataclass
+class SearchResult:
+    """Ranked hits for a query at one stage of the cascade"""
+
+    query: str
+    stage: str
+    hits: List[SearchHit]
+    final: bool
+    elapsed_ms: float = 0.0
+    candidates: int = 0  # Merged candidates the stage ranked
+
+    @classmethod
+    def from_response(cls, query: str, stage: str, response: Any, final: bool,
+                      elapsed_ms: float = 0.0, candidates: int = 0) -> "SearchResult":
+        """Build from a rerank response (or the manager's fused look-alike)"""
+        hits = [
+            SearchHit.from_document(rank, item['score'], item['document'])
+            for rank, item in enumerate(response.data, 1)
+        ]
+        return cls(query, stage, hits, final, elapsed_ms, candidates)
+
+    @property
+    def top(self) -> Optional[SearchHit]:
+        return self.hits[0] if self.hits else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "stage": self.stage,
+            "final": self.final,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "candidates": self.candidates,
+            "hits": [hit.to_dict() for hit in self.hits],
+        }
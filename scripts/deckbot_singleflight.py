@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+DeckBot Request Coalescing
+Single-flight execution: concurrent identical calls share one in-flight run
+
+- SingleFlight for threaded callers (DeckBotIndexManager.cascading_search)
+- AsyncSingleFlight for asyncio callers (deckbot_query_service)
+- make_query_key normalizes query text (NFKC, case, whitespace), namespace,
+  filters (bare values → $eq, keys sorted) and k-values into one key
+- Coalesced requests are counted in deckbot_coalesced_requests_total
+
+Only calls that overlap in time are shared; nothing is cached after the
+leader finishes. Followers receive the leader's result object (treat it as
+read-only) or its exception.
+"""
+
+import asyncio
+import json
+import threading
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from deckbot_metrics import REGISTRY
+
+COALESCED_TOTAL = REGISTRY.counter(
+    "deckbot_coalesced_requests_total", "Requests that joined an identical in-flight call, by flight"
+)
+IN_FLIGHT = REGISTRY.gauge("deckbot_in_flight_calls", "Distinct calls currently in flight, by flight")
+
+
+def normalize_query(query: str) -> str:
+    """Fold width/compatibility forms, case and whitespace so trivially different queries match"""
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+def normalize_filter(flt: Any) -> Any:
+    """Canonical form of a Pinecone metadata filter ({"k": v} is {"k": {"$eq": v}})"""
+    if isinstance(flt, dict):
+        normalized = {}
+        for key, value in flt.items():
+            if key in ("$and", "$or"):
+                normalized[key] = [normalize_filter(sub) for sub in value]
+            elif key.startswith("$"):
+                normalized[key] = sorted(value, key=str) if key in ("$in", "$nin") else value
+            elif isinstance(value, dict):
+                normalized[key] = normalize_filter(value)
+            else:
+                normalized[key] = {"$eq": value}
+        return normalized
+    return flt
+
+
+def make_query_key(query: str, filters: Optional[Dict[str, Any]] = None, **params: Any) -> str:
+    """Stable key for a search: normalized query + filters + remaining parameters"""
+    return json.dumps(
+        {"query": normalize_query(query), "filters": normalize_filter(filters or None), "params": params},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.coalesced = 0
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn once per key among concurrent callers; returns (result, joined)"""
+        with self._lock:
+            call = self._calls.get(key)
+            joined = call is not None
+            if joined:
+                self.coalesced += 1
+            else:
+                call = self._calls[key] = _Call()
+                IN_FLIGHT.set(len(self._calls), flight=self.name)
+
+        if joined:
+            COALESCED_TOTAL.inc(flight=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                IN_FLIGHT.set(len(self._calls), flight=self.name)
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Single-flight group for coroutines running on one event loop"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.coalesced = 0
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await fn() once per key among concurrent callers; returns (result, joined)"""
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            COALESCED_TOTAL.inc(flight=self.name)
+            # shield: a cancelled follower must not cancel the leader's run
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        IN_FLIGHT.set(len(self._calls), flight=self.name)
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved so a failure nobody joined doesn't warn at shutdown
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._calls[key]
+            IN_FLIGHT.set(len(self._calls), flight=self.name)
+        return result, False
+
+    def in_flight(self) -> int:
+        return len(self._calls)
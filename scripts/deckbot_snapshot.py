@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+DeckBot Corpus Snapshot
+Compiles every *_metadata.json into one memory-mapped columnar file
+
+- One row per slide; string columns for id, pdf_id, filename, company,
+  industry, layout, keywords, content and summary, plus slide_number
+- Each string column is a UTF-8 buffer plus uint64 offsets, so opening a
+  snapshot is an mmap and a header parse, and values are sliced on demand
+- Substring/regex scans run over the mapped buffer (mmap.find / re) and map
+  hits back to rows with a binary search on the offsets
+- Deck table (pdf_id, company, industry, slide row range) in the header
+- Source sizes/mtimes are recorded so stale snapshots can be detected
+
+Stdlib only (mmap + array): the Python tooling has no numpy/pyarrow
+dependency, and the offsets layout is the same one Arrow uses for strings.
+
+Usage:
+    python deckbot_snapshot.py build <metadata_dir> [snapshot_path]
+    python deckbot_snapshot.py stats <snapshot_path>
+    python deckbot_snapshot.py grep <snapshot_path> <text> [column]
+    python deckbot_snapshot.py keywords <snapshot_path> [top_n]
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from transform_to_pinecone_format import sanitize_id
+
+# Configuration
+SNAPSHOT_FILENAME = "deckbot_corpus.snapshot"
+MAGIC = b"DKSNAP01"
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+KEYWORD_SEPARATOR = "\n"  # Keywords of one slide, joined within the keywords column
+
+STRING_COLUMNS = ("id", "pdf_id", "filename", "company", "industry", "layout", "keywords", "content", "summary")
+INT_COLUMNS = ("slide_number",)
+
+
+def _aligned(position: int) -> int:
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _source_signature(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _slide_row(pdf_id: str, deck_meta: Dict[str, Any], slide: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": f"{pdf_id}_slide_{slide['slide_number']:03d}",
+        "pdf_id": pdf_id,
+        "filename": deck_meta.get("filename", ""),
+        "company": deck_meta.get("company_name", ""),
+        "industry": deck_meta.get("deck_industry", ""),
+        "layout": slide.get("slide_layout_type") or slide.get("slide_layout") or "",
+        "keywords": KEYWORD_SEPARATOR.join(slide.get("keywords", [])),
+        "content": slide.get("slide_content") or "",
+        "summary": slide.get("slide_summary") or "",
+        "slide_number": slide["slide_number"],
+    }
+
+
+def build_snapshot(metadata_dir: Path, output_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Compile metadata_dir/*_metadata.json into a snapshot file (written atomically)"""
+    metadata_dir = Path(metadata_dir)
+    output_path = Path(output_path) if output_path else metadata_dir / SNAPSHOT_FILENAME
+
+    buffers = {name: bytearray() for name in STRING_COLUMNS}
+    offsets = {name: array("Q", [0]) for name in STRING_COLUMNS}
+    ints = {name: array("I") for name in INT_COLUMNS}
+    decks: List[Dict[str, Any]] = []
+    sources: Dict[str, List[int]] = {}
+
+    rows = 0
+    for path in sorted(metadata_dir.glob("*_metadata.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        sources[path.name] = _source_signature(path)
+
+        deck_meta = data["deck_metadata"]
+        pdf_id = sanitize_id(deck_meta["filename"]) or path.stem
+        slides = data.get("slide_data", [])
+        decks.append({
+            "pdf_id": pdf_id,
+            "filename": deck_meta.get("filename", ""),
+            "company": deck_meta.get("company_name", ""),
+            "industry": deck_meta.get("deck_industry", ""),
+            "total_pages": deck_meta.get("total_pages", len(slides)),
+            "source": path.name,
+            "rows": [rows, rows + len(slides)],
+        })
+
+        for slide in slides:
+            row = _slide_row(pdf_id, deck_meta, slide)
+            for name in STRING_COLUMNS:
+                buffers[name] += row[name].encode("utf-8")
+                offsets[name].append(len(buffers[name]))
+            for name in INT_COLUMNS:
+                ints[name].append(row[name])
+            rows += 1
+
+    # Body layout: per string column, aligned offsets then data; int columns follow
+    columns: Dict[str, Dict[str, Any]] = {}
+    sections: List[Union[bytes, bytearray, array]] = []
+    position = 0
+
+    def place(section) -> int:
+        nonlocal position
+        start = _aligned(position)
+        sections.append(b"\0" * (start - position))
+        sections.append(section)
+        position = start + len(memoryview(section).cast("B"))
+        return start
+
+    for name in STRING_COLUMNS:
+        columns[name] = {
+            "kind": "str",
+            "offsets": place(offsets[name]),
+            "data": place(buffers[name]),
+            "nbytes": len(buffers[name]),
+        }
+    for name in INT_COLUMNS:
+        columns[name] = {"kind": "u32", "data": place(ints[name])}
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "built_at": datetime.now().isoformat(),
+        "source_dir": str(metadata_dir),
+        "rows": rows,
+        "columns": columns,
+        "decks": decks,
+        "sources": sources,
+    }, ensure_ascii=False).encode("utf-8")
+
+    preamble = MAGIC + struct.pack("<Q", len(header)) + header
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(preamble)
+        f.write(b"\0" * (_aligned(len(preamble)) - len(preamble)))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, output_path)
+
+    return {"path": str(output_path), "decks": len(decks), "rows": rows, "bytes": output_path.stat().st_size}
+
+
+class StringColumn:
+    """Read-only view of one string column inside a mapped snapshot"""
+
+    def __init__(self, mm: mmap.mmap, offsets: memoryview, start: int, nbytes: int):
+        self._mm = mm
+        self._offsets = offsets
+        self._start = start
+        self._end = start + nbytes
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        if row < 0:
+            row += len(self)
+        return self.raw(row).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def raw(self, row: int) -> bytes:
+        return self._mm[self._start + self._offsets[row]:self._start + self._offsets[row + 1]]
+
+    def _row_at(self, position: int) -> int:
+        return bisect_right(self._offsets, position - self._start) - 1
+
+    def rows_containing(self, text: str) -> List[int]:
+        """Rows whose value contains text (exact, byte-level substring)"""
+        needle = text.encode("utf-8")
+        if not needle:
+            return list(range(len(self)))
+        rows: List[int] = []
+        position = self._start
+        while True:
+            hit = self._mm.find(needle, position, self._end)
+            if hit < 0:
+                return rows
+            row = self._row_at(hit)
+            row_end = self._start + self._offsets[row + 1]
+            if hit + len(needle) <= row_end:
+                rows.append(row)
+                position = row_end
+            else:
+                position = hit + 1  # Match straddles two values
+
+    def rows_matching(self, pattern: str, flags: int = 0) -> List[int]:
+        """Rows whose value matches a regex (compiled as bytes; IGNORECASE is ASCII-only)"""
+        regex = re.compile(pattern.encode("utf-8"), flags)
+        rows: List[int] = []
+        for match in regex.finditer(self._mm, self._start, self._end):
+            row = self._row_at(match.start())
+            if rows and rows[-1] == row:
+                continue
+            if match.end() <= self._start + self._offsets[row + 1]:
+                rows.append(row)
+        return rows
+
+    def rows_equal(self, value: str) -> List[int]:
+        target = value.encode("utf-8")
+        return [row for row in range(len(self)) if self.raw(row) == target]
+
+    def value_counts(self) -> Counter:
+        return Counter(self.raw(row).decode("utf-8") for row in range(len(self)))
+
+
+class CorpusSnapshot:
+    """Memory-mapped snapshot; open with CorpusSnapshot.open(path)"""
+
+    def __init__(self, path: Path, handle, mm: mmap.mmap, header: Dict[str, Any], body: int):
+        self.path = path
+        self.header = header
+        self.rows: int = header["rows"]
+        self.decks: List[Dict[str, Any]] = header["decks"]
+        self._handle = handle
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._columns: Dict[str, Any] = {}
+
+        for name, spec in header["columns"].items():
+            if spec["kind"] == "str":
+                offsets_start = body + spec["offsets"]
+                offsets = self._view[offsets_start:offsets_start + 8 * (self.rows + 1)].cast("Q")
+                self._columns[name] = StringColumn(mm, offsets, body + spec["data"], spec["nbytes"])
+            else:
+                data_start = body + spec["data"]
+                self._columns[name] = self._view[data_start:data_start + 4 * self.rows].cast("I")
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "CorpusSnapshot":
+        path = Path(path)
+        handle = open(path, "rb")
+        try:
+            mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a DeckBot snapshot: {path}")
+            (header_len,) = struct.unpack_from("<Q", mm, len(MAGIC))
+            header_start = len(MAGIC) + 8
+            header = json.loads(mm[header_start:header_start + header_len].decode("utf-8"))
+            if header["version"] != FORMAT_VERSION or header["byteorder"] != sys.byteorder:
+                raise ValueError(f"Unsupported snapshot format in {path}; rebuild it")
+            return cls(path, handle, mm, header, _aligned(header_start + header_len))
+        except Exception:
+            handle.close()
+            raise
+
+    def close(self):
+        for column in self._columns.values():
+            if isinstance(column, StringColumn):
+                column._offsets.release()
+            else:
+                column.release()
+        self._columns.clear()
+        self._view.release()
+        self._mm.close()
+        self._handle.close()
+
+    def __enter__(self) -> "CorpusSnapshot":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> StringColumn:
+        return self._columns[name]
+
+    def slide_numbers(self) -> memoryview:
+        return self._columns["slide_number"]
+
+    def row(self, row: int) -> Dict[str, Any]:
+        record = {name: self._columns[name][row] for name in STRING_COLUMNS}
+        record["keywords"] = record["keywords"].split(KEYWORD_SEPARATOR) if record["keywords"] else []
+        record["slide_number"] = self._columns["slide_number"][row]
+        return record
+
+    def keywords(self, row: int) -> List[str]:
+        value = self._columns["keywords"][row]
+        return value.split(KEYWORD_SEPARATOR) if value else []
+
+    def keyword_counts(self) -> Counter:
+        column = self._columns["keywords"]
+        counts: Counter = Counter()
+        for row in range(self.rows):
+            raw = column.raw(row)
+            if raw:
+                counts.update(raw.decode("utf-8").split(KEYWORD_SEPARATOR))
+        return counts
+
+    def deck_of(self, row: int) -> Dict[str, Any]:
+        starts = [deck["rows"][0] for deck in self.decks]
+        return self.decks[bisect_right(starts, row) - 1]
+
+    def decks_mentioning(self, text: str, column: str = "content") -> List[str]:
+        """pdf_ids of decks with at least one slide containing text"""
+        pdf_ids = self._columns["pdf_id"]
+        return sorted({pdf_ids[row] for row in self._columns[column].rows_containing(text)})
+
+    def is_stale(self, metadata_dir: Optional[Path] = None) -> bool:
+        """True if metadata files were added, removed or changed since the build"""
+        metadata_dir = Path(metadata_dir or self.header["source_dir"])
+        current = {path.name: _source_signature(path) for path in metadata_dir.glob("*_metadata.json")}
+        return current != self.header["sources"]
+
+
+def load_or_build(metadata_dir: Path, snapshot_path: Optional[Path] = None) -> CorpusSnapshot:
+    """Open the snapshot for metadata_dir, rebuilding it first if missing or stale"""
+    snapshot_path = Path(snapshot_path) if snapshot_path else Path(metadata_dir) / SNAPSHOT_FILENAME
+    if snapshot_path.exists():
+        snapshot = CorpusSnapshot.open(snapshot_path)
+        if not snapshot.is_stale(metadata_dir):
+            return snapshot
+        snapshot.close()
+    build_snapshot(metadata_dir, snapshot_path)
+    return CorpusSnapshot.open(snapshot_path)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("""
+DeckBot Corpus Snapshot
+
+Usage:
+  python deckbot_snapshot.py build <metadata_dir> [snapshot_path]
+  python deckbot_snapshot.py stats <snapshot_path>
+  python deckbot_snapshot.py grep <snapshot_path> <text> [column]
+  python deckbot_snapshot.py keywords <snapshot_path> [top_n]
+
+Default snapshot path: <metadata_dir>/deckbot_corpus.snapshot
+        """)
+        return 1
+
+    command = sys.argv[1]
+
+    if command == "build":
+        metadata_dir = Path(sys.argv[2])
+        if not metadata_dir.is_dir():
+            print(f"❌ Error: Directory not found: {metadata_dir}")
+            return 1
+        start = time.perf_counter()
+        result = build_snapshot(metadata_dir, Path(sys.argv[3]) if len(sys.argv) > 3 else None)
+        elapsed = time.perf_counter() - start
+        print(f"✅ Snapshot built: {result['path']}")
+        print(f"   Decks: {result['decks']}, slides: {result['rows']}, "
+              f"size: {result['bytes'] / 1024 / 1024:.2f} MB, {elapsed * 1000:.0f}ms")
+        return 0
+
+    snapshot_path = Path(sys.argv[2])
+    if not snapshot_path.exists():
+        print(f"❌ Error: Snapshot not found: {snapshot_path}")
+        return 1
+
+    start = time.perf_counter()
+    with CorpusSnapshot.open(snapshot_path) as snapshot:
+        open_ms = (time.perf_counter() - start) * 1000
+
+        if command == "stats":
+            print(f"📦 {snapshot_path} (built {snapshot.header['built_at']}, opened in {open_ms:.2f}ms)")
+            print(f"   Decks: {len(snapshot.decks)}, slides: {snapshot.rows}")
+            for name, counts in (("Companies", snapshot.column("company").value_counts()),
+                                 ("Industries", snapshot.column("industry").value_counts())):
+                print(f"   {name}: {len(counts)}")
+            print(f"   Unique keywords: {len(snapshot.keyword_counts())}")
+            if snapshot.is_stale():
+                print("   ⚠️  Snapshot is stale; rebuild with: python deckbot_snapshot.py build "
+                      f"{snapshot.header['source_dir']}")
+
+        elif command == "grep" and len(sys.argv) > 3:
+            column = sys.argv[4] if len(sys.argv) > 4 else "content"
+            start = time.perf_counter()
+            rows = snapshot.column(column).rows_containing(sys.argv[3])
+            scan_ms = (time.perf_counter() - start) * 1000
+            ids = snapshot.column("id")
+            pdf_ids = {snapshot.column("pdf_id")[row] for row in rows}
+            print(f"🔍 '{sys.argv[3]}' in {column}: {len(rows)} slides across {len(pdf_ids)} decks ({scan_ms:.2f}ms)")
+            for row in rows[:20]:
+                print(f"   {ids[row]}")
+            if len(rows) > 20:
+                print(f"   ... and {len(rows) - 20} more")
+
+        elif command == "keywords":
+            top_n = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+            for keyword, count in snapshot.keyword_counts().most_common(top_n):
+                print(f"   {count:>6}  {keyword}")
+
+        else:
+            print(f"❌ Unknown command: {command}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Synthetic DeckBot Corpus Generator
+Creates realistic *_metadata.json files for ingestion benchmarks
+
+- Same schema the TypeScript extractor writes (deck_metadata + slide_data)
+- Korean slide text built from templates and the real keyword vocabulary
+  in deckbot-metadata.json
+- Log-normal slide counts (median ~35, long tail to 150) like real decks
+- A share of boilerplate slides (agency intro, dividers) per deck
+- Deterministic for a given seed
+
+Usage:
+    python deckbot_synthetic_corpus.py <output_dir> <num_decks> [seed] [vocabulary_json]
+"""
+
+import json
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Configuration
+DEFAULT_VOCABULARY = Path(__file__).resolve().parent.parent / "deckbot-metadata.json"
+MEDIAN_SLIDES = 35
+SLIDE_SIGMA = 0.55
+MIN_SLIDES = 5
+MAX_SLIDES = 150
+BOILERPLATE_RATE = 0.08  # Share of slides that are intro/divider boilerplate
+
+FALLBACK_VOCABULARY = {
+    "companies": ["테스트 보험사", "카카오페이지", "COWAY"],
+    "industries": ["보험", "콘텐츠", "가구-가정용"],
+    "keywords": ["브랜드 인지도", "유튜버 협업", "SNS 캠페인", "1020 타겟", "오프라인 체험존"],
+}
+
+LAYOUTS = [
+    "타이틀 슬라이드, 중앙 정렬 제목과 부제, 배경 이미지 포함",
+    "2열 레이아웃, 좌측에 목표와 예산, 우측에 주요 전략 불릿 포인트",
+    "4단계 수평 타임라인, 각 분기별 주요 활동 표시",
+    "막대 그래프 중심, 하단에 핵심 수치 요약",
+    "3개 카드형 레이아웃, 크리에이티브 아이디어 비교",
+    "표 형식, 매체별 예산 배분과 KPI",
+]
+
+BOILERPLATE_SLIDES = [
+    ("TBWA Intro", "TBWA KOREA 회사 소개 Disruption 크리에이티브 에이전시 주요 클라이언트 수상 내역"),
+    ("섹션 구분", "Chapter 02 Campaign Strategy"),
+    ("Thank You", "감사합니다 Thank you Q&A"),
+]
+
+CONTENT_TEMPLATES = [
+    "{kw1} 관점에서 {company}의 현재 위치를 진단하고 {kw2} 중심의 개선 방향을 제시합니다.",
+    "핵심 목표: {kw1} {pct}% 향상, {kw2} 기반 신규 고객 {num}명 확보",
+    "{industry} 시장은 최근 {kw1} 트렌드가 확산되며 {kw2}의 중요성이 커지고 있습니다.",
+    "주요 전략: 1. {kw1} 2. {kw2} 3. {kw3} 예산: 총 {num}억원",
+    "{quarter}분기에는 {kw1} 캠페인을 집행하고 {kw2} 성과를 주간 단위로 측정합니다.",
+    "타겟 인사이트: {kw1}에 민감한 소비자는 {kw2} 메시지에 {pct}% 더 높은 반응을 보였습니다.",
+]
+
+SUMMARY_TEMPLATES = [
+    "{company}의 {kw1} 전략과 {kw2} 실행 계획을 요약한 슬라이드",
+    "{kw1}와 {kw2}를 결합한 {industry} 캠페인 방향 제시",
+    "{kw1} 성과 지표와 {kw2} 개선 목표를 정리",
+]
+
+
+def load_vocabulary(path: Path) -> Dict[str, List[str]]:
+    """Load companies/industries/keywords from a deckbot-metadata.json export"""
+    if not path.exists():
+        print(f"⚠️  Vocabulary not found at {path}, using built-in fallback")
+        return FALLBACK_VOCABULARY
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    return {
+        "companies": data.get("companies") or FALLBACK_VOCABULARY["companies"],
+        "industries": data.get("industries") or FALLBACK_VOCABULARY["industries"],
+        "keywords": data.get("keywords") or FALLBACK_VOCABULARY["keywords"],
+    }
+
+
+def sample_slide_count(rng: random.Random) -> int:
+    count = int(round(rng.lognormvariate(math.log(MEDIAN_SLIDES), SLIDE_SIGMA)))
+    return max(MIN_SLIDES, min(MAX_SLIDES, count))
+
+
+def _fill(template: str, rng: random.Random, keywords: List[str], company: str, industry: str) -> str:
+    return template.format(
+        kw1=keywords[0], kw2=keywords[1 % len(keywords)], kw3=keywords[2 % len(keywords)],
+        company=company, industry=industry,
+        pct=rng.randint(5, 60), num=rng.randint(2, 500) * 100, quarter=rng.randint(1, 4)
+    )
+
+
+def generate_slide(
+    rng: random.Random,
+    slide_number: int,
+    deck_keywords: List[str],
+    company: str,
+    industry: str,
+    image_prefix: str
+) -> Dict[str, Any]:
+    if slide_number > 1 and rng.random() < BOILERPLATE_RATE:
+        layout, content = rng.choice(BOILERPLATE_SLIDES)
+        return {
+            "slide_number": slide_number,
+            "slide_content": content,
+            "slide_summary": f"{layout} 슬라이드",
+            "keywords": [layout],
+            "slide_layout": layout,
+            "image_url": f"{image_prefix}/slide-{slide_number}.png",
+        }
+
+    keywords = rng.sample(deck_keywords, k=min(len(deck_keywords), rng.randint(3, 5)))
+    sentences = [
+        _fill(rng.choice(CONTENT_TEMPLATES), rng, rng.sample(keywords, len(keywords)), company, industry)
+        for _ in range(rng.randint(1, 6))
+    ]
+    return {
+        "slide_number": slide_number,
+        "slide_content": " ".join(sentences),
+        "slide_summary": _fill(rng.choice(SUMMARY_TEMPLATES), rng, keywords, company, industry),
+        "keywords": keywords,
+        "slide_layout": rng.choice(LAYOUTS),
+        "image_url": f"{image_prefix}/slide-{slide_number}.png",
+    }
+
+
+def generate_deck(rng: random.Random, deck_number: int, vocabulary: Dict[str, List[str]]) -> Dict[str, Any]:
+    company = rng.choice(vocabulary["companies"])
+    industry = rng.choice(vocabulary["industries"])
+    total_pages = sample_slide_count(rng)
+    # Decks draw slide keywords from a deck-level topic pool, like real proposals
+    deck_keywords = rng.sample(vocabulary["keywords"], k=min(len(vocabulary["keywords"]), 40))
+
+    filename = f"synthetic_deck_{deck_number:05d}.pdf"
+    image_prefix = f"./images/synthetic_deck_{deck_number:05d}"
+    created = datetime(2023, 1, 1) + timedelta(days=rng.randint(0, 900))
+
+    return {
+        "deck_metadata": {
+            "filename": filename,
+            "deck_industry": industry,
+            "company_name": company,
+            "executive_summary": _fill(
+                "{company}의 {industry} 마케팅 제안서입니다. {kw1}와 {kw2}를 중심으로 "
+                "{kw3} 크리에이티브를 결합해 브랜드 인지도 {pct}% 향상을 목표로 합니다.",
+                rng, rng.sample(deck_keywords, 3), company, industry
+            ),
+            "total_pages": total_pages,
+            "created_date": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+        "slide_data": [
+            generate_slide(rng, n, deck_keywords, company, industry, image_prefix)
+            for n in range(1, total_pages + 1)
+        ],
+    }
+
+
+def generate_corpus(
+    output_dir: Path,
+    num_decks: int,
+    seed: int = 42,
+    vocabulary_path: Path = DEFAULT_VOCABULARY
+) -> List[Path]:
+    """Write num_decks synthetic *_metadata.json files and return their paths"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    vocabulary = load_vocabulary(vocabulary_path)
+    rng = random.Random(seed)
+
+    paths = []
+    for deck_number in range(1, num_decks + 1):
+        deck = generate_deck(rng, deck_number, vocabulary)
+        path = output_dir / f"synthetic_deck_{deck_number:05d}_metadata.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(deck, f, ensure_ascii=False)
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    """CLI interface"""
+    if len(sys.argv) < 3:
+        print("""
+Usage:
+  python deckbot_synthetic_corpus.py <output_dir> <num_decks> [seed] [vocabulary_json]
+
+Example:
+  python deckbot_synthetic_corpus.py /tmp/synthetic_4000 4000
+        """)
+        return 1
+
+    output_dir = Path(sys.argv[1])
+    num_decks = int(sys.argv[2])
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    vocabulary_path = Path(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_VOCABULARY
+
+    paths = generate_corpus(output_dir, num_decks, seed, vocabulary_path)
+    total_slides = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            total_slides += len(json.load(f)["slide_data"])
+
+    print(f"✅ Generated {len(paths)} decks ({total_slides} slides) in {output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
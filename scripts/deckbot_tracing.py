@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+DeckBot Search Tracing
+Opt-in per-stage spans for cascading_search with local trace export
+
+- Spans use monotonic clocks (perf_counter_ns) and carry payload sizes
+- Chrome trace-event format (open in chrome://tracing or Perfetto) or
+  OTLP-JSON (one ExportTraceServiceRequest per line)
+- Summary command prints p50/p95/p99 per stage over a trace file
+
+Enable with DECKBOT_TRACE_FILE=<path> (and optionally DECKBOT_TRACE_FORMAT=otlp),
+or pass a Tracer to DeckBotIndexManager. When disabled, spans are no-ops.
+
+Usage:
+    python deckbot_tracing.py summary <trace_file>
+"""
+
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from deckbot_metrics import percentile
+
+# Configuration
+TRACE_FORMATS = ("chrome", "otlp")
+SERVICE_NAME = "deckbot-search"
+MAX_IN_MEMORY_TRACES = 1000  # Bounded so long-running services don't grow
+
+
+class Span:
+    """A timed stage; attributes can be attached while it runs"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attrs")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attrs: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = 0
+        self.attrs = dict(attrs)
+
+    def set(self, **attrs: Any):
+        self.attrs.update(attrs)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _NullSpan:
+    """Shared no-op span returned when tracing is disabled"""
+
+    def set(self, **attrs: Any):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects spans per trace (one trace per query) and appends completed
+    traces to a local file. Thread-safe; each thread has its own span stack.
+    """
+
+    def __init__(self, path: Optional[Path] = None, fmt: str = "chrome", keep_in_memory: bool = False):
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {fmt} (expected one of {TRACE_FORMATS})")
+        self.path = Path(path) if path else None
+        self.fmt = fmt
+        self.keep_in_memory = keep_in_memory
+        self.completed: deque = deque(maxlen=MAX_IN_MEMORY_TRACES)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        # Anchor monotonic timestamps to wall-clock microseconds for the viewer
+        self._epoch_us = time.time_ns() // 1000 - time.perf_counter_ns() // 1000
+        self._pid = os.getpid()
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        path = os.environ.get("DECKBOT_TRACE_FILE")
+        return cls(path, os.environ.get("DECKBOT_TRACE_FORMAT", "chrome"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None or self.keep_in_memory
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+            self._local.spans = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Any]:
+        """Time a stage; the outermost span on a thread starts a new trace"""
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        stack = self._stack()
+        if stack:
+            span = Span(name, stack[-1].trace_id, stack[-1].span_id, attrs)
+        else:
+            span = Span(name, secrets.token_hex(16), None, attrs)
+            self._local.spans = []
+
+        stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.set(error=str(e))
+            raise
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            stack.pop()
+            self._local.spans.append(span)
+            if not stack:
+                self._finish(self._local.spans)
+
+    # A trace is just the root span; kept as an alias for readability at call sites
+    trace = span
+
+    def last_trace(self) -> List[Span]:
+        """Spans of the most recently completed trace on this thread"""
+        self._stack()
+        return list(self._local.spans)
+
+    def _finish(self, spans: List[Span]):
+        if self.keep_in_memory:
+            self.completed.append(list(spans))
+        if self.path is None:
+            return
+
+        if self.fmt == "chrome":
+            payload = "".join(
+                json.dumps(self._chrome_event(span), ensure_ascii=False, default=str) + ",\n"
+                for span in spans
+            )
+        else:
+            payload = json.dumps(self._otlp_request(spans), ensure_ascii=False, default=str) + "\n"
+
+        with self._write_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not self.path.exists() or self.path.stat().st_size == 0
+            with open(self.path, "a", encoding="utf-8") as f:
+                # Chrome's JSON array format tolerates a missing closing bracket,
+                # which lets us append events without rewriting the file
+                if is_new and self.fmt == "chrome":
+                    f.write("[\n")
+                f.write(payload)
+
+    def _chrome_event(self, span: Span) -> Dict[str, Any]:
+        args = dict(span.attrs)
+        args.update(trace_id=span.trace_id, span_id=span.span_id, parent_id=span.parent_id)
+        return {
+            "name": span.name,
+            "cat": "deckbot",
+            "ph": "X",
+            "ts": self._epoch_us + span.start_ns // 1000,
+            "dur": (span.end_ns - span.start_ns) / 1000,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+
+    def _otlp_request(self, spans: List[Span]) -> Dict[str, Any]:
+        def attribute(key: str, value: Any) -> Dict[str, Any]:
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str((self._epoch_us * 1000) + span.start_ns),
+                "endTimeUnixNano": str((self._epoch_us * 1000) + span.end_ns),
+                "attributes": [attribute(k, v) for k, v in span.attrs.items()],
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{"scope": {"name": "deckbot_tracing"}, "spans": otlp_spans}],
+            }]
+        }
+
+
+def hits_bytes(hits: Any) -> int:
+    """UTF-8 size of the content carried by search hits or rerank documents"""
+    total = 0
+    for hit in hits:
+        fields = hit.get("fields", hit) if isinstance(hit, dict) else hit["fields"]
+        total += len(str(fields.get("content", "")).encode("utf-8"))
+    return total
+
+
+# ============================================================================
+# Trace file analysis
+# ============================================================================
+
+def load_stage_durations(trace_path: Path) -> Dict[str, List[float]]:
+    """Read a Chrome or OTLP-JSON trace file into {stage: [duration_ms, ...]}"""
+    with open(trace_path, "r", encoding="utf-8") as f:
+        text = f.read().strip()
+
+    durations: Dict[str, List[float]] = {}
+
+    if text.startswith("["):
+        # Chrome trace-event array, possibly unterminated with a trailing comma
+        body = text.rstrip().rstrip(",")
+        if not body.endswith("]"):
+            body += "]"
+        for event in json.loads(body):
+            if event.get("ph") == "X":
+                durations.setdefault(event["name"], []).append(event["dur"] / 1000.0)
+        return durations
+
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        for resource_spans in request.get("resourceSpans", []):
+            for scope_spans in resource_spans.get("scopeSpans", []):
+                for span in scope_spans.get("spans", []):
+                    duration_ns = int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])
+                    durations.setdefault(span["name"], []).append(duration_ns / 1e6)
+    return durations
+
+
+def summarize(trace_path: Path) -> List[Dict[str, Any]]:
+    """Per-stage latency percentiles, slowest p95 first"""
+    rows = []
+    for stage, values in load_stage_durations(trace_path).items():
+        rows.append({
+            "stage": stage,
+            "count": len(values),
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "mean_ms": sum(values) / len(values),
+        })
+    return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+
+def print_summary(trace_path: Path):
+    rows = summarize(trace_path)
+    print(f"\n⏱️  Stage Latency Summary: {trace_path}")
+    print("=" * 78)
+    print(f"   {'Stage':<22} {'Count':>7} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'mean ms':>10}")
+    print("   " + "-" * 72)
+    for row in rows:
+        print(f"   {row['stage']:<22} {row['count']:>7} {row['p50_ms']:>10.1f} "
+              f"{row['p95_ms']:>10.1f} {row['p99_ms']:>10.1f} {row['mean_ms']:>10.1f}")
+
+
+def main():
+    """CLI interface"""
+    if len(sys.argv) < 3 or sys.argv[1] != "summary":
+        print("""
+DeckBot Search Tracing
+
+Usage:
+  python deckbot_tracing.py summary <trace_file>
+
+Record traces:
+  DECKBOT_TRACE_FILE=logs/search-trace.json python deckbot_unified_index.py search "유튜버 협업 마케팅"
+  DECKBOT_TRACE_FORMAT=otlp DECKBOT_TRACE_FILE=logs/search-trace.otlp.jsonl ...
+        """)
+        return 1
+
+    trace_path = Path(sys.argv[2])
+    if not trace_path.exists():
+        print(f"❌ Error: File not found: {trace_path}")
+        return 1
+
+    print_summary(trace_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,22 +4,158 @@ DeckBot Unified Index Architecture
 Single index approach for 400 PDFs with cascading retrieval
 """
 
-import os
 import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from pinecone import Pinecone
+from types import SimpleNamespace
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+from deckbot_chunking import CHUNK_MAX_CHARS, collapse_chunks, expand_slide_records
+from deckbot_dedup import REPORT_FILENAME, STORE_FILENAME, SlideDeduplicator, collapse_near_duplicates
+from deckbot_generations import IndexAliases
+from deckbot_ingest_policy import IngestionPolicy
+from deckbot_keywords import KeywordCanonicalizer, keyword_list, with_keyword_filter
+from deckbot_metrics import (
+    BATCH_SECONDS, BYTES_SENT_TOTAL, RECORDS_TOTAL, get_logger, payload_bytes, record_throughput
+)
+from deckbot_pinecone_client import create_pinecone_client
+from deckbot_rerank_cache import RerankCache
+from deckbot_results import STAGE_FUSED, STAGE_RERANKED, SearchResult
+from deckbot_singleflight import SingleFlight, make_query_key
+from deckbot_tracing import Tracer, hits_bytes
+from deckbot_warmup import QueryLog, ResultCache
 
 # Configuration
 DENSE_INDEX_NAME = "deckbot-dense-korean"
 SPARSE_INDEX_NAME = "deckbot-sparse-korean"
 GLOBAL_NAMESPACE = "global"
+MAX_BATCH_SIZE = 96  # Pinecone integrated embedding limit per upsert
+RERANK_MODEL = "bge-reranker-v2-m3"
+FUSION_METHODS = ("average", "rrf")
+RRF_K = 60  # Reciprocal rank fusion damping constant
+SEARCH_MANY_CONCURRENCY = 8  # Queries retrieving (dense + sparse) at once in search_many
+SEARCH_MANY_RERANK_CONCURRENCY = 4  # Rerank calls in flight at once in search_many
+DELETE_BATCH_SIZE = 1000  # Pinecone delete-by-ID limit
+GC_CONCURRENCY = 8  # list/delete calls in flight at once when removing stale slides
+
+# What follows "{pdf_id}_slide_" in slide and chunk record IDs
+SLIDE_ID_SUFFIX = re.compile(r"\d{3}(_chunk_\d{2})?")
+
+log = get_logger("deckbot_unified_index")
+
+
+def _silent(*args: Any, **kwargs: Any):
+    """print() replacement for non-verbose calls"""
+
 
 class DeckBotIndexManager:
     """Manages unified Pinecone index architecture for DeckBot"""
 
-    def __init__(self, api_key: Optional[str] = None):
-        self.pc = Pinecone(api_key=api_key or os.environ.get("PINECONE_API_KEY"))
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        tracer: Optional[Tracer] = None,
+        client: Optional[Any] = None,
+        upstream_limits: Optional[Dict[str, Any]] = None,
+        coalesce: bool = True,
+        deduplicator: Optional[SlideDeduplicator] = None,
+        collapse_duplicates: bool = True,
+        ingest_policy: Optional[IngestionPolicy] = None,
+        keyword_index: Optional[KeywordCanonicalizer] = None,
+        chunk_max_chars: int = CHUNK_MAX_CHARS,
+        rerank_cache: Optional[RerankCache] = None,
+        cache_reranks: bool = True,
+        result_cache: Optional[ResultCache] = None,
+        query_log: Optional[QueryLog] = None,
+        generation: Optional[str] = None,
+        aliases: Optional[IndexAliases] = None
+    ):
+        # client: any object with the Pinecone SDK surface (e.g. a recorded-response stub);
+        # otherwise the SDK, or the local stand-in when DECKBOT_PINECONE_URL is set,
+        # created on first use so local-only work never pays for it
+        self._client = client
+        self._api_key = api_key
+        self._client_lock = threading.Lock()
+        # Opt-in stage tracing (DECKBOT_TRACE_FILE); no-op spans when disabled
+        self.tracer = tracer or Tracer.from_env()
+        # Optional per-upstream semaphores ("dense", "sparse", "rerank") that
+        # bound concurrent calls when the manager is shared across threads
+        self.upstream_limits = upstream_limits or {}
+        self._index_handles: Dict[str, Any] = {}
+        # Concurrent identical searches (same thread pool / service) share one pipeline
+        self.single_flight = SingleFlight("cascading_search") if coalesce else None
+        # Drop near-duplicate/boilerplate slides at ingest (opt-in), and collapse
+        # near-duplicate candidates before rerank (on by default)
+        self.deduplicator = deduplicator
+        self.collapse_duplicates = collapse_duplicates
+        # Which slides get embedded at all (layout/length rules, DECKBOT_INGEST_POLICY)
+        self.ingest_policy = ingest_policy or IngestionPolicy.from_env()
+        # Keyword variants → canonical keyword_ids (DECKBOT_KEYWORD_INDEX), for filters;
+        # loaded on first use, so plain searches never read it
+        self._keyword_index = keyword_index
+        # Slides with more OCR text than this become summary + chunk records (0 = off)
+        self.chunk_max_chars = chunk_max_chars
+        # Rerank scores per (query, content) pair; only misses are sent to the reranker
+        self.rerank_cache = (rerank_cache or RerankCache.from_env()) if cache_reranks else None
+        # Results prefetched by deckbot_warmup for popular searches (None until warmed up)
+        self.result_cache = result_cache
+        # Searches appended as NDJSON for warm-up prefetch (DECKBOT_QUERY_LOG)
+        self.query_log = query_log or QueryLog.from_env()
+        # Logical index names resolve through the alias file (DECKBOT_INDEX_ALIASES) to the
+        # active generation at query time; a pinned generation (building/validating) never moves
+        self.aliases = aliases or IndexAliases.from_env()
+        self.generation = generation
+        self._serving_generation = generation or self.aliases.current()
+
+    @property
+    def pc(self) -> Any:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = create_pinecone_client(self._api_key)
+        return self._client
+
+    @pc.setter
+    def pc(self, client: Any):
+        self._client = client
+        self._index_handles.clear()
+
+    @property
+    def keyword_index(self) -> KeywordCanonicalizer:
+        if self._keyword_index is None:
+            with self._client_lock:
+                if self._keyword_index is None:
+                    self._keyword_index = KeywordCanonicalizer.from_env()
+        return self._keyword_index
+
+    def index_name(self, name: str) -> str:
+        """Physical index currently behind a logical name (DENSE_INDEX_NAME / SPARSE_INDEX_NAME)"""
+        if self.generation is not None:
+            return self.aliases.physical(name, self.generation)
+        generation = self.aliases.current()
+        if generation != self._serving_generation:
+            # Promoted or rolled back: prefetched results came from the other generation
+            log.info(f"Index generation switched: {self._serving_generation} → {generation}")
+            self._serving_generation = generation
+            if self.result_cache is not None:
+                self.result_cache.clear()
+        return self.aliases.physical(name, generation)
+
+    def _index(self, name: str) -> Any:
+        """Reuse one index handle per index so its connection pool stays warm"""
+        name = self.index_name(name)
+        handle = self._index_handles.get(name)
+        if handle is None:
+            handle = self._index_handles[name] = self.pc.Index(name)
+        return handle
+
+    def _upstream(self, name: str):
+        """Context manager holding the concurrency slot for an upstream, if bounded"""
+        return self.upstream_limits.get(name) or nullcontext()
 
     def setup_indexes(self):
         """Create dense and sparse indexes if they don't exist"""
@@ -55,36 +191,166 @@ class DeckBotIndexManager:
 
         print("\n✅ Index setup complete!")
 
-    def ingest_pdf_metadata(self, metadata_path: str, namespace: Optional[str] = None):
+    def ingest_pdf_metadata(self, metadata_path: str, namespace: Optional[str] = None, replace: bool = False):
         """
         Ingest a single PDF's metadata JSON
 
         Args:
             metadata_path: Path to *_metadata.json file
             namespace: Optional namespace (defaults to doc:{pdf_id})
+            replace: After upserting, delete this deck's slide/chunk records that
+                the new version no longer has (deck shrank, slides now excluded)
         """
-        print(f"\n📥 Ingesting: {metadata_path}")
+        log.info(f"\n📥 Ingesting: {metadata_path}", path=str(metadata_path))
 
         # Load metadata
         with open(metadata_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
-        # Extract document info
         deck_meta = data['deck_metadata']
-        slides = data['slide_data']
-
-        # Generate document ID from filename
-        pdf_filename = deck_meta['filename']
-        doc_id = Path(pdf_filename).stem
+        doc_id, records, skipped = self.build_records(data)
 
         # Set namespace
         if namespace is None:
             namespace = f"doc:{doc_id}"
 
-        print(f"   Document ID: {doc_id}")
-        print(f"   Namespace: {namespace}")
-        print(f"   Industry: {deck_meta.get('deck_industry', 'N/A')}")
-        print(f"   Company: {deck_meta.get('company_name', 'N/A')}")
+        log.info(f"   Document ID: {doc_id}")
+        log.info(f"   Namespace: {namespace}")
+        log.info(f"   Industry: {deck_meta.get('deck_industry', 'N/A')}")
+        log.info(f"   Company: {deck_meta.get('company_name', 'N/A')}")
+        if skipped:
+            log.info(f"   🧾 Skipped {skipped} slides by ingestion policy", doc_id=doc_id, skipped=skipped)
+
+        # Upsert to both indexes and namespaces
+        dense_index = self._index(DENSE_INDEX_NAME)
+        sparse_index = self._index(SPARSE_INDEX_NAME)
+
+        size = payload_bytes(records)
+        log.info(f"   Upserting {len(records)} records...", doc_id=doc_id, records=len(records), bytes=size)
+
+        # Upsert to document-specific namespace, and also to the global
+        # namespace for cross-document search. Decks longer than 95 slides
+        # exceed the per-call embedding limit, so upsert in batches.
+        batches = [records[i:i + MAX_BATCH_SIZE] for i in range(0, len(records), MAX_BATCH_SIZE)]
+        for target_namespace in (namespace, GLOBAL_NAMESPACE):
+            for index_name, index in ((DENSE_INDEX_NAME, dense_index), (SPARSE_INDEX_NAME, sparse_index)):
+                for batch in batches:
+                    with BATCH_SECONDS.time(index=index_name):
+                        index.upsert_records(records=batch, namespace=target_namespace)
+                BYTES_SENT_TOTAL.inc(size, index=index_name)
+
+        RECORDS_TOTAL.inc(len(records), stage="ingest")
+        self.keyword_index.save_if_changed()
+        if replace:
+            # Upsert first, delete after: current slides never go missing from search
+            stale = self.stale_slide_ids(doc_id, {record["_id"] for record in records}, namespace)
+            deleted = self.delete_ids(stale)
+            if deleted:
+                log.info(f"   🗑️  Deleted {deleted} stale records", doc_id=doc_id, deleted=deleted)
+        if self.result_cache is not None:
+            self.result_cache.clear()  # Prefetched results no longer reflect the index
+        log.info(f"   ✅ Ingested to namespaces: {namespace}, {GLOBAL_NAMESPACE}",
+                 doc_id=doc_id, namespaces=[namespace, GLOBAL_NAMESPACE])
+
+        return doc_id
+
+    def stale_slide_ids(self, doc_id: str, keep_ids: Iterable[str],
+                        namespace: Optional[str] = None) -> Dict[Tuple[str, str], List[str]]:
+        """
+        (index, namespace) → this deck's slide/chunk record IDs not in keep_ids,
+        across all four upsert targets (listed concurrently by ID prefix)
+        """
+        prefix = f"{doc_id}_slide_"
+        keep = set(keep_ids)
+        namespace = namespace or f"doc:{doc_id}"
+
+        def stale(target: Tuple[str, str]) -> List[str]:
+            index_name, target_namespace = target
+            return [
+                record_id
+                for page in self._index(index_name).list(prefix=prefix, namespace=target_namespace)
+                for record_id in page
+                # The prefix alone would also match a deck named "{doc_id}_slide_x"
+                if record_id not in keep and SLIDE_ID_SUFFIX.fullmatch(record_id[len(prefix):])
+            ]
+
+        targets = [(index_name, target_namespace)
+                   for index_name in (DENSE_INDEX_NAME, SPARSE_INDEX_NAME)
+                   for target_namespace in (namespace, GLOBAL_NAMESPACE)]
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="stale-list") as pool:
+            found = dict(zip(targets, pool.map(stale, targets)))
+        return {target: sorted(ids) for target, ids in found.items() if ids}
+
+    def delete_ids(self, ids_by_target: Dict[Tuple[str, str], List[str]], concurrency: int = GC_CONCURRENCY) -> int:
+        """Delete record IDs per (index, namespace) in concurrent batched calls; returns the count"""
+        calls = [
+            (index_name, namespace, ids[start:start + DELETE_BATCH_SIZE])
+            for (index_name, namespace), ids in ids_by_target.items()
+            for start in range(0, len(ids), DELETE_BATCH_SIZE)
+        ]
+        if not calls:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(calls)), thread_name_prefix="delete") as pool:
+            futures = [pool.submit(self._index(index_name).delete, ids=batch, namespace=namespace)
+                       for index_name, namespace, batch in calls]
+            for future in futures:
+                future.result()
+        deleted = sum(len(batch) for _, _, batch in calls)
+        RECORDS_TOTAL.inc(deleted, stage="delete")
+        if self.result_cache is not None:
+            self.result_cache.clear()
+        return deleted
+
+    def sweep_stale_slides(self, output_dir: str = "/Users/kjyoo/DeckBot/output",
+                           dry_run: bool = False) -> Dict[str, int]:
+        """
+        Corpus-wide garbage collection: for every *_metadata.json, delete indexed
+        slide/chunk records its current version would not produce. Decks with no
+        metadata file left are not touched (see deckbot_reconcile.py --prune-namespaces).
+        """
+        output_path = Path(output_dir)
+        metadata_files = sorted(output_path.glob("*_metadata.json"))
+        if self.deduplicator is not None and self.deduplicator.store_path is None:
+            self.deduplicator.use_store(output_path / STORE_FILENAME)
+
+        def deck_stale(metadata_file: Path) -> Tuple[str, Dict[Tuple[str, str], List[str]]]:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            doc_id, records, _ = self.build_records(data)
+            return doc_id, self.stale_slide_ids(doc_id, [record["_id"] for record in records])
+
+        print(f"\n🧹 Sweeping stale slides for {len(metadata_files)} decks{' (dry run)' if dry_run else ''}")
+        totals = {"decks": len(metadata_files), "decks_with_stale": 0, "stale": 0, "deleted": 0}
+        # Each deck lists its four targets on its own small pool; this bounds decks in flight
+        # (the deduplicator's report is not thread-safe, so dedup sweeps go one deck at a time)
+        workers = 1 if self.deduplicator is not None else max(1, GC_CONCURRENCY // 4)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sweep") as pool:
+            for doc_id, stale in pool.map(deck_stale, metadata_files):
+                if not stale:
+                    continue
+                count = sum(len(ids) for ids in stale.values())
+                totals["decks_with_stale"] += 1
+                totals["stale"] += count
+                print(f"   {doc_id}: {count} stale records in {len(stale)} targets")
+                if not dry_run:
+                    totals["deleted"] += self.delete_ids(stale)
+        return totals
+
+    def build_records(self, data: Dict, register_keywords: bool = True) -> Tuple[str, List[Dict], int]:
+        """
+        Records ingest upserts for one metadata JSON (ingestion policy, dedup,
+        chunking applied); returns (doc_id, records, slides skipped by policy).
+        register_keywords=False leaves the keyword index untouched (unknown
+        keywords get no keyword_id), for read-only comparisons
+        """
+        # Extract document info
+        deck_meta = data['deck_metadata']
+        slides = self.ingest_policy.filter_slides(data['slide_data'])
+        skipped = len(data['slide_data']) - len(slides)
+
+        # Generate document ID from filename
+        pdf_filename = deck_meta['filename']
+        doc_id = Path(pdf_filename).stem
 
         # Prepare records
         records = []
@@ -114,29 +380,22 @@ class DeckBotIndexManager:
                 "company": deck_meta.get('company_name', ''),
                 "industry": deck_meta.get('deck_industry', ''),
                 "slide_number": slide['slide_number'],
-                "keywords": ", ".join(slide.get('keywords', [])),
+                "keywords": keyword_list(slide.get('keywords', [])),
+                "keyword_ids": self.keyword_index.keyword_ids(slide.get('keywords', []), register_keywords),
                 "layout": slide.get('slide_layout', ''),
                 "image_url": slide.get('image_url', '')
             }
             records.append(slide_record)
 
-        # Upsert to both indexes and namespaces
-        dense_index = self.pc.Index(DENSE_INDEX_NAME)
-        sparse_index = self.pc.Index(SPARSE_INDEX_NAME)
-
-        print(f"   Upserting {len(records)} records...")
-
-        # Upsert to document-specific namespace
-        dense_index.upsert_records(records=records, namespace=namespace)
-        sparse_index.upsert_records(records=records, namespace=namespace)
+        if self.deduplicator is not None:
+            before = len(records)
+            records = self.deduplicator.filter_records(doc_id, records)
+            if before > len(records):
+                log.info(f"   🧹 Dropped {before - len(records)} duplicate/boilerplate slides",
+                         doc_id=doc_id, dropped=before - len(records))
 
-        # Also upsert to global namespace for cross-document search
-        dense_index.upsert_records(records=records, namespace=GLOBAL_NAMESPACE)
-        sparse_index.upsert_records(records=records, namespace=GLOBAL_NAMESPACE)
-
-        print(f"   ✅ Ingested to namespaces: {namespace}, {GLOBAL_NAMESPACE}")
-
-        return doc_id
+        records = expand_slide_records(records, slides, self._build_slide_content, self.chunk_max_chars)
+        return doc_id, records, skipped
 
     def _build_deck_content(self, deck_meta: Dict) -> str:
         """Build searchable content from deck metadata"""
@@ -157,12 +416,13 @@ class DeckBotIndexManager:
             parts.append(f"Summary: {slide['slide_summary']}")
         return "\n".join(parts) if parts else slide.get('slide_summary', '')
 
-    def ingest_bulk(self, output_dir: str = "/Users/kjyoo/DeckBot/output"):
+    def ingest_bulk(self, output_dir: str = "/Users/kjyoo/DeckBot/output", replace: bool = False):
         """
         Ingest all *_metadata.json files from output directory
 
         Args:
             output_dir: Directory containing metadata JSON files
+            replace: Delete each deck's stale slides after it is upserted
         """
         output_path = Path(output_dir)
         metadata_files = list(output_path.glob("*_metadata.json"))
@@ -172,17 +432,28 @@ class DeckBotIndexManager:
         ingested = []
         failed = []
 
+        if self.deduplicator is not None and self.deduplicator.store_path is None:
+            self.deduplicator.use_store(output_path / STORE_FILENAME)
+
         for metadata_file in metadata_files:
             try:
-                doc_id = self.ingest_pdf_metadata(str(metadata_file))
+                doc_id = self.ingest_pdf_metadata(str(metadata_file), replace=replace)
                 ingested.append(doc_id)
             except Exception as e:
-                print(f"   ❌ Failed: {e}")
+                log.error(f"   ❌ Failed: {e}", path=str(metadata_file), error=str(e))
                 failed.append(str(metadata_file))
 
+        record_throughput("ingest")
         print(f"\n✅ Bulk ingestion complete!")
         print(f"   Successful: {len(ingested)}")
         print(f"   Failed: {len(failed)}")
+        self.ingest_policy.print_summary()
+
+        if self.deduplicator is not None:
+            self.deduplicator.print_summary()
+            self.deduplicator.save_store()
+            self.deduplicator.save_report(output_path / REPORT_FILENAME)
+            print(f"   Report: {output_path / REPORT_FILENAME}")
 
         if failed:
             print("\n❌ Failed files:")
@@ -197,7 +468,11 @@ class DeckBotIndexManager:
         namespace: str = GLOBAL_NAMESPACE,
         filters: Optional[Dict] = None,
         top_k: int = 20,
-        rerank_top_n: int = 5
+        rerank_top_n: int = 5,
+        fusion: str = "average",
+        rerank: bool = True,
+        verbose: bool = True,
+        keywords: Optional[List[str]] = None
     ) -> Dict:
         """
         Perform cascading retrieval: dense + sparse + rerank
@@ -208,16 +483,193 @@ class DeckBotIndexManager:
             filters: Metadata filters (e.g., {"industry": "insurance"})
             top_k: Results from each index
             rerank_top_n: Final results after reranking
+            fusion: How dense and sparse scores are merged ("average" or "rrf")
+            rerank: Rerank the merged candidates (False returns fused order)
+            verbose: Print stage banners and results
+            keywords: Only records tagged with any of these keywords (server-side
+                "$in" filter, ANDed with filters)
         """
-        print(f"\n🔍 Cascading Search")
-        print(f"   Query: {query}")
-        print(f"   Namespace: {namespace}")
-        if filters:
-            print(f"   Filters: {filters}")
-        print("=" * 60)
+        filters = with_keyword_filter(filters, keywords)
+        echo = print if verbose else _silent
+        tracer = self.tracer
+        with tracer.trace("cascading_search", query=query, namespace=namespace,
+                          top_k=top_k, rerank_top_n=rerank_top_n, fusion=fusion, rerank=rerank) as root:
+            echo(f"\n🔍 Cascading Search")
+            echo(f"   Query: {query}")
+            echo(f"   Namespace: {namespace}")
+            if filters:
+                echo(f"   Filters: {filters}")
+            echo("=" * 60)
+
+            if self.query_log is not None:
+                self.query_log.record(query, namespace=namespace, filters=filters, top_k=top_k,
+                                      rerank_top_n=rerank_top_n, fusion=fusion, rerank=rerank)
+
+            key = make_query_key(query, filters, namespace=namespace, top_k=top_k,
+                                 rerank_top_n=rerank_top_n, fusion=fusion, rerank=rerank)
+
+            def run():
+                return self._run_cascade(query, namespace, filters, top_k, rerank_top_n, fusion, rerank, echo)
+
+            final_results = None
+            if self.result_cache is not None:
+                # Resolving the serving generation first clears prefetches made for another one
+                self.index_name(DENSE_INDEX_NAME)
+                final_results = self.result_cache.get(key)
+            if final_results is not None:
+                root.set(prefetched=True)
+                echo("   ⚡ Served from warm-up prefetch")
+            elif self.single_flight is None:
+                final_results, joined = run(), False
+            else:
+                final_results, joined = self.single_flight.do(key, run)
+                if joined:
+                    root.set(coalesced=True)
+                    echo("   ↪️  Joined an identical in-flight search")
+
+            # Display results
+            if verbose:
+                with tracer.span("display"):
+                    self._display_results(final_results, query)
+
+        return final_results
+
+    def cascading_search_stream(
+        self,
+        query: str,
+        namespace: str = GLOBAL_NAMESPACE,
+        filters: Optional[Dict] = None,
+        top_k: int = 20,
+        rerank_top_n: int = 5,
+        fusion: str = "average",
+        rerank: bool = True,
+        keywords: Optional[List[str]] = None
+    ) -> Iterator[SearchResult]:
+        """
+        Streaming cascading search: yields the fused (dense + sparse) ranking
+        as soon as retrieval returns, then the reranked final ranking
 
-        dense_index = self.pc.Index(DENSE_INDEX_NAME)
-        sparse_index = self.pc.Index(SPARSE_INDEX_NAME)
+        The first result has final=False while a rerank is still pending, so
+        a UI can render it after one retrieval round-trip and replace it when
+        the final result arrives. With rerank off (or no candidates) only the
+        fused result is yielded, with final=True.
+        """
+        filters = with_keyword_filter(filters, keywords)
+        started = time.perf_counter()
+        with self.tracer.trace("cascading_search_stream", query=query, namespace=namespace,
+                               top_k=top_k, rerank_top_n=rerank_top_n, fusion=fusion, rerank=rerank):
+            merged = self._retrieve(query, namespace, filters, top_k, fusion, _silent)
+            will_rerank = rerank and bool(merged)
+            yield SearchResult.from_response(
+                query, STAGE_FUSED, self._fused_results(merged, rerank_top_n), final=not will_rerank,
+                elapsed_ms=(time.perf_counter() - started) * 1000, candidates=len(merged)
+            )
+            if will_rerank:
+                reranked = self._rerank(query, merged, rerank_top_n, True, _silent)
+                yield SearchResult.from_response(
+                    query, STAGE_RERANKED, reranked, final=True,
+                    elapsed_ms=(time.perf_counter() - started) * 1000, candidates=len(merged)
+                )
+
+    def search_many(
+        self,
+        queries: Iterable[Union[str, Dict[str, Any]]],
+        namespace: str = GLOBAL_NAMESPACE,
+        filters: Optional[Dict] = None,
+        top_k: int = 20,
+        rerank_top_n: int = 5,
+        fusion: str = "average",
+        rerank: bool = True,
+        keywords: Optional[List[str]] = None,
+        concurrency: int = SEARCH_MANY_CONCURRENCY,
+        rerank_concurrency: int = SEARCH_MANY_RERANK_CONCURRENCY
+    ) -> Iterator[Tuple[int, str, Any, Optional[Exception]]]:
+        """
+        Run many cascading searches, yielding (position, query, results, error)
+        as each one completes (not in input order)
+
+        Retrieval (dense + sparse + merge) and rerank run on separate bounded
+        pools, so one query's rerank overlaps other queries' searches. Pinecone
+        rerank scores one query per call, so grouping happens by query: repeated
+        queries (same normalized text and parameters) are searched and reranked
+        once and fanned out to every position.
+
+        Args:
+            queries: Query strings, or dicts with "query" plus per-query
+                overrides of namespace/filters/keywords/top_k/rerank_top_n/fusion/rerank
+            concurrency: Queries retrieving at once
+            rerank_concurrency: Rerank calls in flight at once
+        """
+        defaults = {"namespace": namespace, "filters": filters, "keywords": keywords, "top_k": top_k,
+                    "rerank_top_n": rerank_top_n, "fusion": fusion, "rerank": rerank}
+        groups: Dict[str, Dict[str, Any]] = {}
+        for position, item in enumerate(queries):
+            spec = dict(defaults, **({"query": item} if isinstance(item, str) else item))
+            spec["filters"] = with_keyword_filter(spec["filters"], spec.pop("keywords"))
+            params = {k: v for k, v in spec.items() if k not in ("query", "filters")}
+            key = make_query_key(spec["query"], spec["filters"], **params)
+            groups.setdefault(key, {"spec": spec, "positions": []})["positions"].append(position)
+
+        def retrieve(spec: Dict[str, Any]) -> List[Dict]:
+            with self.tracer.trace("search_many.retrieve", query=spec["query"]):
+                return self._retrieve(spec["query"], spec["namespace"], spec["filters"],
+                                      spec["top_k"], spec["fusion"], _silent)
+
+        def rerank_stage(spec: Dict[str, Any], merged: List[Dict]) -> Any:
+            with self.tracer.trace("search_many.rerank", query=spec["query"]):
+                return self._rerank(spec["query"], merged, spec["rerank_top_n"], spec["rerank"], _silent)
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="search-many") as search_pool, \
+                ThreadPoolExecutor(max_workers=rerank_concurrency, thread_name_prefix="search-many-rerank") as rerank_pool:
+            pending = {search_pool.submit(retrieve, group["spec"]): (key, "retrieve") for key, group in groups.items()}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        key, stage = pending.pop(future)
+                        group = groups[key]
+                        error = future.exception()
+                        if stage == "retrieve" and error is None:
+                            # Hand off to the rerank pool; this worker moves on to the next query
+                            pending[rerank_pool.submit(rerank_stage, group["spec"], future.result())] = (key, "rerank")
+                            continue
+
+                        results = None if error else future.result()
+                        for position in group["positions"]:
+                            yield position, group["spec"]["query"], results, error
+            finally:
+                # Caller stopped early: drop queued work instead of finishing it
+                for future in pending:
+                    future.cancel()
+
+    def _run_cascade(
+        self,
+        query: str,
+        namespace: str,
+        filters: Optional[Dict],
+        top_k: int,
+        rerank_top_n: int,
+        fusion: str,
+        rerank: bool,
+        echo: Any
+    ) -> Any:
+        """Dense + sparse search, merge and rerank (stage spans nest under the caller's trace)"""
+        merged = self._retrieve(query, namespace, filters, top_k, fusion, echo)
+        return self._rerank(query, merged, rerank_top_n, rerank, echo)
+
+    def _retrieve(
+        self,
+        query: str,
+        namespace: str,
+        filters: Optional[Dict],
+        top_k: int,
+        fusion: str,
+        echo: Any
+    ) -> List[Dict]:
+        """Dense + sparse search and merge; returns fused candidates"""
+        tracer = self.tracer
+        dense_index = self._index(DENSE_INDEX_NAME)
+        sparse_index = self._index(SPARSE_INDEX_NAME)
 
         # Build query with filters
         search_query = {
@@ -227,74 +679,158 @@ class DeckBotIndexManager:
         if filters:
             search_query["filter"] = filters
 
-        # 1. Dense search (semantic)
-        print("\n1️⃣ Dense search (semantic understanding)...")
-        dense_results = dense_index.search(
-            namespace=namespace,
-            query=search_query
-        )
-        print(f"   Found {len(dense_results['result']['hits'])} dense results")
+        # 1. Dense search (semantic; query embedding happens server-side)
+        echo("\n1️⃣ Dense search (semantic understanding)...")
+        with tracer.span("dense_search", index=DENSE_INDEX_NAME) as span, self._upstream("dense"):
+            dense_results = dense_index.search(
+                namespace=namespace,
+                query=search_query
+            )
+            dense_hits = dense_results['result']['hits']
+            if tracer.enabled:
+                span.set(hits=len(dense_hits), response_bytes=hits_bytes(dense_hits))
+        echo(f"   Found {len(dense_hits)} dense results")
 
         # 2. Sparse search (keyword matching)
-        print("2️⃣ Sparse search (keyword matching)...")
-        sparse_results = sparse_index.search(
-            namespace=namespace,
-            query=search_query
-        )
-        print(f"   Found {len(sparse_results['result']['hits'])} sparse results")
+        echo("2️⃣ Sparse search (keyword matching)...")
+        with tracer.span("sparse_search", index=SPARSE_INDEX_NAME) as span, self._upstream("sparse"):
+            sparse_results = sparse_index.search(
+                namespace=namespace,
+                query=search_query
+            )
+            sparse_hits = sparse_results['result']['hits']
+            if tracer.enabled:
+                span.set(hits=len(sparse_hits), response_bytes=hits_bytes(sparse_hits))
+        echo(f"   Found {len(sparse_hits)} sparse results")
 
         # 3. Merge and deduplicate
-        print("3️⃣ Merging results...")
-        merged = self._merge_results(dense_results, sparse_results)
-        print(f"   Merged to {len(merged)} unique results")
+        echo("3️⃣ Merging results...")
+        with tracer.span("merge", fusion=fusion) as span:
+            merged = self._merge_results(dense_results, sparse_results, method=fusion)
+            span.set(candidates=len(merged))
+        echo(f"   Merged to {len(merged)} unique results")
+
+        # Chunk hits → one candidate per slide (its best-scoring record)
+        with tracer.span("group_chunks") as span:
+            before = len(merged)
+            merged = collapse_chunks(merged)
+            span.set(grouped=before - len(merged))
+        if before > len(merged):
+            echo(f"   Grouped chunk hits → {len(merged)} slides")
+
+        if self.collapse_duplicates and len(merged) > 1:
+            with tracer.span("dedup") as span:
+                before = len(merged)
+                merged = collapse_near_duplicates(merged)
+                span.set(collapsed=before - len(merged))
+            if before > len(merged):
+                echo(f"   Collapsed {before - len(merged)} near-duplicates → {len(merged)} candidates")
+        return merged
+
+    def _rerank(self, query: str, merged: List[Dict], rerank_top_n: int, rerank: bool, echo: Any) -> Any:
+        """Rerank fused candidates (or keep fused order when rerank is off)"""
+        tracer = self.tracer
 
         # 4. Rerank
-        print("4️⃣ Reranking with bge-reranker-v2-m3...")
-        final_results = self.pc.inference.rerank(
-            model="bge-reranker-v2-m3",
-            query=query,
-            documents=merged,
-            rank_fields=["content"],
-            top_n=min(rerank_top_n, len(merged)),
-            return_documents=True,
-            parameters={"truncate": "END"}
-        )
-
-        # Display results
-        self._display_results(final_results, query)
+        if rerank and merged and self.rerank_cache is not None:
+            echo(f"4️⃣ Reranking with {RERANK_MODEL} (cached scores reused)...")
+            final_results = self._cached_rerank(query, merged, rerank_top_n)
+        elif rerank and merged:
+            echo(f"4️⃣ Reranking with {RERANK_MODEL}...")
+            with tracer.span("rerank", model=RERANK_MODEL) as span, self._upstream("rerank"):
+                if tracer.enabled:
+                    span.set(documents=len(merged), request_bytes=hits_bytes(merged))
+                final_results = self.pc.inference.rerank(
+                    model=RERANK_MODEL,
+                    query=query,
+                    documents=merged,
+                    rank_fields=["content"],
+                    top_n=min(rerank_top_n, len(merged)),
+                    return_documents=True,
+                    parameters={"truncate": "END"}
+                )
+        else:
+            final_results = self._fused_results(merged, rerank_top_n)
 
         return final_results
 
-    def _merge_results(self, dense_results: Dict, sparse_results: Dict) -> List[Dict]:
-        """Merge and deduplicate results from dense and sparse searches"""
+    def _cached_rerank(self, query: str, merged: List[Dict], rerank_top_n: int) -> Any:
+        """Rerank only candidates without a cached score, then rank all by score"""
+        tracer = self.tracer
+        cache = self.rerank_cache
+        contents = [doc['content'] for doc in merged]
+        scores = cache.get_many(query, RERANK_MODEL, contents)
+        misses = [position for position in range(len(merged)) if position not in scores]
+
+        with tracer.span("rerank", model=RERANK_MODEL, cache_hits=len(scores)) as span:
+            if misses:
+                batch = [merged[position] for position in misses]
+                if tracer.enabled:
+                    span.set(documents=len(batch), request_bytes=hits_bytes(batch))
+                with self._upstream("rerank"):
+                    response = self.pc.inference.rerank(
+                        model=RERANK_MODEL,
+                        query=query,
+                        documents=batch,
+                        rank_fields=["content"],
+                        top_n=len(batch),  # Every miss needs a score to cache
+                        return_documents=False,
+                        parameters={"truncate": "END"}
+                    )
+                fresh = [(misses[item['index']], item['score']) for item in response.data]
+                scores.update(fresh)
+                cache.put_many(query, RERANK_MODEL, [(contents[position], score) for position, score in fresh])
+
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))[:rerank_top_n]
+        return SimpleNamespace(data=[
+            {"index": position, "score": scores[position], "document": merged[position]}
+            for position in ranked
+        ])
+
+    def _fused_results(self, merged: List[Dict], top_n: int) -> Any:
+        """Shape fused candidates like a rerank response (no rerank call)"""
+        return SimpleNamespace(data=[
+            {"index": idx, "score": doc['_score'], "document": doc}
+            for idx, doc in enumerate(merged[:top_n])
+        ])
+
+    def _merge_results(
+        self,
+        dense_results: Dict,
+        sparse_results: Dict,
+        method: str = "average"
+    ) -> List[Dict]:
+        """
+        Merge and deduplicate results from dense and sparse searches
+
+        method="average" averages raw scores of hits found by both indexes;
+        method="rrf" uses reciprocal rank fusion, which ignores the differing
+        score scales of dense and sparse indexes.
+        """
+        if method not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {method} (expected one of {FUSION_METHODS})")
+
         hits = {}
 
-        # Process dense results
-        for hit in dense_results['result']['hits']:
-            doc = {
-                '_id': hit['_id'],
-                'content': hit['fields']['content'],
-                '_score': hit['_score']
-            }
-            # Add all available fields
-            for key, value in hit['fields'].items():
-                if key != 'content':
-                    doc[key] = value
-            hits[hit['_id']] = doc
-
-        # Process sparse results
-        for hit in sparse_results['result']['hits']:
-            if hit['_id'] in hits:
-                # Average scores if exists in both
-                hits[hit['_id']]['_score'] = (
-                    hits[hit['_id']]['_score'] + hit['_score']
-                ) / 2
-            else:
+        for source in (dense_results, sparse_results):
+            for rank, hit in enumerate(source['result']['hits'], 1):
+                score = 1.0 / (RRF_K + rank) if method == "rrf" else hit['_score']
+
+                if hit['_id'] in hits:
+                    existing = hits[hit['_id']]
+                    if method == "rrf":
+                        existing['_score'] += score
+                    else:
+                        # Average scores if exists in both
+                        existing['_score'] = (existing['_score'] + score) / 2
+                    continue
+
                 doc = {
                     '_id': hit['_id'],
                     'content': hit['fields']['content'],
-                    '_score': hit['_score']
+                    '_score': score
                 }
+                # Add all available fields
                 for key, value in hit['fields'].items():
                     if key != 'content':
                         doc[key] = value
@@ -322,7 +858,7 @@ class DeckBotIndexManager:
             if 'slide_number' in doc:
                 print(f"   Slide: #{doc['slide_number']}")
             if 'keywords' in doc:
-                print(f"   Keywords: {doc['keywords'][:100]}")
+                print(f"   Keywords: {', '.join(keyword_list(doc['keywords']))[:100]}")
 
             # Show content preview
             content = doc.get('content', '')
@@ -330,22 +866,34 @@ class DeckBotIndexManager:
             print(f"   Preview: {preview}")
             print("   " + "-" * 58)
 
-    def search_by_company(self, query: str, company: str, top_n: int = 5):
+    def search_by_company(self, query: str, company: str, top_n: int = 5, **kwargs: Any):
         """Search within a specific company's documents"""
         return self.cascading_search(
             query=query,
             namespace=GLOBAL_NAMESPACE,
             filters={"company": {"$eq": company}},
-            rerank_top_n=top_n
+            rerank_top_n=top_n,
+            **kwargs
         )
 
-    def search_by_industry(self, query: str, industry: str, top_n: int = 5):
+    def search_by_industry(self, query: str, industry: str, top_n: int = 5, **kwargs: Any):
         """Search within a specific industry"""
         return self.cascading_search(
             query=query,
             namespace=GLOBAL_NAMESPACE,
             filters={"industry": {"$eq": industry}},
-            rerank_top_n=top_n
+            rerank_top_n=top_n,
+            **kwargs
+        )
+
+    def search_by_keywords(self, query: str, keywords: List[str], top_n: int = 5, **kwargs: Any):
+        """Search slides tagged with any of the keywords (variants resolve to the same canonical)"""
+        return self.cascading_search(
+            query=query,
+            namespace=GLOBAL_NAMESPACE,
+            filters=self.keyword_index.keyword_filter(keywords),
+            rerank_top_n=top_n,
+            **kwargs
         )
 
     def get_index_stats(self):
@@ -353,7 +901,7 @@ class DeckBotIndexManager:
         print("\n📊 Index Statistics")
         print("=" * 60)
 
-        for index_name in [DENSE_INDEX_NAME, SPARSE_INDEX_NAME]:
+        for index_name in [self.index_name(DENSE_INDEX_NAME), self.index_name(SPARSE_INDEX_NAME)]:
             try:
                 stats = self.pc.describe_index_stats(index_name)
                 print(f"\n{index_name}:")
@@ -367,67 +915,53 @@ class DeckBotIndexManager:
                 print(f"\n{index_name}: Error - {e}")
 
 
-def main():
-    """Main CLI interface"""
-    import sys
-
-    manager = DeckBotIndexManager()
-
-    if len(sys.argv) < 2:
-        print("""
-DeckBot Unified Index Manager
-
-Commands:
-  setup                           - Create indexes
-  ingest <path>                   - Ingest single metadata JSON
-  ingest-all                      - Ingest all files from output/
-  search <query>                  - Search all documents
-  search-company <company> <query> - Search by company
-  search-industry <industry> <query> - Search by industry
-  stats                           - Show index statistics
-
-Examples:
-  python deckbot_unified_index.py setup
-  python deckbot_unified_index.py ingest output/ilgram_DB_insurance_0529_metadata.json
-  python deckbot_unified_index.py ingest-all
-  python deckbot_unified_index.py search "유튜버 협업 마케팅"
-  python deckbot_unified_index.py search-company "DB손해보험" "캠페인 전략"
-  python deckbot_unified_index.py stats
-        """)
-        return
-
-    command = sys.argv[1]
-
-    if command == "setup":
-        manager.setup_indexes()
-
-    elif command == "ingest" and len(sys.argv) > 2:
-        metadata_path = sys.argv[2]
-        manager.ingest_pdf_metadata(metadata_path)
-
-    elif command == "ingest-all":
-        manager.ingest_bulk()
-
-    elif command == "search" and len(sys.argv) > 2:
-        query = " ".join(sys.argv[2:])
-        manager.cascading_search(query)
-
-    elif command == "search-company" and len(sys.argv) > 3:
-        company = sys.argv[2]
-        query = " ".join(sys.argv[3:])
-        manager.search_by_company(query, company)
+def load_queries(path: Path) -> List[Union[str, Dict[str, Any]]]:
+    """Queries from JSON (a list, or a golden file's "queries") or a text file, one per line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if path.suffix == ".json":
+        data = json.loads(text)
+        if isinstance(data, dict):
+            data = data["queries"]  # Golden query file (benchmarks/golden_queries.json)
+        queries = []
+        for item in data:
+            if isinstance(item, str):
+                queries.append(item)
+            else:
+                queries.append({k: item[k] for k in ("query", "namespace", "filters") if item.get(k)})
+        return queries
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def run_search_many(manager: DeckBotIndexManager, path: Path, **search_kwargs: Any) -> int:
+    """Stream search_many results for a query file and print throughput; returns failures"""
+    queries = load_queries(path)
+    print(f"\n🔍 Running {len(queries)} queries from {path}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    failed = 0
+    for completed, (position, query, results, error) in enumerate(manager.search_many(queries, **search_kwargs), 1):
+        if error:
+            failed += 1
+            print(f"   ❌ [{completed}/{len(queries)}] #{position + 1} {query[:40]} - {error}")
+            continue
+        top = results.data[0] if results.data else None
+        best = f"{top['document']['_id']} ({top['score']:.4f})" if top else "no results"
+        print(f"   ✅ [{completed}/{len(queries)}] #{position + 1} {query[:40]} → {best}")
+
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 {len(queries) - failed}/{len(queries)} succeeded in {elapsed:.1f}s "
+          f"({len(queries) / elapsed if elapsed else 0:.1f} queries/s)")
+    return failed
 
-    elif command == "search-industry" and len(sys.argv) > 3:
-        industry = sys.argv[2]
-        query = " ".join(sys.argv[3:])
-        manager.search_by_industry(query, industry)
 
-    elif command == "stats":
-        manager.get_index_stats()
+def main():
+    """Main CLI interface: the deckbot.py commands (parsed before anything is built)"""
+    from deckbot import main as cli_main
 
-    else:
-        print(f"Unknown command: {command}")
+    return cli_main(sys.argv[1:])
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
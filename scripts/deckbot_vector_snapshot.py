@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+DeckBot Vector Snapshot
+Exports index vectors + metadata to local files and re-upserts them without re-embedding
+
+- export: lists every namespace page by page and fetches each page's vectors
+  with concurrent fetch calls, streaming them to disk in ID order; the
+  DeckBot indexes are read from the active generation (or --generation)
+- Dense vectors go to vectors.npy as float16 (half of float32, ample for
+  cosine ranking); sparse vectors to sparse_offsets.npy (int64, CSR row
+  pointers) / sparse_indices.npy (uint32) / sparse_values.npy (float16)
+- records.ndjson holds id, namespace and metadata per row in the same order;
+  manifest.json holds the source index, embedding model, dimension and counts
+- import: index.upsert(vectors=...) with the stored vectors, so nothing goes
+  through the embedding model, into another index (--index SRC=DST),
+  another namespace (--namespace SRC=DST) or a new blue/green generation
+  (--generation, registered in the alias file as deckbot_generations.py does)
+- Refuses to import into an index whose embedding model differs from the
+  snapshot's (queries would be embedded into a different space)
+- Both directions report records/s and MB/s of snapshot data
+
+The .npy files are standard NumPy arrays written with struct half floats,
+so np.load(path, mmap_mode="r") opens them while this script stays stdlib only.
+Metadata is copied verbatim, so a snapshot of the legacy
+ilgram-db-insurance-korean indexes (setup_hybrid_search.py) keeps its own fields.
+
+Usage:
+    python deckbot_vector_snapshot.py export <snapshot_dir> [--index NAME ...] [--namespace NS ...]
+                                      [--generation G] [--concurrency 8]
+    python deckbot_vector_snapshot.py import <snapshot_dir> [--index SRC=DST ...] [--namespace SRC=DST ...]
+                                      [--generation G] [--concurrency 8] [--force]
+    python deckbot_vector_snapshot.py info <snapshot_dir>
+"""
+
+import argparse
+import ast
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Configuration
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILENAME = "snapshot.json"
+MANIFEST_FILENAME = "manifest.json"
+RECORDS_FILENAME = "records.ndjson"
+VECTORS_FILENAME = "vectors.npy"
+SPARSE_FILENAMES = ("sparse_offsets.npy", "sparse_indices.npy", "sparse_values.npy")
+LIST_PAGE_SIZE = 100  # IDs per list page, also the IDs per fetch call
+UPSERT_BATCH_SIZE = 100  # Vectors per upsert (Pinecone: ≤1000 vectors and ≤2MB per request)
+SNAPSHOT_CONCURRENCY = 8  # Fetch/upsert calls in flight
+WRITE_BUFFER_ROWS = 1000  # Rows packed per file write
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_BYTES = 128  # Fixed, so the shape can be patched in place once the row count is known
+NPY_TYPES = {"<f2": ("e", 2), "<u4": ("I", 4), "<i8": ("q", 8)}
+
+Row = Tuple[str, Dict[str, Any]]  # (namespace, vector)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _field(obj: Any, name: str) -> Any:
+    # Item access for dicts: on the SDK-style AttrDict, .values is dict.values
+    if obj is None:
+        return None
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def _mb(size: int) -> float:
+    return size / (1024 * 1024)
+
+
+# ============================================================================
+# .npy files (format version 1.0)
+# ============================================================================
+
+class NpyWriter:
+    """Appends little-endian values to a .npy file; the header is written on close"""
+
+    def __init__(self, path: Path, descr: str, width: Optional[int] = None):
+        self.path = Path(path)
+        self.descr = descr
+        self.width = width  # Row width for 2-D arrays, None for 1-D
+        self.count = 0  # Values written
+        self._code = NPY_TYPES[descr][0]
+        self._pending: List[Any] = []
+        self._file = open(self.path, "wb")
+        self._file.write(b"\0" * NPY_HEADER_BYTES)
+
+    def write(self, values: Iterable[Any]):
+        self._pending.extend(values)
+        if len(self._pending) >= WRITE_BUFFER_ROWS * (self.width or 1):
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self._file.write(struct.pack(f"<{len(self._pending)}{self._code}", *self._pending))
+            self.count += len(self._pending)
+            self._pending = []
+
+    def close(self):
+        self._flush()
+        shape = (self.count // self.width, self.width) if self.width else (self.count,)
+        header = repr({"descr": self.descr, "fortran_order": False, "shape": shape})
+        header = header.ljust(NPY_HEADER_BYTES - len(NPY_MAGIC) - 3) + "\n"
+        self._file.seek(0)
+        self._file.write(NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1"))
+        self._file.close()
+
+
+class NpyReader:
+    """Memory-mapped read access to a 1-D or 2-D .npy file"""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(NPY_MAGIC)] != NPY_MAGIC:
+            raise ValueError(f"Not a version 1.0 .npy file: {path}")
+        (header_length,) = struct.unpack_from("<H", self._map, len(NPY_MAGIC))
+        self._offset = len(NPY_MAGIC) + 2 + header_length
+        header = ast.literal_eval(self._map[len(NPY_MAGIC) + 2:self._offset].decode("latin1"))
+        if header["descr"] not in NPY_TYPES or header["fortran_order"]:
+            raise ValueError(f"Unsupported .npy layout in {path}: {header}")
+        self.shape = tuple(header["shape"])
+        self._code, self._itemsize = NPY_TYPES[header["descr"]]
+
+    def slice(self, start: int, stop: int) -> Tuple[Any, ...]:
+        """Flat values [start, stop)"""
+        return struct.unpack_from(f"<{stop - start}{self._code}", self._map,
+                                  self._offset + start * self._itemsize)
+
+    def row(self, row: int) -> Tuple[Any, ...]:
+        width = self.shape[1]
+        return self.slice(row * width, (row + 1) * width)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+# ============================================================================
+# Export
+# ============================================================================
+
+def _bounded_map(pool: ThreadPoolExecutor, fn: Callable[[Any], Any], items: Iterable[Any],
+                 window: int) -> Iterator[Any]:
+    """pool.map with at most `window` calls in flight; results in input order"""
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class _IndexWriter:
+    """Streams one index's rows into records.ndjson and the vector arrays"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in (VECTORS_FILENAME,) + SPARSE_FILENAMES:
+            (directory / stale).unlink(missing_ok=True)
+        self.records = open(directory / RECORDS_FILENAME, "w", encoding="utf-8")
+        self.dense: Optional[NpyWriter] = None
+        self.sparse: Optional[Tuple[NpyWriter, NpyWriter, NpyWriter]] = None
+        self.rows = 0
+        self.sparse_entries = 0
+        self.namespaces: Dict[str, int] = {}
+
+    def add(self, namespace: str, vector: Any):
+        record_id = _field(vector, "id")
+        values = _field(vector, "values") or []
+        sparse = _field(vector, "sparse_values")
+        if values:
+            if self.dense is None:
+                if self.rows:
+                    raise ValueError(f"{record_id} has dense values but earlier rows did not")
+                self.dense = NpyWriter(self.directory / VECTORS_FILENAME, "<f2", width=len(values))
+            if len(values) != self.dense.width:
+                raise ValueError(f"{record_id} has dimension {len(values)}, expected {self.dense.width}")
+            self.dense.write(values)
+        elif self.dense is not None:
+            raise ValueError(f"{record_id} has no dense values")
+
+        if sparse is not None and self.sparse is None:
+            offsets = NpyWriter(self.directory / SPARSE_FILENAMES[0], "<i8")
+            offsets.write([0] * (self.rows + 1))  # Earlier rows had no sparse values
+            self.sparse = (offsets,
+                           NpyWriter(self.directory / SPARSE_FILENAMES[1], "<u4"),
+                           NpyWriter(self.directory / SPARSE_FILENAMES[2], "<f2"))
+        if self.sparse is not None:
+            offsets, indices, weights = self.sparse
+            if sparse is not None:
+                row_indices = list(_field(sparse, "indices"))
+                indices.write(row_indices)
+                weights.write(_field(sparse, "values"))
+                self.sparse_entries += len(row_indices)
+            offsets.write([self.sparse_entries])
+
+        metadata = dict(_field(vector, "metadata") or {})
+        self.records.write(json.dumps({"id": record_id, "namespace": namespace, "metadata": metadata},
+                                      ensure_ascii=False) + "\n")
+        self.rows += 1
+        self.namespaces[namespace] = self.namespaces.get(namespace, 0) + 1
+
+    def close(self) -> Dict[str, Any]:
+        self.records.close()
+        writers = ([self.dense] if self.dense else []) + list(self.sparse or ())
+        for writer in writers:
+            writer.close()
+        return {
+            "rows": self.rows,
+            "namespaces": self.namespaces,
+            "dimension": self.dense.width if self.dense else None,
+            "sparse": self.sparse is not None,
+            "files": sorted(path.name for path in self.directory.iterdir()),
+        }
+
+
+def _index_embed(client: Any, index_name: str) -> Optional[Dict[str, Any]]:
+    """{model, field_map} of an integrated index, None when unknown"""
+    try:
+        embed = _field(client.describe_index(index_name), "embed")
+    except Exception:
+        return None
+    model = _field(embed, "model")
+    if not model:
+        return None
+    field_map = _field(embed, "field_map")
+    return {"model": model, "field_map": dict(field_map) if field_map else {"text": "content"}}
+
+
+def _pages(index: Any, namespaces: List[str]) -> Iterator[Tuple[str, List[str]]]:
+    for namespace in namespaces:
+        for page in index.list(namespace=namespace, limit=LIST_PAGE_SIZE):
+            yield namespace, list(page)
+
+
+def export_index(client: Any, index_name: str, directory: Path, namespaces: Optional[List[str]] = None,
+                 physical_name: Optional[str] = None, concurrency: int = SNAPSHOT_CONCURRENCY) -> Dict[str, Any]:
+    """Snapshot one index (physical_name, default index_name) into directory; returns its manifest"""
+    physical_name = physical_name or index_name
+    index = client.Index(physical_name)
+    if not namespaces:
+        namespaces = sorted(index.describe_index_stats().namespaces or {})
+
+    def fetch(page: Tuple[str, List[str]]) -> List[Row]:
+        namespace, ids = page
+        fetched = _field(index.fetch(ids=ids, namespace=namespace), "vectors") or {}
+        # Page order, not response order; IDs deleted since the list call are skipped
+        return [(namespace, fetched[record_id]) for record_id in ids if record_id in fetched]
+
+    started = time.perf_counter()
+    writer = _IndexWriter(directory)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="snapshot-fetch") as pool:
+            for rows in _bounded_map(pool, fetch, _pages(index, namespaces), concurrency * 2):
+                for namespace, vector in rows:
+                    writer.add(namespace, vector)
+    finally:
+        summary = writer.close()
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "index": index_name,
+        "physical_index": physical_name,
+        "embed": _index_embed(client, physical_name),
+        "exported_at": _now(),
+        **summary,
+        "bytes": sum(path.stat().st_size for path in directory.iterdir()),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    with open(directory / MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def _physical_name(aliases: Any, index_name: str, generation: Optional[str]) -> str:
+    """Physical index behind a logical DeckBot index in generation; other names are used as given"""
+    if aliases is None:
+        return index_name
+    entry = aliases.generations.get(generation)
+    if entry is not None and index_name not in entry["indexes"]:
+        return index_name
+    return aliases.physical(index_name, generation)
+
+
+def export_snapshot(client: Any, index_names: List[str], snapshot_dir: Path,
+                    namespaces: Optional[List[str]] = None, generation: Optional[str] = None,
+                    aliases: Any = None, concurrency: int = SNAPSHOT_CONCURRENCY) -> Dict[str, Any]:
+    """Export each index into snapshot_dir/<index>/ and write snapshot.json
+
+    With aliases, logical index names resolve to generation (default: the active one)
+    """
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    if aliases is not None:
+        generation = generation or aliases.current()
+    manifests = {}
+    for index_name in index_names:
+        physical_name = _physical_name(aliases, index_name, generation)
+        manifest = export_index(client, index_name, snapshot_dir / index_name, namespaces,
+                                physical_name, concurrency)
+        manifests[index_name] = manifest
+        print(f"   📤 {physical_name}: {manifest['rows']} vectors, {len(manifest['namespaces'])} namespaces, "
+              f"{_mb(manifest['bytes']):.1f} MB in {manifest['seconds']:.1f}s")
+
+    snapshot = {"version": SNAPSHOT_VERSION, "created_at": _now(), "generation": generation,
+                "indexes": list(manifests)}
+    with open(snapshot_dir / SNAPSHOT_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+    return {**snapshot, "manifests": manifests}
+
+
+# ============================================================================
+# Import
+# ============================================================================
+
+def load_snapshot(snapshot_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """index name → manifest"""
+    snapshot_dir = Path(snapshot_dir)
+    with open(snapshot_dir / SNAPSHOT_FILENAME, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}")
+    manifests = {}
+    for index_name in snapshot["indexes"]:
+        with open(snapshot_dir / index_name / MANIFEST_FILENAME, encoding="utf-8") as f:
+            manifests[index_name] = json.load(f)
+    return manifests
+
+
+def iter_rows(directory: Path) -> Iterator[Row]:
+    """(namespace, vector) per stored row, float16 values widened back to floats"""
+    directory = Path(directory)
+    dense = NpyReader(directory / VECTORS_FILENAME) if (directory / VECTORS_FILENAME).exists() else None
+    sparse = None
+    if (directory / SPARSE_FILENAMES[0]).exists():
+        offsets_reader, indices, weights = (NpyReader(directory / name) for name in SPARSE_FILENAMES)
+        offsets = array("q", offsets_reader.slice(0, offsets_reader.shape[0]))
+        offsets_reader.close()
+        sparse = (offsets, indices, weights)
+
+    try:
+        with open(directory / RECORDS_FILENAME, encoding="utf-8") as f:
+            for row, line in enumerate(f):
+                record = json.loads(line)
+                vector: Dict[str, Any] = {"id": record["id"], "metadata": record["metadata"]}
+                if dense is not None:
+                    vector["values"] = list(dense.row(row))
+                if sparse is not None:
+                    offsets, indices, weights = sparse
+                    start, stop = offsets[row], offsets[row + 1]
+                    if stop > start:
+                        vector["sparse_values"] = {"indices": list(indices.slice(start, stop)),
+                                                   "values": list(weights.slice(start, stop))}
+                yield record["namespace"], vector
+    finally:
+        for reader in ([dense] if dense else []) + (list(sparse[1:]) if sparse else []):
+            reader.close()
+
+
+def _batches(rows: Iterable[Row], namespace_map: Dict[str, str],
+             batch_size: int) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    namespace, batch = None, []
+    for row_namespace, vector in rows:
+        row_namespace = namespace_map.get(row_namespace, row_namespace)
+        if batch and (row_namespace != namespace or len(batch) >= batch_size):
+            yield namespace, batch
+            batch = []
+        namespace = row_namespace
+        batch.append(vector)
+    if batch:
+        yield namespace, batch
+
+
+def prepare_target(client: Any, manifest: Dict[str, Any], target: str, force: bool = False):
+    """Create target from the snapshot's embedding config, or check its model matches"""
+    embed = manifest.get("embed")
+    if not client.has_index(target):
+        if not embed:
+            raise ValueError(f"{target} does not exist and the snapshot has no embedding config to create it from")
+        client.create_index_for_model(name=target, embed=embed)
+        print(f"✅ Created {target} ({embed['model']})")
+    else:
+        target_embed = _index_embed(client, target)
+        if embed and target_embed and target_embed["model"] != embed["model"] and not force:
+            raise ValueError(
+                f"{target} embeds with {target_embed['model']}, the snapshot was made with {embed['model']} "
+                "(use --force to import anyway)"
+            )
+
+
+def import_index(client: Any, manifest: Dict[str, Any], directory: Path, target: str,
+                 namespace_map: Optional[Dict[str, str]] = None, concurrency: int = SNAPSHOT_CONCURRENCY,
+                 batch_size: int = UPSERT_BATCH_SIZE, force: bool = False) -> Dict[str, Any]:
+    """Upsert one exported index's raw vectors into target; returns counts and timing"""
+    prepare_target(client, manifest, target, force)
+    index = client.Index(target)
+
+    def upsert(batch: Tuple[str, List[Dict[str, Any]]]) -> int:
+        namespace, vectors = batch
+        index.upsert(vectors=vectors, namespace=namespace)
+        return len(vectors)
+
+    started = time.perf_counter()
+    upserted = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="snapshot-upsert") as pool:
+        batches = _batches(iter_rows(directory), namespace_map or {}, batch_size)
+        for count in _bounded_map(pool, upsert, batches, concurrency * 2):
+            upserted += count
+
+    return {"index": target, "vectors": upserted, "bytes": manifest["bytes"],
+            "seconds": round(time.perf_counter() - started, 2)}
+
+
+def import_snapshot(client: Any, snapshot_dir: Path, index_map: Optional[Dict[str, str]] = None,
+                    namespace_map: Optional[Dict[str, str]] = None, generation: Optional[str] = None,
+                    aliases: Any = None, concurrency: int = SNAPSHOT_CONCURRENCY,
+                    force: bool = False) -> List[Dict[str, Any]]:
+    """Import every index of a snapshot; with generation, into that (new) generation's indexes"""
+    snapshot_dir = Path(snapshot_dir)
+    manifests = load_snapshot(snapshot_dir)
+    index_map = dict(index_map or {})
+
+    if generation:
+        from deckbot_generations import create_generation
+        from deckbot_unified_index import DENSE_INDEX_NAME, SPARSE_INDEX_NAME
+
+        models = {name: (manifests.get(name, {}).get("embed") or {}).get("model")
+                  for name in (DENSE_INDEX_NAME, SPARSE_INDEX_NAME)}
+        missing = [name for name, model in models.items() if not model]
+        if missing:
+            raise ValueError(f"A generation needs both indexes with their models; missing {', '.join(missing)}")
+        create_generation(client, aliases, generation,
+                          dense_model=models[DENSE_INDEX_NAME], sparse_model=models[SPARSE_INDEX_NAME])
+        for name in (DENSE_INDEX_NAME, SPARSE_INDEX_NAME):
+            index_map[name] = aliases.physical(name, generation)
+
+    # Every target checked before the first upsert, so a mismatch leaves nothing half imported
+    targets = {index_name: index_map.get(index_name, index_name) for index_name in manifests}
+    for index_name, target in targets.items():
+        prepare_target(client, manifests[index_name], target, force)
+
+    results = []
+    for index_name, manifest in manifests.items():
+        result = import_index(client, manifest, snapshot_dir / index_name, targets[index_name], namespace_map,
+                              concurrency, force=force)
+        results.append(result)
+        print(f"   📥 {result['index']}: {result['vectors']} vectors, {_mb(result['bytes']):.1f} MB "
+              f"in {result['seconds']:.1f}s")
+
+    if generation:
+        aliases.update_generation(generation, status="built", built_at=_now(), source=f"snapshot {snapshot_dir}",
+                                  build_seconds=round(sum(result["seconds"] for result in results), 1))
+    return results
+
+
+def print_throughput(label: str, vectors: int, size: int, seconds: float):
+    seconds = max(seconds, 1e-9)
+    print(f"\n⚡ {label}: {vectors} vectors, {_mb(size):.1f} MB in {seconds:.2f}s "
+          f"({vectors / seconds:.0f} vectors/s, {_mb(size) / seconds:.2f} MB/s)")
+
+
+def _mapping(pairs: List[str]) -> Dict[str, str]:
+    mapping = {}
+    for pair in pairs:
+        source, separator, target = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Expected SRC=DST, got {pair!r}")
+        mapping[source] = target
+    return mapping
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and re-import DeckBot index vectors")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Snapshot indexes to a directory")
+    export_parser.add_argument("snapshot_dir", type=Path)
+    export_parser.add_argument("--index", action="append", default=[],
+                               help="Index to export (repeatable; default: the dense and sparse DeckBot indexes)")
+    export_parser.add_argument("--namespace", action="append", default=[],
+                               help="Only this namespace (repeatable; default: all)")
+    export_parser.add_argument("--generation", help="Export this generation's physical indexes")
+    export_parser.add_argument("--concurrency", type=int, default=SNAPSHOT_CONCURRENCY)
+
+    import_parser = subparsers.add_parser("import", help="Upsert a snapshot's vectors without re-embedding")
+    import_parser.add_argument("snapshot_dir", type=Path)
+    import_parser.add_argument("--index", action="append", default=[], metavar="SRC=DST",
+                               help="Import an exported index under another name")
+    import_parser.add_argument("--namespace", action="append", default=[], metavar="SRC=DST",
+                               help="Import a namespace under another name")
+    import_parser.add_argument("--generation", help="Import into this generation (created when new)")
+    import_parser.add_argument("--concurrency", type=int, default=SNAPSHOT_CONCURRENCY)
+    import_parser.add_argument("--force", action="store_true", help="Import despite an embedding model mismatch")
+
+    info_parser = subparsers.add_parser("info", help="Describe a snapshot")
+    info_parser.add_argument("snapshot_dir", type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == "info":
+        try:
+            manifests = load_snapshot(args.snapshot_dir)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error: {e}")
+            return 1
+        print(f"🗄️  Snapshot {args.snapshot_dir}")
+        for index_name, manifest in manifests.items():
+            model = (manifest.get("embed") or {}).get("model", "unknown model")
+            shape = f"dense {manifest['dimension']}d" if manifest["dimension"] else "sparse"
+            print(f"   {index_name:<36} {manifest['rows']:>8} vectors  {len(manifest['namespaces']):>4} namespaces  "
+                  f"{_mb(manifest['bytes']):>8.1f} MB  {shape}  {model}")
+        return 0
+
+    from deckbot_generations import IndexAliases
+    from deckbot_pinecone_client import create_pinecone_client
+
+    client = create_pinecone_client()
+    aliases = IndexAliases.from_env()
+
+    try:
+        if args.command == "export":
+            if not args.index:
+                from deckbot_unified_index import DENSE_INDEX_NAME, SPARSE_INDEX_NAME
+
+                args.index = [DENSE_INDEX_NAME, SPARSE_INDEX_NAME]
+            print(f"📦 Exporting {', '.join(args.index)} → {args.snapshot_dir}")
+            snapshot = export_snapshot(client, args.index, args.snapshot_dir, args.namespace or None,
+                                       args.generation, aliases, args.concurrency)
+            manifests = snapshot["manifests"].values()
+            print_throughput("Export", sum(m["rows"] for m in manifests), sum(m["bytes"] for m in manifests),
+                             sum(m["seconds"] for m in manifests))
+        else:
+            print(f"📦 Importing {args.snapshot_dir}")
+            results = import_snapshot(client, args.snapshot_dir, _mapping(args.index), _mapping(args.namespace),
+                                      args.generation, aliases, args.concurrency, args.force)
+            print_throughput("Import", sum(r["vectors"] for r in results), sum(r["bytes"] for r in results),
+                             sum(r["seconds"] for r in results))
+            if args.generation:
+                print(f"   Next: python deckbot_generations.py validate {args.generation} <metadata_dir>")
+    except (KeyError, OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
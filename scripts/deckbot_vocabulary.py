@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+DeckBot Vocabulary Builder
+Keeps deckbot-metadata.json (companies, industries, keywords) up to date incrementally
+
+- Small index of per-deck contributions (company, industry, keyword counts),
+  keyed by metadata file and stamped with its size/mtime
+- sync() re-reads only added or changed *_metadata.json files and subtracts
+  removed ones; nothing else is rescanned
+- Keyword frequencies (slide occurrences) and deck-level postings
+- Export keeps the schema src/rag-query.ts reads and is written atomically
+
+Usage:
+    python deckbot_vocabulary.py sync <metadata_dir> [--export output/deckbot-metadata.json]
+    python deckbot_vocabulary.py top <metadata_dir> [top_n]
+    python deckbot_vocabulary.py postings <metadata_dir> <keyword>
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from transform_to_pinecone_format import sanitize_id
+
+# Configuration
+INDEX_FILENAME = "deckbot_vocabulary_index.json"
+DEFAULT_EXPORT_PATH = Path(__file__).resolve().parent.parent / "output" / "deckbot-metadata.json"
+INDEX_VERSION = 1
+
+
+def _signature(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _atomic_write_json(path: Path, payload: Any, indent: Optional[int] = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def deck_contribution(data: Dict[str, Any]) -> Dict[str, Any]:
+    """What one metadata file adds to the vocabulary"""
+    deck_meta = data["deck_metadata"]
+    keywords: Counter = Counter()
+    for slide in data.get("slide_data", []):
+        keywords.update(keyword.strip() for keyword in slide.get("keywords", []) if keyword.strip())
+    return {
+        "pdf_id": sanitize_id(deck_meta.get("filename", "")),
+        "company": deck_meta.get("company_name", ""),
+        "industry": deck_meta.get("deck_industry", ""),
+        "keywords": dict(keywords),
+    }
+
+
+class VocabularyIndex:
+    """Per-deck contributions plus the running totals derived from them"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.decks: Dict[str, Dict[str, Any]] = {}
+        self.keyword_counts: Counter = Counter()
+        self.postings: Dict[str, Set[str]] = {}
+        self.company_decks: Counter = Counter()
+        self.industry_decks: Counter = Counter()
+
+    @classmethod
+    def load(cls, path: Path) -> "VocabularyIndex":
+        index = cls(path)
+        if index.path.exists():
+            with open(index.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") == INDEX_VERSION:
+                for source, deck in saved["decks"].items():
+                    index._apply(source, deck)
+        return index
+
+    @classmethod
+    def for_directory(cls, metadata_dir: Path) -> "VocabularyIndex":
+        return cls.load(Path(metadata_dir) / INDEX_FILENAME)
+
+    def _apply(self, source: str, deck: Dict[str, Any]):
+        self.decks[source] = deck
+        self.keyword_counts.update(deck["keywords"])
+        for keyword in deck["keywords"]:
+            self.postings.setdefault(keyword, set()).add(source)
+        if deck["company"]:
+            self.company_decks[deck["company"]] += 1
+        if deck["industry"]:
+            self.industry_decks[deck["industry"]] += 1
+
+    def remove_deck(self, source: str) -> bool:
+        deck = self.decks.pop(source, None)
+        if deck is None:
+            return False
+        self.keyword_counts.subtract(deck["keywords"])
+        for keyword in deck["keywords"]:
+            if self.keyword_counts[keyword] <= 0:
+                del self.keyword_counts[keyword]
+            sources = self.postings.get(keyword)
+            if sources is not None:
+                sources.discard(source)
+                if not sources:
+                    del self.postings[keyword]
+        for counts, name in ((self.company_decks, deck["company"]), (self.industry_decks, deck["industry"])):
+            if name:
+                counts[name] -= 1
+                if counts[name] <= 0:
+                    del counts[name]
+        return True
+
+    def add_deck(self, source: str, data: Dict[str, Any], signature: Optional[List[int]] = None):
+        """Add or replace one deck's contribution"""
+        self.remove_deck(source)
+        deck = deck_contribution(data)
+        deck["signature"] = signature
+        self._apply(source, deck)
+
+    def add_file(self, path: Path):
+        path = Path(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.add_deck(path.name, data, _signature(path))
+
+    def sync(self, metadata_dir: Path) -> Dict[str, List[str]]:
+        """Bring the index in line with metadata_dir, reading only changed files"""
+        current = {path.name: path for path in Path(metadata_dir).glob("*_metadata.json")}
+        changes: Dict[str, List[str]] = {"added": [], "updated": [], "removed": []}
+
+        for source in sorted(set(self.decks) - set(current)):
+            self.remove_deck(source)
+            changes["removed"].append(source)
+
+        for source, path in sorted(current.items()):
+            known = self.decks.get(source)
+            if known is not None and known.get("signature") == _signature(path):
+                continue
+            self.add_file(path)
+            changes["updated" if known is not None else "added"].append(source)
+
+        return changes
+
+    def save(self):
+        _atomic_write_json(self.path, {"version": INDEX_VERSION, "decks": self.decks})
+
+    def deck_postings(self, keyword: str) -> List[str]:
+        """pdf_ids of decks using a keyword"""
+        return sorted(self.decks[source]["pdf_id"] for source in self.postings.get(keyword, ()))
+
+    def to_export(self) -> Dict[str, Any]:
+        """Same shape as scripts/export-metadata.ts output"""
+        now = datetime.now(timezone.utc)
+        return {
+            "exported_at": now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z",
+            "total_companies": len(self.company_decks),
+            "total_industries": len(self.industry_decks),
+            "total_unique_keywords": len(self.keyword_counts),
+            "companies": sorted(self.company_decks),
+            "industries": sorted(self.industry_decks),
+            "keywords": sorted(self.keyword_counts),
+        }
+
+    def export(self, path: Path = DEFAULT_EXPORT_PATH) -> Dict[str, Any]:
+        payload = self.to_export()
+        _atomic_write_json(Path(path), payload, indent=2)
+        return payload
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("""
+DeckBot Vocabulary Builder
+
+Usage:
+  python deckbot_vocabulary.py sync <metadata_dir> [--export <path>]
+  python deckbot_vocabulary.py top <metadata_dir> [top_n]
+  python deckbot_vocabulary.py postings <metadata_dir> <keyword>
+
+The index is kept at <metadata_dir>/deckbot_vocabulary_index.json.
+Default export: output/deckbot-metadata.json (read by src/rag-query.ts)
+        """)
+        return 1
+
+    command = sys.argv[1]
+    metadata_dir = Path(sys.argv[2])
+    if not metadata_dir.is_dir():
+        print(f"❌ Error: Directory not found: {metadata_dir}")
+        return 1
+
+    start = time.perf_counter()
+    index = VocabularyIndex.for_directory(metadata_dir)
+    changes = index.sync(metadata_dir)
+    if any(changes.values()):
+        index.save()
+
+    if command == "sync":
+        export_path = DEFAULT_EXPORT_PATH
+        if "--export" in sys.argv:
+            export_path = Path(sys.argv[sys.argv.index("--export") + 1])
+
+        if any(changes.values()) or not export_path.exists():
+            payload = index.export(export_path)
+        else:
+            payload = index.to_export()
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"✅ Vocabulary synced in {elapsed:.0f}ms "
+              f"(+{len(changes['added'])} added, ~{len(changes['updated'])} updated, "
+              f"-{len(changes['removed'])} removed)")
+        print(f"   Companies: {payload['total_companies']}, industries: {payload['total_industries']}, "
+              f"keywords: {payload['total_unique_keywords']}")
+        print(f"   Export: {export_path}")
+
+    elif command == "top":
+        top_n = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+        for keyword, count in index.keyword_counts.most_common(top_n):
+            print(f"   {count:>6}  {keyword}  ({len(index.postings[keyword])} decks)")
+
+    elif command == "postings" and len(sys.argv) > 3:
+        keyword = sys.argv[3]
+        pdf_ids = index.deck_postings(keyword)
+        print(f"🏷️  '{keyword}': {index.keyword_counts.get(keyword, 0)} slides in {len(pdf_ids)} decks")
+        for pdf_id in pdf_ids:
+            print(f"   {pdf_id}")
+
+    else:
+        print(f"❌ Unknown command: {command}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
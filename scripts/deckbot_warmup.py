@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+DeckBot Search Warm-up
+Startup probes and popular-query prefetch for DeckBotIndexManager
+
+- Probes: one top_k=1 search per index (dense, sparse) and hot namespace
+  (global plus the namespaces most queried in the log), and one tiny rerank,
+  so connection pools, TLS sessions and serverless namespaces are warm
+  before the first real query
+- Query log: cascading_search appends one NDJSON line per search when
+  DECKBOT_QUERY_LOG is set (query, namespace, resolved filters, k-values)
+- Prefetch: the top-N most frequent logged searches run through search_many;
+  results land in a TTL'd ResultCache that cascading_search answers from,
+  and their rerank scores in the rerank cache
+- Report: probe latencies, prefetch time, result/rerank cache fill
+
+Run once at startup, or on a schedule (--interval) so prefetched results
+are refreshed before their TTL runs out.
+
+Configuration:
+    DECKBOT_QUERY_LOG=logs/queries.jsonl   capture searches for prefetch
+
+Usage:
+    python deckbot_warmup.py <query_log> [--top 100] [--namespace doc:x] [--interval 600]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from deckbot_metrics import REGISTRY, get_logger
+from deckbot_singleflight import make_query_key
+
+# Configuration
+QUERY_LOG_ENV = "DECKBOT_QUERY_LOG"
+DEFAULT_TOP_N = 100
+DEFAULT_HOT_NAMESPACES = 3  # Most-queried namespaces probed besides global
+DEFAULT_RESULT_TTL = 900  # Seconds a prefetched result is served
+DEFAULT_MAX_RESULTS = 1000
+LOG_WINDOW = 100000  # Most recent log lines considered for popularity
+PROBE_QUERY = "warm-up"
+SEARCH_PARAMS = ("namespace", "filters", "top_k", "rerank_top_n", "fusion", "rerank")
+SEARCH_DEFAULTS = {"top_k": 20, "rerank_top_n": 5, "fusion": "average", "rerank": True}  # cascading_search's
+
+LOOKUPS_TOTAL = REGISTRY.counter(
+    "deckbot_result_cache_lookups_total", "Prefetched result lookups in cascading_search, by result (hit/miss)"
+)
+WARMUP_SECONDS = REGISTRY.histogram("deckbot_warmup_seconds", "Warm-up duration in seconds, by phase")
+
+log = get_logger("deckbot_warmup")
+
+
+def search_key(spec: Dict[str, Any]) -> str:
+    """Same key cascading_search computes, so prefetched results are found"""
+    spec = dict(SEARCH_DEFAULTS, **spec)
+    params = {name: spec[name] for name in SEARCH_PARAMS if name != "filters"}
+    return make_query_key(spec["query"], spec.get("filters"), **params)
+
+
+class QueryLog:
+    """Append-only NDJSON log of searches (one line per cascading_search call)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["QueryLog"]:
+        path = os.environ.get(QUERY_LOG_ENV)
+        return cls(Path(path)) if path else None
+
+    def record(self, query: str, **params: Any):
+        line = json.dumps(dict(ts=round(time.time(), 3), query=query, **params), ensure_ascii=False, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class ResultCache:
+    """Prefetched cascading_search results by query key, each valid for ttl seconds"""
+
+    def __init__(self, ttl: float = DEFAULT_RESULT_TTL, max_entries: int = DEFAULT_MAX_RESULTS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        LOOKUPS_TOTAL.inc(result="miss" if entry is None else "hit")
+        return None if entry is None else entry[1]
+
+    def put(self, key: str, results: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop everything (after an ingest changes what searches return)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def top_queries(path: Path, top_n: int = DEFAULT_TOP_N) -> Tuple[List[Dict[str, Any]], Counter]:
+    """
+    Most frequent searches (as search_many specs) and per-namespace counts
+
+    Reads a query log (.jsonl/.ndjson, most recent LOG_WINDOW lines), or any
+    query file load_queries understands (each query counted once, file order).
+    """
+    path = Path(path)
+    specs: Dict[str, Dict[str, Any]] = {}
+    counts: Counter = Counter()
+    if path.suffix in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as f:
+            lines = deque(f, maxlen=LOG_WINDOW)
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Torn last line from a concurrent writer
+    else:
+        from deckbot_unified_index import load_queries
+
+        entries = [{"query": item} if isinstance(item, str) else item for item in load_queries(path)]
+
+    from deckbot_unified_index import GLOBAL_NAMESPACE
+
+    namespaces: Counter = Counter()
+    for entry in entries:
+        if not entry.get("query"):
+            continue
+        spec = {"query": entry["query"], "namespace": entry.get("namespace") or GLOBAL_NAMESPACE}
+        spec.update({name: entry[name] for name in SEARCH_PARAMS if entry.get(name) is not None})
+        key = search_key(spec)
+        specs.setdefault(key, spec)
+        counts[key] += 1
+        namespaces[spec["namespace"]] += 1
+
+    return [specs[key] for key, _ in counts.most_common(top_n)], namespaces
+
+
+def probe(manager: Any, namespaces: List[str]) -> List[Dict[str, Any]]:
+    """One cheap search per index and namespace, plus one single-document rerank"""
+    from deckbot_unified_index import DENSE_INDEX_NAME, RERANK_MODEL, SPARSE_INDEX_NAME
+
+    probes = []
+    for index_name in (DENSE_INDEX_NAME, SPARSE_INDEX_NAME):
+        index = manager._index(index_name)
+        for namespace in namespaces:
+            started = time.perf_counter()
+            error = None
+            try:
+                index.search(namespace=namespace, query={"top_k": 1, "inputs": {"text": PROBE_QUERY}}, fields=["_id"])
+            except Exception as e:
+                error = str(e)
+            probes.append({"target": f"{index_name}/{namespace}", "ms": (time.perf_counter() - started) * 1000,
+                           "error": error})
+
+    started = time.perf_counter()
+    error = None
+    try:
+        manager.pc.inference.rerank(model=RERANK_MODEL, query=PROBE_QUERY,
+                                    documents=[{"content": PROBE_QUERY}], rank_fields=["content"], top_n=1)
+    except Exception as e:
+        error = str(e)
+    probes.append({"target": RERANK_MODEL, "ms": (time.perf_counter() - started) * 1000, "error": error})
+    return probes
+
+
+def warm_up(
+    manager: Any,
+    query_log: Optional[Path] = None,
+    top_n: int = DEFAULT_TOP_N,
+    namespaces: Optional[List[str]] = None,
+    hot_namespaces: int = DEFAULT_HOT_NAMESPACES
+) -> Dict[str, Any]:
+    """
+    Probe the indexes and prefetch popular searches into manager.result_cache
+    (created if the manager has none); returns a report
+    """
+    from deckbot_unified_index import GLOBAL_NAMESPACE
+
+    started = time.perf_counter()
+    specs: List[Dict[str, Any]] = []
+    logged_namespaces: Counter = Counter()
+    if query_log is not None and Path(query_log).exists():
+        specs, logged_namespaces = top_queries(query_log, top_n)
+
+    targets = [GLOBAL_NAMESPACE] + [namespace for namespace in namespaces or [] if namespace != GLOBAL_NAMESPACE]
+    hot = [namespace for namespace, _ in logged_namespaces.most_common() if namespace not in targets]
+    targets += hot[:hot_namespaces]
+
+    with WARMUP_SECONDS.time(phase="probe"):
+        probes = probe(manager, targets)
+    probe_ms = (time.perf_counter() - started) * 1000
+
+    if manager.result_cache is None:
+        manager.result_cache = ResultCache()
+    prefetched = failed = 0
+    prefetch_started = time.perf_counter()
+    with WARMUP_SECONDS.time(phase="prefetch"):
+        for position, query, results, error in manager.search_many(specs):
+            if error is not None:
+                failed += 1
+                log.warning(f"Prefetch failed: {query[:40]} - {error}", error_type=type(error).__name__)
+                continue
+            manager.result_cache.put(search_key(specs[position]), results)
+            prefetched += 1
+
+    return {
+        "probes": probes,
+        "probe_ms": round(probe_ms, 1),
+        "queries": len(specs),
+        "prefetched": prefetched,
+        "failed": failed,
+        "prefetch_ms": round((time.perf_counter() - prefetch_started) * 1000, 1),
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "result_cache": manager.result_cache.stats(),
+        "rerank_cache": manager.rerank_cache.stats() if manager.rerank_cache else None,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n🔥 Warm-up finished in {report['total_ms'] / 1000:.1f}s")
+    print(f"   Probes ({report['probe_ms']:.0f}ms):")
+    for item in report["probes"]:
+        status = f"❌ {item['error']}" if item["error"] else f"{item['ms']:.0f}ms"
+        print(f"      {item['target']}: {status}")
+    print(f"   Prefetched {report['prefetched']}/{report['queries']} popular queries "
+          f"in {report['prefetch_ms'] / 1000:.1f}s" + (f" ({report['failed']} failed)" if report["failed"] else ""))
+    cache = report["result_cache"]
+    print(f"   Result cache: {cache['entries']}/{cache['max_entries']} entries (TTL {cache['ttl_s']:.0f}s)")
+    if report["rerank_cache"]:
+        rerank = report["rerank_cache"]
+        print(f"   Rerank cache: {rerank['entries']}/{rerank['max_entries']} scores")
+
+
+def run_scheduled(manager: Any, query_log: Optional[Path], interval: float, stop: threading.Event,
+                  **kwargs: Any):
+    """Warm up again every interval seconds until stop is set (e.g. on a daemon thread)"""
+    while not stop.wait(interval):
+        try:
+            report = warm_up(manager, query_log, **kwargs)
+            log.info(f"Warm-up: {report['prefetched']}/{report['queries']} queries in {report['total_ms']:.0f}ms",
+                     prefetched=report["prefetched"], total_ms=report["total_ms"])
+        except Exception as e:
+            log.error(f"Warm-up failed: {e}", error_type=type(e).__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm up DeckBot search and prefetch popular queries")
+    parser.add_argument("query_log", type=Path, nargs="?",
+                        help="Query log (.jsonl) or query file; default $DECKBOT_QUERY_LOG")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="Popular queries to prefetch")
+    parser.add_argument("--namespace", action="append", help="Also probe this namespace (repeatable)")
+    parser.add_argument("--hot-namespaces", type=int, default=DEFAULT_HOT_NAMESPACES)
+    parser.add_argument("--interval", type=float, help="Repeat every N seconds (Ctrl+C to stop)")
+    args = parser.parse_args()
+
+    query_log = args.query_log or (Path(os.environ[QUERY_LOG_ENV]) if os.environ.get(QUERY_LOG_ENV) else None)
+    if query_log is not None and not query_log.exists():
+        print(f"❌ Error: Query log not found: {query_log}")
+        return 1
+
+    # Imported here so --help works without the Pinecone SDK installed
+    from deckbot_unified_index import DeckBotIndexManager
+
+    manager = DeckBotIndexManager()
+    options = {"top_n": args.top, "namespaces": args.namespace, "hot_namespaces": args.hot_namespaces}
+    try:
+        while True:
+            print(f"🔥 Warming up ({query_log or 'probes only'})...")
+            print_report(warm_up(manager, query_log, **options))
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+DeckBot Watch-Folder Ingestion
+Long-running daemon that makes new *_metadata.json files searchable within seconds
+
+- Watches output/ with inotify (ctypes, Linux) or, elsewhere and with
+  --poll, by rescanning every POLL_SECONDS
+- Debounce: a file is taken once its size/mtime has been stable for
+  DEBOUNCE_SECONDS and it parses as JSON, so half-written files wait
+- Only new or changed decks are ingested: a re-dropped file whose content
+  hash matches the last ingested version is archived without a Pinecone call
+- Bounded worker pool; ingest_pdf_metadata(replace=True), so a deck that
+  shrank loses its stale slides
+- Ingested files move to output/ingested/ (as ingest-and-archive.sh does);
+  a file rewritten while it was ingesting stays and is picked up again
+- Failed files stay in place and are retried once they change
+- --once exits when the current files are done; a file that still does not
+  parse after one debounce window is reported as failed rather than waited on
+- Optional vocabulary sync (deckbot-metadata.json) over the archive after
+  each round of ingests
+- Metrics: deckbot_watch_files_total{result}, deckbot_watch_lag_seconds
+  (file written → searchable)
+
+Usage:
+    python deckbot_watch.py [watch_dir] [--archive-dir DIR] [--concurrency 4] [--debounce 2]
+                            [--poll] [--poll-interval 2] [--vocabulary [EXPORT_PATH]] [--once]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import fnmatch
+import hashlib
+import json
+import os
+import select
+import signal
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from deckbot_metrics import REGISTRY, get_logger
+
+# Configuration
+DEFAULT_WATCH_DIR = Path(__file__).resolve().parent.parent / "output"
+ARCHIVE_DIRNAME = "ingested"
+STATE_FILENAME = "deckbot_watch_state.json"
+METADATA_PATTERN = "*_metadata.json"
+DEBOUNCE_SECONDS = 2.0  # Size/mtime must be unchanged this long
+PARTIAL_TIMEOUT = 300.0  # Give up on a file that stays unparseable this long
+POLL_SECONDS = 2.0  # Rescan interval of the polling watcher
+IDLE_WAIT = 1.0  # Longest wait between loop iterations
+WATCH_CONCURRENCY = 4  # Decks ingested at once
+STATE_VERSION = 1
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+READ_BUFFER = 64 * 1024
+
+FILES_TOTAL = REGISTRY.counter(
+    "deckbot_watch_files_total", "Metadata files handled by the watcher, by result (ingested/unchanged/failed)"
+)
+LAG_SECONDS = REGISTRY.histogram(
+    "deckbot_watch_lag_seconds", "Seconds from a metadata file's last write to its deck being searchable",
+    buckets=(1, 2, 5, 10, 30, 60, 120, 300, 900)
+)
+
+log = get_logger("deckbot_watch")
+
+Signature = Tuple[int, int]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _signature(path: Path) -> Signature:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _is_metadata(name: str) -> bool:
+    return fnmatch.fnmatch(name, METADATA_PATTERN)
+
+
+# ============================================================================
+# Watchers: poll(timeout) → names that may have changed
+# ============================================================================
+
+class InotifyWatcher:
+    """inotify on one directory through libc (no third-party package)"""
+
+    kind = "inotify"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(self.directory)), WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {self.directory}")
+
+    def poll(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        names: Set[str] = set()
+        while readable:
+            try:
+                data = os.read(self.fd, READ_BUFFER)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped: look at everything
+                    names.update(path.name for path in self.directory.glob(METADATA_PATTERN))
+                elif name:
+                    names.add(name)
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Rescans the directory, reporting files whose size/mtime changed since the last scan"""
+
+    kind = "polling"
+
+    def __init__(self, directory: Path, interval: float = POLL_SECONDS):
+        self.directory = Path(directory)
+        self.interval = interval
+        self._seen: Dict[str, Signature] = {}
+        self._scanned = 0.0
+
+    def poll(self, timeout: float) -> Set[str]:
+        remaining = self._scanned + self.interval - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(remaining, timeout))
+            if remaining > timeout:
+                return set()
+        self._scanned = time.monotonic()
+
+        current: Dict[str, Signature] = {}
+        for path in self.directory.glob(METADATA_PATTERN):
+            try:
+                current[path.name] = _signature(path)
+            except FileNotFoundError:
+                continue
+        changed = {name for name, signature in current.items() if self._seen.get(name) != signature}
+        self._seen = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory: Path, polling: bool = False, interval: float = POLL_SECONDS):
+    """inotify where available, otherwise the polling watcher"""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except (AttributeError, OSError) as e:
+            log.warning(f"inotify unavailable ({e}); polling every {interval:.0f}s", error=str(e))
+    return PollingWatcher(directory, interval)
+
+
+# ============================================================================
+# Ingestion loop
+# ============================================================================
+
+class WatchIngestor:
+    """Debounces changed files and ingests them on a bounded worker pool"""
+
+    def __init__(
+        self,
+        manager: Any,
+        watch_dir: Path,
+        archive_dir: Optional[Path] = None,
+        concurrency: int = WATCH_CONCURRENCY,
+        debounce: float = DEBOUNCE_SECONDS,
+        vocabulary_export: Optional[Path] = None
+    ):
+        self.manager = manager
+        self.watch_dir = Path(watch_dir)
+        self.archive_dir = Path(archive_dir) if archive_dir else self.watch_dir / ARCHIVE_DIRNAME
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.concurrency = concurrency
+        self.debounce = debounce
+        self.partial_timeout = PARTIAL_TIMEOUT
+        self.vocabulary_export = vocabulary_export
+        self.state_path = self.archive_dir / STATE_FILENAME
+        self.state: Dict[str, Dict[str, Any]] = self._load_state()
+        self.pending: Dict[str, Tuple[Signature, float, float]] = {}  # name → (signature, changed_at, first_seen)
+        self.in_flight: Dict[str, Tuple[Future, Signature, str]] = {}
+        self.failed: Dict[str, Signature] = {}
+        self.counts = {"ingested": 0, "unchanged": 0, "failed": 0}
+        self._pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="watch-ingest")
+        self._ingested_since_sync = False
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if self.state_path.exists():
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("version") == STATE_VERSION:
+                return saved["files"]
+        return {}
+
+    def _save_state(self):
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "files": self.state}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def notice(self, name: str):
+        """A watcher reported name; (re)start its debounce timer if it changed"""
+        if not _is_metadata(name) or name in self.in_flight:
+            return  # In-flight files are re-checked when their ingest finishes
+        try:
+            signature = _signature(self.watch_dir / name)
+        except FileNotFoundError:
+            self.pending.pop(name, None)
+            return
+        if self.failed.get(name) == signature:
+            return
+        known = self.pending.get(name)
+        now = time.monotonic()
+        if known is None:
+            self.pending[name] = (signature, now, now)
+        elif known[0] != signature:
+            self.pending[name] = (signature, now, known[2])
+
+    def scan(self):
+        """Pick up files already in the directory (startup, or after missed events)"""
+        for path in sorted(self.watch_dir.glob(METADATA_PATTERN)):
+            self.notice(path.name)
+
+    def _archive(self, name: str):
+        os.replace(self.watch_dir / name, self.archive_dir / name)
+
+    def _take_ready(self, limit: int) -> List[Tuple[str, Signature, str]]:
+        """Up to limit pending files, oldest first, quiet for the debounce period and complete JSON"""
+        ready: List[Tuple[str, Signature, str]] = []
+        now = time.monotonic()
+        for name, (signature, changed_at, first_seen) in sorted(self.pending.items(), key=lambda item: item[1][2]):
+            if len(ready) >= limit:
+                break
+            if now - changed_at < self.debounce:
+                continue
+            path = self.watch_dir / name
+            try:
+                if _signature(path) != signature:
+                    self.notice(name)
+                    continue
+                content = path.read_bytes()
+                json.loads(content)
+            except FileNotFoundError:
+                del self.pending[name]
+                continue
+            except ValueError:
+                if now - first_seen < self.partial_timeout:
+                    self.pending[name] = (signature, now, first_seen)  # Still being written
+                    continue
+                del self.pending[name]
+                self._fail(name, signature, "not valid JSON")
+                continue
+
+            del self.pending[name]
+            digest = hashlib.sha256(content).hexdigest()
+            if self.state.get(name, {}).get("sha256") == digest:
+                self._archive(name)
+                self.counts["unchanged"] += 1
+                FILES_TOTAL.inc(result="unchanged")
+                print(f"   ⏭️  {name}: unchanged since last ingest, archived")
+                continue
+            ready.append((name, signature, digest))
+        return ready
+
+    def _fail(self, name: str, signature: Signature, reason: str):
+        self.failed[name] = signature
+        self.counts["failed"] += 1
+        FILES_TOTAL.inc(result="failed")
+        log.error(f"   ❌ {name}: {reason} (retried once the file changes)", file=name, error=reason)
+
+    def _submit(self, name: str, signature: Signature, digest: str):
+        path = self.watch_dir / name
+        future = self._pool.submit(self.manager.ingest_pdf_metadata, str(path), replace=True)
+        self.in_flight[name] = (future, signature, digest)
+
+    def _collect(self):
+        done = [name for name, (future, _, _) in self.in_flight.items() if future.done()]
+        for name in done:
+            future, signature, digest = self.in_flight.pop(name)
+            error = future.exception()
+            if error is not None:
+                self._fail(name, signature, str(error))
+                continue
+
+            path = self.watch_dir / name
+            LAG_SECONDS.observe(max(0.0, time.time() - signature[1] / 1e9))
+            self.state[name] = {"sha256": digest, "doc_id": future.result(), "ingested_at": _now()}
+            self.counts["ingested"] += 1
+            self._ingested_since_sync = True
+            FILES_TOTAL.inc(result="ingested")
+            try:
+                rewritten = _signature(path) != signature
+            except FileNotFoundError:
+                continue
+            if rewritten:
+                self.notice(name)  # Changed mid-ingest: ingest the new version too
+            else:
+                self._archive(name)
+                print(f"   ✅ {name} → {future.result()} (archived)")
+        if done:
+            self._save_state()
+
+    def _sync_vocabulary(self):
+        from deckbot_vocabulary import VocabularyIndex
+
+        vocabulary = VocabularyIndex.for_directory(self.archive_dir)
+        changes = vocabulary.sync(self.archive_dir)
+        vocabulary.save()
+        vocabulary.export(self.vocabulary_export)
+        changed = sum(len(names) for names in changes.values())
+        print(f"   📚 Vocabulary: {changed} decks changed → {self.vocabulary_export}")
+
+    def step(self, names: Set[str]):
+        """Handle one batch of watcher events"""
+        for name in names:
+            self.notice(name)
+        if self.in_flight:
+            self._collect()
+        # Files beyond the free workers stay pending, so nothing queues inside the pool
+        for name, signature, digest in self._take_ready(self.concurrency - len(self.in_flight)):
+            self._submit(name, signature, digest)
+        if self._ingested_since_sync and not self.in_flight and self.vocabulary_export:
+            self._ingested_since_sync = False
+            self._sync_vocabulary()
+
+    def next_wait(self) -> float:
+        if self.in_flight:
+            return 0.2
+        if self.pending:
+            now = time.monotonic()
+            due = min(changed_at + self.debounce for _, changed_at, _ in self.pending.values())
+            return min(IDLE_WAIT, max(0.05, due - now))
+        return IDLE_WAIT
+
+    def idle(self) -> bool:
+        return not self.pending and not self.in_flight
+
+    def run(self, watcher: Any, stop: threading.Event, once: bool = False):
+        """Process events until stop is set (with once: until the current files are done)"""
+        if once:
+            # Nothing is left running to finish a partial write; don't wait PARTIAL_TIMEOUT for it
+            self.partial_timeout = 0.0
+        self.scan()
+        try:
+            while not stop.is_set():
+                self.step(watcher.poll(self.next_wait()))
+                if once and self.idle():
+                    break
+        finally:
+            wait([future for future, _, _ in self.in_flight.values()])
+            self._collect()
+            self._pool.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest new and changed metadata files as they appear")
+    parser.add_argument("watch_dir", type=Path, nargs="?", default=DEFAULT_WATCH_DIR)
+    parser.add_argument("--archive-dir", type=Path, help=f"Default: <watch_dir>/{ARCHIVE_DIRNAME}")
+    parser.add_argument("--concurrency", type=int, default=WATCH_CONCURRENCY)
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="Seconds a file must be unchanged before it is ingested")
+    parser.add_argument("--poll", action="store_true", help="Poll instead of using inotify")
+    parser.add_argument("--poll-interval", type=float, default=POLL_SECONDS)
+    parser.add_argument("--vocabulary", type=Path, nargs="?", const=True,
+                        help="Sync deckbot-metadata.json after ingests (optionally to this path)")
+    parser.add_argument("--once", action="store_true", help="Ingest what is there now, then exit")
+    args = parser.parse_args()
+
+    if not args.watch_dir.is_dir():
+        print(f"❌ Error: Directory not found: {args.watch_dir}")
+        return 1
+
+    vocabulary_export = None
+    if args.vocabulary is not None:
+        from deckbot_vocabulary import DEFAULT_EXPORT_PATH
+
+        vocabulary_export = DEFAULT_EXPORT_PATH if args.vocabulary is True else args.vocabulary
+
+    # Imported here so --help works without the Pinecone SDK installed
+    from deckbot_unified_index import DeckBotIndexManager
+
+    ingestor = WatchIngestor(DeckBotIndexManager(), args.watch_dir, args.archive_dir, args.concurrency,
+                             args.debounce, vocabulary_export)
+    watcher = open_watcher(args.watch_dir, args.poll, args.poll_interval)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    print(f"👀 Watching {args.watch_dir} ({watcher.kind}, {args.concurrency} workers, "
+          f"debounce {args.debounce:.1f}s) → {ingestor.archive_dir}")
+    try:
+        ingestor.run(watcher, stop, once=args.once)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping")
+    finally:
+        watcher.close()
+
+    counts = ingestor.counts
+    print(f"📊 Ingested {counts['ingested']}, unchanged {counts['unchanged']}, failed {counts['failed']}"
+          + (f"; lag p95 {LAG_SECONDS.percentile(95):.1f}s" if counts["ingested"] else ""))
+    return 1 if counts["failed"] and args.once else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,17 @@
 """
 Execute Pinecone upserts via MCP tool
 This script generates the necessary data for Claude to perform upserts
+
+Reads batch_*.json files, or the manifest.json that
+`transform_to_pinecone_format.py --store` writes in their place.
 """
 
 import json
 from pathlib import Path
 import sys
 
+from deckbot_artifacts import load_batches
+
 BATCH_DIR = Path("/Users/kjyoo/DeckBot/output/pinecone_batches/ilgram_2025")
 DENSE_INDEX = "deckbot-dense-korean"
 SPARSE_INDEX = "deckbot-sparse-korean"
@@ -22,28 +27,24 @@ targets = [
     (SPARSE_INDEX, GLOBAL_NAMESPACE)
 ]
 
-# Get batch files
-batch_files = sorted(BATCH_DIR.glob("batch_*.json"))
+# Get batches (name, records)
+batches = list(load_batches(BATCH_DIR))
 
 def main():
     if len(sys.argv) > 1:
         # Output specific batch for MCP consumption
         batch_num = int(sys.argv[1])
-        batch_file = batch_files[batch_num - 1]
-        with open(batch_file, 'r', encoding='utf-8') as f:
-            records = json.load(f)
+        _, records = batches[batch_num - 1]
         # Print compact JSON
         print(json.dumps(records, ensure_ascii=False))
     else:
         # Show summary
-        print(f"Total batches: {len(batch_files)}")
+        print(f"Total batches: {len(batches)}")
         print(f"Total targets per batch: {len(targets)}")
-        print(f"Total operations: {len(batch_files) * len(targets)}")
+        print(f"Total operations: {len(batches) * len(targets)}")
         print()
-        for idx, bf in enumerate(batch_files, 1):
-            with open(bf, 'r', encoding='utf-8') as f:
-                records = json.load(f)
-            print(f"Batch {idx}: {bf.name} - {len(records)} records")
+        for idx, (name, records) in enumerate(batches, 1):
+            print(f"Batch {idx}: {name} - {len(records)} records")
 
 if __name__ == "__main__":
     main()
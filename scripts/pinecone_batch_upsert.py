@@ -10,26 +10,25 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Any
 import time
-from datetime import datetime
+
+from deckbot_metrics import RECORDS_TOTAL, get_logger
 
 # Configuration
 BATCH_SIZE = 50  # Records per batch (adjust based on your data size)
 NAMESPACE = "deckbot-docs"  # Default namespace
 OUTPUT_DIR = Path("/Users/kjyoo/DeckBot/output")
-LOG_FILE = OUTPUT_DIR / "upsert_log.txt"
+LOG_FILE = OUTPUT_DIR / "upsert_log.jsonl"  # Structured JSON Lines log
 
 # You'll need to implement the actual Pinecone upsert via MCP
 # This script prepares the data and calls the MCP tool
 
 
-def log_message(message: str, level: str = "INFO"):
-    """Log messages to both console and file"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] [{level}] {message}"
-    print(log_entry)
+log = get_logger("pinecone_batch_upsert", log_file=LOG_FILE, timestamped=True)
+
 
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_entry + "\n")
+def log_message(message: str, level: str = "INFO", **fields: Any):
+    """Log messages to console and the buffered structured log file"""
+    log.log(level, message, **fields)
 
 
 def load_json_file(file_path: Path) -> List[Dict[str, Any]]:
@@ -139,13 +138,16 @@ def process_files(files: List[Path], batch_size: int = BATCH_SIZE,
     for file in files:
         records = load_json_file(file)
         all_records.extend(records)
-        log_message(f"Loaded {len(records)} records from {file.name}")
+        RECORDS_TOTAL.inc(len(records), stage="load")
+        log_message(f"Loaded {len(records)} records from {file.name}",
+                    file=file.name, records=len(records))
 
     log_message(f"Total records loaded: {len(all_records)}")
 
     # Validate and prepare all records
     log_message("Validating records...")
     valid_records = prepare_batch(all_records)
+    RECORDS_TOTAL.inc(len(valid_records), stage="validate")
     log_message(f"Valid records: {len(valid_records)} / {len(all_records)}")
 
     if not valid_records:
@@ -225,7 +227,7 @@ def main():
         log_message("\nNext Steps:")
         log_message("  1. Review prepared batch files in: output/prepared_batches/")
         log_message("  2. Use Claude to upsert batches via Pinecone MCP")
-        log_message("  3. Monitor upsert progress in upsert_log.txt")
+        log_message("  3. Monitor upsert progress in upsert_log.jsonl")
         log_message("=" * 80)
         return 0
     else:
@@ -2,16 +2,29 @@
 """
 Prepare data for MCP upsert operations
 Outputs compact JSON for each chunk for direct MCP consumption
+
+With store-backed chunks (split_and_upsert.py over a --store transform) the
+upsert manifest references record ranges of the stored blobs instead of
+chunk files, and is itself an artifact manifest:
+`deckbot_artifacts.py cat upsert_manifest.json <chunk>` prints a chunk's records.
 """
 
 import json
 from pathlib import Path
 
+from deckbot_artifacts import read_manifest, write_manifest
+
 CHUNKS_DIR = Path("/Users/kjyoo/DeckBot/output/pinecone_batches/ilgram_2025/chunks")
+CHUNK_MANIFEST = Path("/Users/kjyoo/DeckBot/output/pinecone_batches/ilgram_2025/chunks_manifest.json")
 OUTPUT_FILE = Path("/Users/kjyoo/DeckBot/output/pinecone_batches/ilgram_2025/upsert_manifest.json")
 
-# Get all chunks
-chunk_files = sorted(CHUNKS_DIR.glob("*.json"))
+store = None
+if CHUNK_MANIFEST.exists():
+    chunk_manifest, store = read_manifest(CHUNK_MANIFEST)
+    chunk_files = chunk_manifest["chunks"]
+else:
+    # Get all chunks
+    chunk_files = sorted(CHUNKS_DIR.glob("*.json"))
 
 # Create manifest
 manifest = {
@@ -25,19 +38,25 @@ manifest = {
     "total_operations": len(chunk_files) * 4
 }
 
-for chunk_file in chunk_files:
-    with open(chunk_file, 'r', encoding='utf-8') as f:
-        records = json.load(f)
+if store is not None:
+    # Ranges are copied from the chunk manifest; no record is read
+    manifest["chunks"] = chunk_files
+    write_manifest(OUTPUT_FILE, store, chunk_files, targets=manifest["targets"],
+                   total_operations=manifest["total_operations"])
+else:
+    for chunk_file in chunk_files:
+        with open(chunk_file, 'r', encoding='utf-8') as f:
+            records = json.load(f)
 
-    manifest["chunks"].append({
-        "file": str(chunk_file),
-        "name": chunk_file.name,
-        "record_count": len(records)
-    })
+        manifest["chunks"].append({
+            "file": str(chunk_file),
+            "name": chunk_file.name,
+            "record_count": len(records)
+        })
 
-# Save manifest
-with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-    json.dump(manifest, f, ensure_ascii=False, indent=2)
+    # Save manifest
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
 
 print(f"✅ Manifest created: {OUTPUT_FILE}")
 print(f"📊 Total chunks: {len(manifest['chunks'])}")
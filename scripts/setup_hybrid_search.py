@@ -4,12 +4,12 @@ Hybrid Search Setup for Korean Insurance Deck
 Based on Pinecone cascading retrieval pattern
 """
 
-import os
-from pinecone import Pinecone
 import json
 
-# Initialize Pinecone
-pc = Pinecone(api_key=os.environ.get("PINECONE_API_KEY"))
+from deckbot_pinecone_client import create_pinecone_client
+
+# Initialize Pinecone (or the local stand-in when DECKBOT_PINECONE_URL is set)
+pc = create_pinecone_client()
 
 # Index names
 DENSE_INDEX = "ilgram-db-insurance-korean"
@@ -12,9 +12,15 @@ Based on Pinecone cascading retrieval pattern (pinecone.txt)
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
+from deckbot_artifacts import MANIFEST_FILENAME, ArtifactStore, chunk_ranges, write_manifest
+from deckbot_chunking import CHUNK_TYPE, expand_slide_records
+from deckbot_dedup import REPORT_FILENAME, STORE_FILENAME, SlideDeduplicator
+from deckbot_ingest_policy import IngestionPolicy
+from deckbot_keywords import KeywordCanonicalizer, keyword_list
+
 
 # Configuration based on pinecone.txt requirements
 MAX_BATCH_SIZE = 96  # Pinecone integrated embedding limit
@@ -46,11 +52,25 @@ def sanitize_id(text: str) -> str:
 
 
 def transform_metadata_to_records(
-    metadata_path: str
+    metadata_path: str,
+    deduplicator: Optional[SlideDeduplicator] = None,
+    policy: Optional[IngestionPolicy] = None,
+    keyword_index: Optional[KeywordCanonicalizer] = None
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Transform TypeScript metadata JSON to Pinecone-compatible records
 
+    Slides the ingestion policy rejects (TBWA Intro layouts and near-empty
+    slides by default; see deckbot_ingest_policy.py) are skipped. With a
+    deduplicator, near-duplicate and boilerplate slides are dropped before
+    embedding (see deckbot_dedup.py); doc_info reports how many.
+    Slide keywords are resolved to canonical keyword_ids (deckbot_keywords.py);
+    new keywords are added to the keyword index, which the caller saves.
+    Callers transforming many files pass one keyword_index; without it the
+    index is loaded from disk on every call.
+    Text-heavy slides become a summary record plus content chunk records
+    linked by parent_id (deckbot_chunking.py).
+
     Input format (from TypeScript):
     {
         "deck_metadata": {
@@ -78,7 +98,7 @@ def transform_metadata_to_records(
         {
             "_id": str,
             "content": str,  # Main searchable text field
-            "type": str,     # "deck_metadata" or "slide"
+            "type": str,     # "deck_metadata", "slide" or "slide_chunk"
             "pdf_id": str,
             "company": str,
             "industry": str,
@@ -93,7 +113,9 @@ def transform_metadata_to_records(
         data = json.load(f)
 
     deck_meta = data['deck_metadata']
-    slides = data['slide_data']
+    all_slides = data['slide_data']
+    slides = (policy or IngestionPolicy.from_env()).filter_slides(all_slides)
+    keyword_index = keyword_index or KeywordCanonicalizer.from_env()
 
     # Generate clean PDF ID (ASCII-only for Pinecone namespace compatibility)
     filename = deck_meta['filename']
@@ -110,6 +132,8 @@ def transform_metadata_to_records(
     print(f"   Company: {deck_meta.get('company_name', 'N/A')}")
     print(f"   Industry: {deck_meta.get('deck_industry', 'N/A')}")
     print(f"   Slides: {len(slides)}")
+    if len(slides) < len(all_slides):
+        print(f"   🧾 Skipped {len(all_slides) - len(slides)} slides by ingestion policy")
 
     records = []
 
@@ -143,12 +167,26 @@ def transform_metadata_to_records(
             "company": deck_meta.get('company_name', ''),
             "industry": deck_meta.get('deck_industry', ''),
             "slide_number": slide['slide_number'],
-            "keywords": ", ".join(slide.get('keywords', [])),
+            "keywords": keyword_list(slide.get('keywords', [])),
+            "keyword_ids": keyword_index.keyword_ids(slide.get('keywords', [])),
             "slide_layout": slide.get('slide_layout', ''),
             "image_url": slide.get('image_url', '')
         }
         records.append(slide_record)
 
+    dropped = 0
+    if deduplicator is not None:
+        before = len(records)
+        records = deduplicator.filter_records(pdf_id, records)
+        dropped = before - len(records)
+        if dropped:
+            print(f"   🧹 Dropped {dropped} duplicate/boilerplate slides")
+
+    records = expand_slide_records(records, slides, build_slide_content)
+    chunks = sum(1 for record in records if record['type'] == CHUNK_TYPE)
+    if chunks:
+        print(f"   ✂️  Split long slides into {chunks} content chunks")
+
     # Document info for summary
     doc_info = {
         "pdf_id": pdf_id,
@@ -157,7 +195,10 @@ def transform_metadata_to_records(
         "industry": deck_meta.get('deck_industry', ''),
         "total_records": len(records),
         "deck_metadata_record": 1,
-        "slide_records": len(slides)
+        "slide_records": len(slides) - dropped,
+        "chunk_records": chunks,
+        "dropped_slides": dropped,
+        "policy_skipped_slides": len(all_slides) - len(slides)
     }
 
     return records, doc_info
@@ -248,6 +289,9 @@ def save_batches(
     batch_dir = output_dir / "pinecone_batches" / pdf_id
     batch_dir.mkdir(parents=True, exist_ok=True)
 
+    # A manifest left by a --store run would shadow these files for readers
+    (batch_dir / MANIFEST_FILENAME).unlink(missing_ok=True)
+
     batch_files = []
     for idx, batch in enumerate(batches, 1):
         batch_file = batch_dir / f"batch_{idx:03d}.json"
@@ -261,10 +305,39 @@ def save_batches(
     return batch_files
 
 
+def save_batches_to_store(
+    batches: List[List[Dict]],
+    pdf_id: str,
+    output_dir: Path,
+    store: ArtifactStore
+) -> Path:
+    """
+    Store the deck's records once as a compressed blob and write a manifest
+    whose chunks are record ranges of it (batch_001, batch_002, ...)
+    """
+    batch_dir = output_dir / "pinecone_batches" / pdf_id
+    records = [record for batch in batches for record in batch]
+    reused = store.reused
+    blob = store.put(records)
+    reused = store.reused > reused
+    chunks = chunk_ranges(blob, len(records), MAX_BATCH_SIZE)
+    manifest_file = write_manifest(batch_dir / MANIFEST_FILENAME, store, chunks, pdf_id=pdf_id)
+
+    # The manifest replaces the full JSON copies of earlier runs
+    for stale in batch_dir.glob("batch_*.json"):
+        stale.unlink()
+
+    for chunk in chunks:
+        print(f"   ✓ {chunk['name']}: {chunk['record_count']} records → {blob[:12]}")
+    state = "already stored" if reused else f"{store.find(blob).stat().st_size / 1024:.0f} KB written"
+    print(f"   ✓ Blob {blob[:12]} ({state}) in {store.root}")
+    return manifest_file
+
+
 def generate_upsert_instructions(
     pdf_id: str,
     doc_info: Dict,
-    batch_files: List[Path]
+    batch_files: List[Any]
 ):
     """
     Generate instructions for using Pinecone MCP to upsert batches
@@ -317,13 +390,26 @@ def generate_upsert_instructions(
     print("\n" + "=" * 80)
 
 
-def process_metadata_file(metadata_path: str, output_dir: str = "/Users/kjyoo/DeckBot/output"):
+def process_metadata_file(metadata_path: str, output_dir: str = "/Users/kjyoo/DeckBot/output", dedup: bool = False,
+                          store: Optional[ArtifactStore] = None):
     """
     Main processing function for a single metadata JSON file
+
+    dedup=True drops near-duplicate/boilerplate slides, remembering
+    fingerprints across runs in pinecone_batches/boilerplate_fingerprints.json
+
+    With a store, batches are written as one content-addressed blob plus
+    pinecone_batches/<pdf_id>/manifest.json instead of batch_NNN.json files
     """
     try:
         # Transform to Pinecone format
-        records, doc_info = transform_metadata_to_records(metadata_path)
+        deduplicator = None
+        if dedup:
+            deduplicator = SlideDeduplicator(store_path=Path(output_dir) / "pinecone_batches" / STORE_FILENAME)
+        policy = IngestionPolicy.from_env()
+        keyword_index = KeywordCanonicalizer.from_env()
+        records, doc_info = transform_metadata_to_records(metadata_path, deduplicator, policy, keyword_index)
+        keyword_index.save_if_changed()
 
         # Validate all records
         print(f"\n🔍 Validating {len(records)} records...")
@@ -348,7 +434,11 @@ def process_metadata_file(metadata_path: str, output_dir: str = "/Users/kjyoo/De
         # Save batches
         print(f"\n💾 Saving batch files...")
         output_path = Path(output_dir)
-        batch_files = save_batches(batches, doc_info['pdf_id'], output_path)
+        if store is not None:
+            manifest_file = save_batches_to_store(batches, doc_info['pdf_id'], output_path, store)
+            batch_files = [f"{manifest_file} [batch_{idx:03d}]" for idx in range(1, len(batches) + 1)]
+        else:
+            batch_files = save_batches(batches, doc_info['pdf_id'], output_path)
 
         # Save summary
         summary = {
@@ -358,7 +448,8 @@ def process_metadata_file(metadata_path: str, output_dir: str = "/Users/kjyoo/De
             "batch_info": {
                 "total_batches": len(batches),
                 "max_batch_size": MAX_BATCH_SIZE,
-                "batch_files": [str(f) for f in batch_files]
+                "batch_files": [str(f) for f in batch_files],
+                "artifact_manifest": str(manifest_file) if store is not None else None
             },
             "index_config": {
                 "dense_index": DENSE_INDEX,
@@ -368,7 +459,8 @@ def process_metadata_file(metadata_path: str, output_dir: str = "/Users/kjyoo/De
             "namespaces": [
                 f"doc:{doc_info['pdf_id']}",
                 "global"
-            ]
+            ],
+            "ingest_policy": policy.to_dict()
         }
 
         summary_file = output_path / "pinecone_batches" / doc_info['pdf_id'] / "summary.json"
@@ -377,6 +469,12 @@ def process_metadata_file(metadata_path: str, output_dir: str = "/Users/kjyoo/De
 
         print(f"   ✅ Summary saved: {summary_file}")
 
+        if deduplicator is not None:
+            report_file = summary_file.parent / REPORT_FILENAME
+            deduplicator.save_report(report_file)
+            deduplicator.save_store()
+            print(f"   ✅ Dedup report saved: {report_file}")
+
         # Generate instructions
         generate_upsert_instructions(doc_info['pdf_id'], doc_info, batch_files)
 
@@ -404,10 +502,12 @@ def main():
 ╚════════════════════════════════════════════════════════════════════════════╝
 
 Usage:
-  python transform_to_pinecone_format.py <metadata_json_path>
+  python transform_to_pinecone_format.py <metadata_json_path> [--dedup] [--store]
 
 Example:
   python transform_to_pinecone_format.py output/example_metadata.json
+  python transform_to_pinecone_format.py output/example_metadata.json --dedup
+  python transform_to_pinecone_format.py output/example_metadata.json --store
 
 Features:
   ✓ Consistent field naming (_id, content)
@@ -415,21 +515,32 @@ Features:
   ✓ Compatible with cascading retrieval pattern
   ✓ Dual namespace strategy (doc-specific + global)
   ✓ Ready for Pinecone MCP upsert
+  ✓ --dedup drops near-duplicate and boilerplate slides (report in batch dir)
+  ✓ --store writes one compressed, content-addressed blob + manifest.json
+    instead of batch JSON files (deckbot_artifacts.py; DECKBOT_ARTIFACT_STORE)
 
 Output:
   - Batch JSON files in output/pinecone_batches/<pdf_id>/
+    (with --store: manifest.json there, records in output/artifacts/)
   - Summary JSON with processing details
   - Upsert instructions for Pinecone MCP
         """)
         return 1
 
-    metadata_path = sys.argv[1]
+    args = [arg for arg in sys.argv[1:] if arg not in ("--dedup", "--store")]
+    if not args:
+        print("❌ Error: metadata_json_path is required")
+        return 1
+    metadata_path = args[0]
 
     if not Path(metadata_path).exists():
         print(f"❌ Error: File not found: {metadata_path}")
         return 1
 
-    success = process_metadata_file(metadata_path)
+    store = None
+    if "--store" in sys.argv:
+        store = ArtifactStore.from_env(Path("/Users/kjyoo/DeckBot/output"))
+    success = process_metadata_file(metadata_path, dedup="--dedup" in sys.argv, store=store)
 
     return 0 if success else 1
 
@@ -2,11 +2,15 @@
 """
 Comprehensive Pinecone Upsert Script
 Outputs MCP commands for systematic batch upsert
+
+Reads batch_*.json files, or the manifest.json that
+`transform_to_pinecone_format.py --store` writes in their place.
 """
 
-import json
 from pathlib import Path
 
+from deckbot_artifacts import load_batches
+
 # Configuration
 BATCH_DIR = Path("/Users/kjyoo/DeckBot/output/pinecone_batches/ilgram_2025")
 DENSE_INDEX = "deckbot-dense-korean"
@@ -23,22 +27,19 @@ targets = [
 ]
 
 # Load batches
-batch_files = sorted(BATCH_DIR.glob("batch_*.json"))
+batches = list(load_batches(BATCH_DIR))
 
 print("=" * 80)
 print("PINECONE UPSERT PLAN")
 print("=" * 80)
-print(f"Total batches: {len(batch_files)}")
+print(f"Total batches: {len(batches)}")
 print(f"Total targets: {len(targets)}")
-print(f"Total operations: {len(batch_files) * len(targets)}")
+print(f"Total operations: {len(batches) * len(targets)}")
 print()
 
-for batch_idx, batch_file in enumerate(batch_files, 1):
-    with open(batch_file, 'r', encoding='utf-8') as f:
-        records = json.load(f)
-
+for batch_idx, (batch_name, records) in enumerate(batches, 1):
     print(f"\n{'='*80}")
-    print(f"BATCH {batch_idx}: {batch_file.name} ({len(records)} records)")
+    print(f"BATCH {batch_idx}: {batch_name} ({len(records)} records)")
     print(f"{'='*80}")
 
     for target_idx, (index, namespace, desc) in enumerate(targets, 1):
@@ -54,11 +55,15 @@ print(f"{'='*80}")
 print("Use the following MCP commands to upsert each batch:")
 print()
 print("For each batch file:")
-print("  1. Load the batch JSON")
+print("  1. Load the batch JSON (store-backed: python deckbot_artifacts.py cat <manifest.json> <batch>)")
 print("  2. Call mcp__pinecone-mcp__upsert-records with:")
 print("     - name: <index_name>")
 print("     - namespace: <namespace>")
 print("     - records: <loaded_batch_data>")
 print()
+print("If this deck was re-processed with fewer slides, delete the slides it no")
+print("longer has from all four targets afterwards:")
+print("  python deckbot_unified_index.py sweep <metadata_dir> [--dry-run]")
+print()
 print("✅ All data is ready with complete image URLs")
 print("✅ Field mapping: {\"text\": \"content\"} (integrated inference)")
@@ -10,28 +10,39 @@ Based on CLAUDE.md reference:
 """
 
 import json
-import os
 import sys
 import time
 from pathlib import Path
-from typing import List, Dict, Any
-from pinecone import Pinecone
+from typing import List, Dict, Any, Optional
+
+from deckbot_artifacts import MANIFEST_FILENAME, load_chunks
+from deckbot_metrics import (
+    BATCH_SECONDS, BYTES_SENT_TOTAL, RECORDS_TOTAL, RETRIES_TOTAL,
+    get_logger, payload_bytes, record_throughput
+)
+from deckbot_pinecone_client import create_pinecone_client, has_credentials
 
 # Configuration
 DENSE_INDEX = "deckbot-dense-korean"
 SPARSE_INDEX = "deckbot-sparse-korean"
+MAX_RETRIES = 3  # Attempts per batch before giving up
+RETRY_BACKOFF = 2.0  # Seconds, doubled on each retry
+BATCH_DELAY = 1.0  # Seconds between batches (rate limiting)
+TARGET_DELAY = 2.0  # Seconds between index/namespace targets
+
+log = get_logger("upsert_to_pinecone_sdk")
 
 def load_batch_file(batch_path: Path) -> List[Dict[str, Any]]:
     """Load records from batch JSON file"""
-    print(f"   📄 Loading: {batch_path.name}")
+    log.debug(f"   📄 Loading: {batch_path.name}", file=batch_path.name)
     with open(batch_path, 'r', encoding='utf-8') as f:
         records = json.load(f)
-    print(f"      Loaded {len(records)} records")
+    log.debug(f"      Loaded {len(records)} records", records=len(records))
     return records
 
 
 def upsert_batch_to_index(
-    pc: Pinecone,
+    pc: Any,
     index_name: str,
     namespace: str,
     records: List[Dict[str, Any]],
@@ -46,33 +57,55 @@ def upsert_batch_to_index(
     2. Generate embeddings using the index's integrated model
     3. Upsert the vectors with metadata
     """
-    try:
-        # Get index reference
-        index = pc.Index(index_name)
-
-        print(f"      Batch {batch_num}/{total_batches}: Upserting {len(records)} records...")
-
-        # Upsert using integrated inference
-        # The SDK automatically handles:
-        # - Embedding generation from 'content' field
-        # - Batching for API limits
-        # - Retry logic
-        # Python SDK syntax: index.upsert_records(records, namespace=namespace)
-        response = index.upsert_records(records, namespace=namespace)
-
-        print(f"      ✅ Upserted successfully")
-        return True
-
-    except Exception as e:
-        print(f"      ❌ Error upserting batch: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Get index reference
+    index = pc.Index(index_name)
+    size = payload_bytes(records)
+
+    log.info(
+        f"      Batch {batch_num}/{total_batches}: Upserting {len(records)} records...",
+        index=index_name, namespace=namespace, batch=batch_num, records=len(records), bytes=size
+    )
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            # Upsert using integrated inference
+            # The SDK automatically handles:
+            # - Embedding generation from 'content' field
+            # - Batching for API limits
+            with BATCH_SECONDS.time(index=index_name):
+                index.upsert_records(namespace=namespace, records=records)
+
+            RECORDS_TOTAL.inc(len(records), stage="upsert")
+            BYTES_SENT_TOTAL.inc(size, index=index_name)
+            log.info(f"      ✅ Upserted successfully", batch=batch_num, attempt=attempt)
+            return True
+
+        except Exception as e:
+            if attempt < MAX_RETRIES:
+                RETRIES_TOTAL.inc(index=index_name)
+                delay = RETRY_BACKOFF * (2 ** (attempt - 1))
+                log.warning(
+                    f"      ⚠️  Attempt {attempt} failed ({e}), retrying in {delay:.0f}s...",
+                    batch=batch_num, attempt=attempt, error=str(e)
+                )
+                time.sleep(delay)
+                continue
+
+            log.error(f"      ❌ Error upserting batch: {str(e)}",
+                      index=index_name, namespace=namespace, batch=batch_num, error=str(e))
+            import traceback
+            traceback.print_exc()
+            return False
+
+    return False
 
 
 def upsert_all_batches(
     batch_dir: Path,
-    pdf_id: str
+    pdf_id: str,
+    pc: Optional[Any] = None,
+    batch_delay: float = BATCH_DELAY,
+    target_delay: float = TARGET_DELAY
 ):
     """
     Upsert all batches to all target combinations:
@@ -80,24 +113,38 @@ def upsert_all_batches(
     - dense index / global namespace
     - sparse index / doc namespace
     - sparse index / global namespace
+
+    pc may be any client with the SDK surface (e.g. FakePinecone for
+    benchmarks); delays can be set to 0 when no rate limit applies.
     """
 
     # Initialize Pinecone client
-    api_key = os.getenv("PINECONE_API_KEY")
-    if not api_key:
-        print("❌ Error: PINECONE_API_KEY environment variable not set")
-        sys.exit(1)
-
-    pc = Pinecone(api_key=api_key)
+    if pc is None:
+        if not has_credentials():
+            print("❌ Error: PINECONE_API_KEY environment variable not set")
+            sys.exit(1)
+
+        pc = create_pinecone_client()
+
+    # Parse each batch once and reuse it for all four targets
+    manifest_file = batch_dir / MANIFEST_FILENAME
+    if manifest_file.exists():
+        # Written by transform_to_pinecone_format.py --store
+        loaded = list(load_chunks(manifest_file))
+        batch_names = [name for name, _ in loaded]
+        batches = [records for _, records in loaded]
+    else:
+        # Find all batch files
+        batch_files = sorted(batch_dir.glob("batch_*.json"))
 
-    # Find all batch files
-    batch_files = sorted(batch_dir.glob("batch_*.json"))
+        if not batch_files:
+            print(f"❌ Error: No batch_*.json files found in {batch_dir}")
+            sys.exit(1)
 
-    if not batch_files:
-        print(f"❌ Error: No batch_*.json files found in {batch_dir}")
-        sys.exit(1)
+        batch_names = [batch_file.name for batch_file in batch_files]
+        batches = [load_batch_file(batch_file) for batch_file in batch_files]
 
-    total_batches = len(batch_files)
+    total_batches = len(batches)
     doc_namespace = f"doc:{pdf_id}"
     global_namespace = "global"
 
@@ -128,11 +175,8 @@ def upsert_all_batches(
         print(f"{'='*80}")
 
         # Process each batch
-        for batch_idx, batch_file in enumerate(batch_files, 1):
-            print(f"\n   📦 Batch {batch_idx}/{total_batches}: {batch_file.name}")
-
-            # Load batch
-            records = load_batch_file(batch_file)
+        for batch_idx, (batch_name, records) in enumerate(zip(batch_names, batches), 1):
+            log.info(f"\n   📦 Batch {batch_idx}/{total_batches}: {batch_name}")
 
             # Upsert
             success = upsert_batch_to_index(
@@ -150,15 +194,16 @@ def upsert_all_batches(
                 failed_operations += 1
 
             # Small delay between batches to avoid rate limiting
-            if batch_idx < total_batches:
-                time.sleep(1)
+            if batch_idx < total_batches and batch_delay:
+                time.sleep(batch_delay)
 
         # Delay between targets
-        if target_idx < len(targets):
-            print(f"\n   ⏳ Waiting 2 seconds before next target...")
-            time.sleep(2)
+        if target_idx < len(targets) and target_delay:
+            print(f"\n   ⏳ Waiting {target_delay:.0f} seconds before next target...")
+            time.sleep(target_delay)
 
     # Summary
+    record_throughput("upsert")
     total_ops = successful_operations + failed_operations
     print(f"\n{'='*80}")
     print(f"📋 UPSERT SUMMARY")
@@ -167,6 +212,11 @@ def upsert_all_batches(
     print(f"   ✅ Successful: {successful_operations}")
     print(f"   ❌ Failed: {failed_operations}")
     print(f"   Success rate: {(successful_operations/total_ops)*100:.1f}%")
+    print(f"   Records upserted: {RECORDS_TOTAL.value(stage='upsert'):.0f}")
+    print(f"   Batch latency p50/p95: "
+          f"{BATCH_SECONDS.percentile(50, index=DENSE_INDEX):.2f}s / "
+          f"{BATCH_SECONDS.percentile(95, index=DENSE_INDEX):.2f}s (dense)")
+    print(f"   Retries: {RETRIES_TOTAL.total():.0f}")
 
     if failed_operations == 0:
         print(f"\n🎉 All upserts completed successfully!")
@@ -176,7 +226,7 @@ def upsert_all_batches(
         return False
 
 
-def verify_upsert(pc: Pinecone, pdf_id: str):
+def verify_upsert(pc: Any, pdf_id: str):
     """Verify that data was successfully upserted by checking index stats"""
     print(f"\n{'='*80}")
     print(f"🔍 Verifying Upsert")
@@ -233,7 +283,9 @@ Example:
 
 Requirements:
   - PINECONE_API_KEY environment variable must be set
+    (or DECKBOT_PINECONE_URL pointing at deckbot_local_pinecone.py)
   - Batch directory must contain batch_*.json files
+    (or the manifest.json of a transform run with --store)
   - Indexes must already exist (deckbot-dense-korean, deckbot-sparse-korean)
 
 Features:
@@ -268,8 +320,8 @@ Features:
         pdf_id = batch_dir.name
         print(f"   ⚠️  No summary.json found, using directory name as PDF ID: {pdf_id}")
 
-    # Check for API key
-    if not os.getenv("PINECONE_API_KEY"):
+    # Check for API key (not needed against the local stand-in)
+    if not has_credentials():
         print("\n❌ Error: PINECONE_API_KEY environment variable not set")
         print("   Please set it with: export PINECONE_API_KEY='your-api-key'")
         return 1
@@ -287,9 +339,7 @@ Features:
 
     # Verify if successful
     if success:
-        api_key = os.getenv("PINECONE_API_KEY")
-        pc = Pinecone(api_key=api_key)
-        verify_upsert(pc, pdf_id)
+        verify_upsert(create_pinecone_client(), pdf_id)
 
     print(f"\n✅ Script complete!")
     return 0 if success else 1
@@ -18,6 +18,9 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 import re
 
+from deckbot_ingest_policy import KEPT, IngestionPolicy
+from deckbot_keywords import keyword_list
+
 
 class TransformationValidator:
     """Validates and transforms TypeScript metadata to Pinecone format"""
@@ -25,9 +28,11 @@ class TransformationValidator:
     REQUIRED_DECK_FIELDS = {"filename", "deck_industry", "company_name", "executive_summary", "total_pages"}
     REQUIRED_SLIDE_FIELDS = {"slide_number", "slide_summary", "keywords", "slide_layout", "image_url"}
 
-    def __init__(self):
+    def __init__(self, policy: Optional[IngestionPolicy] = None):
         self.validation_errors = []
         self.warnings = []
+        # Same slide rules as the ingest paths (DECKBOT_INGEST_POLICY or defaults)
+        self.policy = policy or IngestionPolicy.from_env()
 
     def sanitize_filename(self, filename: str) -> str:
         """Extract clean PDF ID from filename"""
@@ -122,8 +127,12 @@ class TransformationValidator:
 
         records.append(deck_record)
 
-        # Transform slide records
-        for slide in data["slide_data"]:
+        # Transform slide records (slides the ingestion policy rejects are never embedded)
+        slides = self.policy.filter_slides(data["slide_data"])
+        if len(slides) < len(data["slide_data"]):
+            print(f"   Skipped by ingestion policy: {len(data['slide_data']) - len(slides)} slides")
+
+        for slide in slides:
             slide_record = {
                 "_id": f"{pdf_id}_slide_{slide['slide_number']:03d}",
                 "content": self._build_slide_content(slide),
@@ -165,11 +174,9 @@ class TransformationValidator:
 
         return "\n".join(parts)
 
-    def _format_keywords(self, keywords: List[str]) -> str:
-        """Convert keywords array to comma-separated string"""
-        if isinstance(keywords, list):
-            return ", ".join(keywords)
-        return str(keywords)
+    def _format_keywords(self, keywords: List[str]) -> List[str]:
+        """Keywords as list metadata (filterable with $in); tolerates a legacy joined string"""
+        return keyword_list(keywords)
 
     def validate_pinecone_records(self, records: List[Dict[str, Any]]) -> bool:
         """Validate the Pinecone record structure"""
@@ -244,14 +251,17 @@ class TransformationValidator:
         report.append("   deck_metadata.deck_industry → industry")
         report.append("   deck_metadata.company_name → company")
         report.append("   deck_metadata.executive_summary → content (partial)")
-        report.append("   slide_data[].keywords (array) → keywords (string)")
+        report.append("   slide_data[].keywords (array) → keywords (list)")
         report.append("   slide_data[].slide_content + slide_summary → content")
 
-        # Data preservation check
+        # Data preservation check (policy-skipped slides are dropped on purpose)
+        skipped = self.policy.totals()
+        skipped_count = sum(count for outcome, count in skipped.items() if outcome != KEPT)
         report.append("\n✅ DATA PRESERVATION:")
         report.append(f"   Original slides: {len(original['slide_data'])}")
+        report.append(f"   Skipped by ingestion policy: {skipped_count}")
         report.append(f"   Transformed slides: {len(records) - 1}")
-        report.append(f"   Match: {'✓' if len(original['slide_data']) == len(records) - 1 else '✗'}")
+        report.append(f"   Match: {'✓' if len(original['slide_data']) - skipped_count == len(records) - 1 else '✗'}")
 
         return "\n".join(report)
 